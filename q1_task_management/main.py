@@ -1,9 +1,11 @@
 from fastapi import FastAPI, HTTPException, Request, Form
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, RedirectResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from typing import List
 from datetime import datetime
+import os
+import metrics
 from models import Task, TaskCreate, TaskUpdate
 
 # Initialize FastAPI app
@@ -13,6 +15,12 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# Per-route latency histograms at /metrics; METRICS_DEBUG_HEADERS=1 adds X-Response-Time-Ms to responses
+app.add_middleware(
+    metrics.MetricsMiddleware,
+    debug_headers=os.getenv("METRICS_DEBUG_HEADERS", "").lower() in ("1", "true", "yes")
+)
+
 # Mount static files
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
@@ -124,6 +132,12 @@ async def delete_task_form(task_id: int):
     return RedirectResponse(url="/", status_code=303)
 
 
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Request metrics in Prometheus text format"""
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
 # Add some sample data for demonstration
 @app.on_event("startup")
 async def startup_event():
@@ -0,0 +1,94 @@
+"""
+Per-route request latency histograms.
+
+Tasks live in memory, so request latency is the only thing worth measuring here.
+MetricsMiddleware times every request and labels it with its route template (e.g.
+/tasks/{task_id}); render() produces the Prometheus text exposition format for the
+/metrics endpoint. With debug_headers on, responses also carry X-Response-Time-Ms.
+"""
+
+import threading
+import time
+from typing import Dict, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+NAME = "http_request_duration_seconds"
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.total += 1
+        self.sum += value
+
+class Registry:
+    """Request latency histograms by (method, route)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes: Dict[Tuple[str, str], Histogram] = {}
+
+    def observe(self, method: str, route: str, latency: float) -> None:
+        with self._lock:
+            histogram = self._routes.get((method, route))
+            if histogram is None:
+                histogram = self._routes[method, route] = Histogram(LATENCY_BUCKETS)
+            histogram.observe(latency)
+
+    def render(self) -> str:
+        lines = [f"# HELP {NAME} Request latency in seconds", f"# TYPE {NAME} histogram"]
+        with self._lock:
+            for (method, route), histogram in sorted(self._routes.items()):
+                labels = f'method="{method}",route="{_escape(route)}"'
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    lines.append(f'{NAME}_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f'{NAME}_bucket{{{labels},le="+Inf"}} {histogram.total}')
+                lines.append(f"{NAME}_sum{{{labels}}} {histogram.sum}")
+                lines.append(f"{NAME}_count{{{labels}}} {histogram.total}")
+        return "\n".join(lines) + "\n"
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+registry = Registry()
+
+class MetricsMiddleware:
+    """ASGI middleware recording each HTTP request's latency in the registry"""
+
+    def __init__(self, app, debug_headers: bool = False, registry: Registry = registry):
+        self.app = app
+        self.debug_headers = debug_headers
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+
+        async def send_with_headers(message):
+            if self.debug_headers and message["type"] == "http.response.start":
+                elapsed = f"{(time.perf_counter() - start) * 1000:.2f}".encode()
+                message["headers"] = list(message.get("headers", [])) + [(b"x-response-time-ms", elapsed)]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            # Label by the matched route's template so /tasks/1 and /tasks/2 share one series
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            self.registry.observe(scope["method"], route, time.perf_counter() - start)
+
+def render() -> str:
+    return registry.render()
@@ -1,5 +1,5 @@
 from fastapi import FastAPI, HTTPException, Depends, Request, Form, Query
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, RedirectResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from sqlalchemy import create_engine, Column, Integer, String, Float, Date, DateTime, func
@@ -9,6 +9,7 @@ from pydantic import BaseModel, validator
 from datetime import datetime, date
 from typing import List, Optional
 import os
+import metrics
 
 # Database setup
 SQLALCHEMY_DATABASE_URL = "sqlite:///./expenses.db"
@@ -68,12 +69,21 @@ class TotalResponse(BaseModel):
     total_amount: float
     category_breakdown: List[CategoryTotal]
 
-# Create tables
-Base.metadata.create_all(bind=engine)
+# SKIP_SCHEMA_CHECK=1 (or --skip-schema-check) starts without creating tables, for workers
+# whose database is already set up
+SKIP_SCHEMA_CHECK = os.getenv("SKIP_SCHEMA_CHECK", "").lower() in ("1", "true", "yes")
 
 # FastAPI app
 app = FastAPI(title="Expense Tracker", version="1.0.0")
 
+# Per-route latency, SQL count and DB time histograms at /metrics;
+# METRICS_DEBUG_HEADERS=1 also adds X-DB-Statements, X-DB-Time-Ms and X-Response-Time-Ms headers
+metrics.instrument_engine(engine)
+app.add_middleware(
+    metrics.MetricsMiddleware,
+    debug_headers=os.getenv("METRICS_DEBUG_HEADERS", "").lower() in ("1", "true", "yes")
+)
+
 # Templates
 templates = Jinja2Templates(directory="templates")
 
@@ -244,9 +254,15 @@ async def filter_expenses(
         "selected_category": category
     })
 
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
 # Startup event
 @app.on_event("startup")
 async def startup_event():
+    if not SKIP_SCHEMA_CHECK:
+        Base.metadata.create_all(bind=engine)
     db = SessionLocal()
     try:
         add_sample_data(db)
@@ -254,5 +270,10 @@ async def startup_event():
         db.close()
 
 if __name__ == "__main__":
+    import argparse
     import uvicorn
+    parser = argparse.ArgumentParser(description="Run the expense tracker")
+    parser.add_argument("--skip-schema-check", action="store_true", help="Start without creating tables")
+    if parser.parse_args().skip_schema_check:
+        SKIP_SCHEMA_CHECK = True
     uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
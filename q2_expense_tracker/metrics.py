@@ -0,0 +1,143 @@
+"""
+Per-route request metrics for the expense tracker: latency, SQL statement count and
+DB time histograms.
+
+MetricsMiddleware times every request and labels it with its route template (e.g.
+/api/expenses/{expense_id}), and instrument_engine() hooks the SQLite engine's cursor
+events so each statement a request runs is counted and timed against it. render()
+produces the Prometheus text exposition format for /metrics. With debug_headers on,
+responses also carry X-DB-Statements, X-DB-Time-Ms and X-Response-Time-Ms.
+"""
+
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+
+class RequestStats:
+    __slots__ = ("statements", "db_time")
+
+    def __init__(self):
+        self.statements = 0
+        self.db_time = 0.0
+
+# Stats of the request being served. The endpoints query from the request's own context
+# (and sync ones from a copy of it in the threadpool), so they update the same object.
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_db_stats", default=None)
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.total += 1
+        self.sum += value
+
+class Registry:
+    """Histograms of request latency, statements per request and DB time, by (method, route)"""
+
+    SERIES = (
+        ("http_request_duration_seconds", "Request latency in seconds", LATENCY_BUCKETS),
+        ("db_statements_per_request", "SQL statements executed per request", STATEMENT_BUCKETS),
+        ("db_time_per_request_seconds", "Time spent executing SQL per request, in seconds", LATENCY_BUCKETS),
+    )
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes: Dict[Tuple[str, str], Tuple[Histogram, ...]] = {}
+
+    def observe(self, method: str, route: str, latency: float, stats: RequestStats) -> None:
+        with self._lock:
+            histograms = self._routes.get((method, route))
+            if histograms is None:
+                histograms = self._routes[method, route] = tuple(Histogram(buckets) for _, _, buckets in self.SERIES)
+            for histogram, value in zip(histograms, (latency, stats.statements, stats.db_time)):
+                histogram.observe(value)
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            routes = sorted(self._routes.items())
+            for index, (name, description, _) in enumerate(self.SERIES):
+                lines.append(f"# HELP {name} {description}")
+                lines.append(f"# TYPE {name} histogram")
+                for (method, route), histograms in routes:
+                    histogram = histograms[index]
+                    labels = f'method="{method}",route="{_escape(route)}"'
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+                    lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.total}')
+                    lines.append(f"{name}_sum{{{labels}}} {histogram.sum}")
+                    lines.append(f"{name}_count{{{labels}}} {histogram.total}")
+        return "\n".join(lines) + "\n"
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+registry = Registry()
+
+def instrument_engine(engine) -> None:
+    """Count and time every statement the engine runs against the current request"""
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def stop_timer(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        stats = _current.get()
+        if stats is not None:
+            stats.statements += 1
+            stats.db_time += elapsed
+
+class MetricsMiddleware:
+    """ASGI middleware recording each HTTP request in the registry"""
+
+    def __init__(self, app, debug_headers: bool = False, registry: Registry = registry):
+        self.app = app
+        self.debug_headers = debug_headers
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        start = time.perf_counter()
+
+        async def send_with_headers(message):
+            if self.debug_headers and message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [
+                    (b"x-db-statements", str(stats.statements).encode()),
+                    (b"x-db-time-ms", f"{stats.db_time * 1000:.2f}".encode()),
+                    (b"x-response-time-ms", f"{(time.perf_counter() - start) * 1000:.2f}".encode()),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            _current.reset(token)
+            # The router stores the matched route in the scope; label by its template so
+            # /api/expenses/1 and /api/expenses/2 share one series
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            self.registry.observe(scope["method"], route, time.perf_counter() - start, stats)
+
+def render() -> str:
+    return registry.render()
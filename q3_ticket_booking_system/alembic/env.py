@@ -0,0 +1,58 @@
+from logging.config import fileConfig
+
+from sqlalchemy import create_engine, pool
+
+from alembic import context
+
+from app import config as app_config, models
+from app.migrations import include_name
+
+config = context.config
+
+# Keep the app's logging setup when migrations run in-process from app.migrations
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = models.Base.metadata
+
+def database_url() -> str:
+    return config.get_main_option("sqlalchemy.url") or app_config.DATABASE_URL
+
+def run_migrations_offline() -> None:
+    """Emit the migration SQL as a script (alembic upgrade head --sql)"""
+    context.configure(
+        url=database_url(),
+        target_metadata=target_metadata,
+        include_name=include_name,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=True,
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+def run_migrations_online() -> None:
+    """Migrate over the connection app.migrations passed in, or a fresh one from DATABASE_URL"""
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        _run(connection)
+        return
+
+    engine = create_engine(database_url(), poolclass=pool.NullPool)
+    with engine.connect() as connection:
+        _run(connection)
+
+def _run(connection) -> None:
+    # SQLite can only alter tables by copying them, which batch mode does for us
+    context.configure(
+        connection=connection, target_metadata=target_metadata, include_name=include_name, render_as_batch=True
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
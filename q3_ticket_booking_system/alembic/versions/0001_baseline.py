@@ -0,0 +1,245 @@
+"""Baseline schema: catalog, bookings, inventory counters, revenue rollups and search index
+
+Databases created by create_all before migrations existed have some or all of these
+tables and no alembic_version. Every step here is skipped when its table, index or
+trigger already exists, so such a database is brought up to the baseline rather than
+failing on it.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 10:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BOOKING_SEARCH_TRIGGERS = [
+    """CREATE TRIGGER IF NOT EXISTS booking_search_insert AFTER INSERT ON bookings BEGIN
+        INSERT INTO booking_search (rowid, event_name, venue_name, ticket_type, customer_name, customer_email)
+        SELECT new.id, events.name, venues.name, ticket_types.name, new.customer_name, new.customer_email
+        FROM events, venues, ticket_types
+        WHERE events.id = new.event_id AND venues.id = new.venue_id AND ticket_types.id = new.ticket_type_id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS booking_search_delete AFTER DELETE ON bookings BEGIN
+        DELETE FROM booking_search WHERE rowid = old.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS booking_search_update AFTER UPDATE OF customer_name, customer_email ON bookings BEGIN
+        UPDATE booking_search SET customer_name = new.customer_name, customer_email = new.customer_email
+        WHERE rowid = new.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS booking_search_event_name AFTER UPDATE OF name ON events BEGIN
+        UPDATE booking_search SET event_name = new.name
+        WHERE rowid IN (SELECT id FROM bookings WHERE event_id = new.id);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS booking_search_venue_name AFTER UPDATE OF name ON venues BEGIN
+        UPDATE booking_search SET venue_name = new.name
+        WHERE rowid IN (SELECT id FROM bookings WHERE venue_id = new.id);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS booking_search_ticket_type_name AFTER UPDATE OF name ON ticket_types BEGIN
+        UPDATE booking_search SET ticket_type = new.name
+        WHERE rowid IN (SELECT id FROM bookings WHERE ticket_type_id = new.id);
+    END""",
+]
+
+
+def upgrade() -> None:
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if 'venues' not in existing:
+        op.create_table('venues',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('address', sa.Text(), nullable=False),
+        sa.Column('capacity', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+        )
+    op.create_index('ix_venues_id', 'venues', ['id'], unique=False, if_not_exists=True)
+    op.create_index('ix_venues_name', 'venues', ['name'], unique=True, if_not_exists=True)
+
+    if 'ticket_types' not in existing:
+        op.create_table('ticket_types',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('price', sa.Float(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+        )
+    op.create_index('ix_ticket_types_id', 'ticket_types', ['id'], unique=False, if_not_exists=True)
+    op.create_index('ix_ticket_types_name', 'ticket_types', ['name'], unique=True, if_not_exists=True)
+
+    if 'events' not in existing:
+        op.create_table('events',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('date', sa.DateTime(), nullable=False),
+        sa.Column('venue_id', sa.Integer(), nullable=False),
+        sa.Column('capacity', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['venue_id'], ['venues.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+    op.create_index('ix_events_id', 'events', ['id'], unique=False, if_not_exists=True)
+    op.create_index('ix_events_name', 'events', ['name'], unique=False, if_not_exists=True)
+    op.create_index('ix_events_venue_id_date', 'events', ['venue_id', 'date'], unique=False, if_not_exists=True)
+    op.create_index('ix_events_date_venue_id', 'events', ['date', 'venue_id'], unique=False, if_not_exists=True)
+
+    if 'bookings' not in existing:
+        op.create_table('bookings',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('event_id', sa.Integer(), nullable=False),
+        sa.Column('venue_id', sa.Integer(), nullable=False),
+        sa.Column('ticket_type_id', sa.Integer(), nullable=False),
+        sa.Column('customer_name', sa.String(), nullable=False),
+        sa.Column('customer_email', sa.String(), nullable=False),
+        sa.Column('quantity', sa.Integer(), nullable=False),
+        sa.Column('total_amount', sa.Float(), nullable=False),
+        sa.Column('status', sa.Enum('PENDING', 'CONFIRMED', 'CANCELLED', name='bookingstatus'), nullable=True),
+        sa.Column('booking_code', sa.String(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['event_id'], ['events.id'], ),
+        sa.ForeignKeyConstraint(['ticket_type_id'], ['ticket_types.id'], ),
+        sa.ForeignKeyConstraint(['venue_id'], ['venues.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+    op.create_index('ix_bookings_id', 'bookings', ['id'], unique=False, if_not_exists=True)
+    op.create_index('ix_bookings_booking_code', 'bookings', ['booking_code'], unique=True, if_not_exists=True)
+    op.create_index('ix_bookings_status_created_at', 'bookings', ['status', 'created_at'], unique=False, if_not_exists=True)
+
+    if 'ticket_allotments' not in existing:
+        op.create_table('ticket_allotments',
+        sa.Column('event_id', sa.Integer(), nullable=False),
+        sa.Column('ticket_type_id', sa.Integer(), nullable=False),
+        sa.Column('quantity', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['event_id'], ['events.id'], ),
+        sa.ForeignKeyConstraint(['ticket_type_id'], ['ticket_types.id'], ),
+        sa.PrimaryKeyConstraint('event_id', 'ticket_type_id')
+        )
+
+    if 'event_inventory' not in existing:
+        op.create_table('event_inventory',
+        sa.Column('event_id', sa.Integer(), nullable=False),
+        sa.Column('reserved', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['event_id'], ['events.id'], ),
+        sa.PrimaryKeyConstraint('event_id')
+        )
+        # Seats held by the pending and confirmed bookings already in the database
+        op.execute("""
+            INSERT INTO event_inventory (event_id, reserved)
+            SELECT events.id, coalesce(sum(CASE WHEN bookings.status != 'CANCELLED' THEN bookings.quantity ELSE 0 END), 0)
+            FROM events
+            LEFT JOIN bookings ON bookings.event_id = events.id
+            GROUP BY events.id
+        """)
+
+    if 'ticket_inventory' not in existing:
+        op.create_table('ticket_inventory',
+        sa.Column('event_id', sa.Integer(), nullable=False),
+        sa.Column('ticket_type_id', sa.Integer(), nullable=False),
+        sa.Column('booked', sa.Integer(), nullable=False),
+        sa.Column('confirmed', sa.Integer(), nullable=False),
+        sa.Column('remaining', sa.Integer(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['event_id'], ['events.id'], ),
+        sa.ForeignKeyConstraint(['ticket_type_id'], ['ticket_types.id'], ),
+        sa.PrimaryKeyConstraint('event_id', 'ticket_type_id')
+        )
+        # Per-tier counters of the bookings already in the database (crud.rebuild_inventory)
+        op.execute("""
+            INSERT INTO ticket_inventory (event_id, ticket_type_id, booked, confirmed)
+            SELECT event_id, ticket_type_id,
+                   sum(CASE WHEN status != 'CANCELLED' THEN quantity ELSE 0 END),
+                   sum(CASE WHEN status = 'CONFIRMED' THEN quantity ELSE 0 END)
+            FROM bookings
+            GROUP BY event_id, ticket_type_id
+        """)
+        op.execute("""
+            INSERT INTO ticket_inventory (event_id, ticket_type_id, booked, confirmed)
+            SELECT event_id, ticket_type_id, 0, 0
+            FROM ticket_allotments
+            WHERE NOT EXISTS (
+                SELECT 1 FROM ticket_inventory
+                WHERE ticket_inventory.event_id = ticket_allotments.event_id
+                  AND ticket_inventory.ticket_type_id = ticket_allotments.ticket_type_id
+            )
+        """)
+        op.execute("""
+            UPDATE ticket_inventory SET remaining = (
+                SELECT ticket_allotments.quantity - ticket_inventory.booked
+                FROM ticket_allotments
+                WHERE ticket_allotments.event_id = ticket_inventory.event_id
+                  AND ticket_allotments.ticket_type_id = ticket_inventory.ticket_type_id
+            )
+        """)
+
+    if 'revenue_rollups' not in existing:
+        op.create_table('revenue_rollups',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('event_id', sa.Integer(), nullable=False),
+        sa.Column('venue_id', sa.Integer(), nullable=False),
+        sa.Column('ticket_type_id', sa.Integer(), nullable=False),
+        sa.Column('bookings', sa.Integer(), nullable=False),
+        sa.Column('tickets', sa.Integer(), nullable=False),
+        sa.Column('revenue', sa.Float(), nullable=False),
+        sa.Column('unit_price_total', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['event_id'], ['events.id'], ),
+        sa.ForeignKeyConstraint(['ticket_type_id'], ['ticket_types.id'], ),
+        sa.ForeignKeyConstraint(['venue_id'], ['venues.id'], ),
+        sa.PrimaryKeyConstraint('day', 'event_id', 'venue_id', 'ticket_type_id')
+        )
+        # Rollups of the confirmed bookings already in the database
+        op.execute("""
+            INSERT INTO revenue_rollups (day, event_id, venue_id, ticket_type_id, bookings, tickets, revenue, unit_price_total)
+            SELECT date(created_at), event_id, venue_id, ticket_type_id,
+                   count(*), sum(quantity), sum(total_amount), sum(total_amount * 1.0 / quantity)
+            FROM bookings
+            WHERE status = 'CONFIRMED'
+            GROUP BY date(created_at), event_id, venue_id, ticket_type_id
+        """)
+    op.create_index('ix_revenue_rollups_event_day', 'revenue_rollups', ['event_id', 'day'], unique=False, if_not_exists=True)
+    op.create_index('ix_revenue_rollups_venue_day', 'revenue_rollups', ['venue_id', 'day'], unique=False, if_not_exists=True)
+    op.create_index('ix_revenue_rollups_ticket_type_day', 'revenue_rollups', ['ticket_type_id', 'day'], unique=False, if_not_exists=True)
+
+    if op.get_bind().dialect.name == 'sqlite':
+        if 'booking_search' not in existing:
+            op.execute("""CREATE VIRTUAL TABLE booking_search USING fts5(
+                event_name, venue_name, ticket_type, customer_name, customer_email, tokenize = 'trigram'
+            )""")
+            op.execute("""
+                INSERT INTO booking_search (rowid, event_name, venue_name, ticket_type, customer_name, customer_email)
+                SELECT bookings.id, events.name, venues.name, ticket_types.name, bookings.customer_name, bookings.customer_email
+                FROM bookings
+                JOIN events ON events.id = bookings.event_id
+                JOIN venues ON venues.id = bookings.venue_id
+                JOIN ticket_types ON ticket_types.id = bookings.ticket_type_id
+            """)
+        for trigger in BOOKING_SEARCH_TRIGGERS:
+            op.execute(trigger)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'sqlite':
+        for trigger in ('booking_search_insert', 'booking_search_delete', 'booking_search_update',
+                        'booking_search_event_name', 'booking_search_venue_name', 'booking_search_ticket_type_name'):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS booking_search")
+    for table in ('revenue_rollups', 'ticket_inventory', 'event_inventory', 'ticket_allotments',
+                  'bookings', 'events', 'ticket_types', 'venues'):
+        op.drop_table(table)
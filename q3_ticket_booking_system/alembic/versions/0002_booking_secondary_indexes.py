@@ -0,0 +1,41 @@
+"""Secondary indexes on bookings by event, ticket type and venue
+
+Built one at a time outside the migration transaction (create_index_online), so a
+large bookings table keeps serving reads while they are created.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 10:05:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from app.migrations import create_index_online
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ('ix_bookings_event_covering', 'bookings', ['event_id', 'ticket_type_id', 'status', 'quantity', 'total_amount']),
+    ('ix_bookings_ticket_type_covering', 'bookings', ['ticket_type_id', 'event_id', 'status', 'quantity']),
+    ('ix_bookings_venue_id', 'bookings', ['venue_id']),
+    ('ix_ticket_allotments_ticket_type_id', 'ticket_allotments', ['ticket_type_id']),
+    ('ix_ticket_inventory_ticket_type_id', 'ticket_inventory', ['ticket_type_id']),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        create_index_online(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,38 @@
+"""Idempotency keys for booking creation
+
+Skipped when the table exists already, as it does in a database that create_all made
+from models that have it.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 10:10:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if 'idempotency_keys' not in sa.inspect(op.get_bind()).get_table_names():
+        op.create_table('idempotency_keys',
+        sa.Column('key', sa.String(), nullable=False),
+        sa.Column('fingerprint', sa.String(), nullable=False),
+        sa.Column('response', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.PrimaryKeyConstraint('key')
+        )
+    op.create_index('ix_idempotency_keys_created_at', 'idempotency_keys', ['created_at'], unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_idempotency_keys_created_at', table_name='idempotency_keys')
+    op.drop_table('idempotency_keys')
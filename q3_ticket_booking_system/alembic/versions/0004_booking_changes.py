@@ -0,0 +1,42 @@
+"""Booking change log
+
+Skipped when the table exists already, as it does in a database that create_all made
+from models that have it. Bookings made before this revision are not in the log.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 10:15:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if 'booking_changes' not in sa.inspect(op.get_bind()).get_table_names():
+        op.create_table('booking_changes',
+        sa.Column('seq', sa.Integer(), nullable=False),
+        sa.Column('operation', sa.String(), nullable=False),
+        sa.Column('booking_id', sa.Integer(), nullable=False),
+        sa.Column('event_id', sa.Integer(), nullable=False),
+        sa.Column('ticket_type_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.Enum('PENDING', 'CONFIRMED', 'CANCELLED', name='bookingstatus'), nullable=True),
+        sa.Column('quantity', sa.Integer(), nullable=False),
+        sa.Column('total_amount', sa.Float(), nullable=False),
+        sa.Column('changed_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.PrimaryKeyConstraint('seq'),
+        sqlite_autoincrement=True
+        )
+
+
+def downgrade() -> None:
+    op.drop_table('booking_changes')
@@ -1,85 +1,244 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from contextlib import contextmanager
+from fastapi import APIRouter, Depends, Header, HTTPException, status, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Any, AsyncIterator, Iterator, List, Optional
+import json
+import time
 from app.database import get_db
-from app import crud, schemas, models
+from app import changes, config, crud, schemas, models, export, idempotency, waiting_room
 
 router = APIRouter(prefix="/api/bookings", tags=["bookings"])
 
 @router.post("/", response_model=schemas.BookingResponse, status_code=status.HTTP_201_CREATED)
-def create_booking(booking: schemas.BookingCreate, db: Session = Depends(get_db)):
-    """Create a new booking"""
-    # Validate event exists
-    event = crud.get_event(db, booking.event_id)
-    if not event:
+def create_booking(
+    booking: schemas.BookingCreate,
+    db: Session = Depends(get_db),
+    x_queue_token: Optional[str] = Header(None),
+    idempotency_key: Optional[str] = Header(None, min_length=1, max_length=255)
+):
+    """Create a new booking (with an admitted X-Queue-Token if the event has a waiting room).
+
+    Retries with the same Idempotency-Key and body get the first response back
+    (marked Idempotent-Replayed: true) instead of a second booking.
+    """
+    if idempotency_key is not None:
+        with idempotency_errors():
+            replay = idempotency.store.begin(db, idempotency_key, idempotency.fingerprint(booking))
+        if replay is not None:
+            return replayed(replay)
+    
+    try:
+        # References, venue match and capacity are all checked inside crud.create_booking
+        with admission(booking.event_id, x_queue_token), booking_errors():
+            return crud.create_booking(db=db, booking=booking, idempotency_key=idempotency_key)
+    except HTTPException:
+        # Failures are not stored: the client may fix the request and retry with the key
+        if idempotency_key is not None:
+            idempotency.store.abandon(db, idempotency_key)
+        raise
+
+# Shared with app.api.bookings_async, which runs the same steps against an AsyncSession
+
+@contextmanager
+def idempotency_errors() -> Iterator[None]:
+    """Map a failed idempotency.store.begin to 409 (key in progress) or 422 (other body)"""
+    try:
+        yield
+    except idempotency.KeyInProgress as e:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Event not found"
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
         )
-    
-    # Validate venue exists
-    venue = crud.get_venue(db, booking.venue_id)
-    if not venue:
+    except ValueError as e:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Venue not found"
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e)
+        )
+
+def replayed(response: bytes) -> Response:
+    """The stored response of an idempotent request, sent again"""
+    return Response(response, status_code=status.HTTP_201_CREATED, media_type="application/json",
+                    headers={"Idempotent-Replayed": "true"})
+
+@contextmanager
+def admission(event_id: int, queue_token: Optional[str]) -> Iterator[None]:
+    """Claim the waiting room admission for the block (403 without one), and give it back if it fails"""
+    # Checked before any query, so clients still waiting in line cost the database nothing
+    try:
+        waiting_room.rooms.claim(event_id, queue_token)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=str(e)
         )
     
-    # Validate ticket type exists
-    ticket_type = crud.get_ticket_type(db, booking.ticket_type_id)
-    if not ticket_type:
+    try:
+        yield
+    except HTTPException:
+        # Nothing was booked, so the token can be used again
+        waiting_room.rooms.release(event_id, queue_token)
+        raise
+
+@contextmanager
+def booking_errors() -> Iterator[None]:
+    """Map crud errors from creating a booking to 404 (missing reference) or 400"""
+    try:
+        yield
+    except LookupError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail="Ticket type not found"
+            detail=str(e)
         )
-    
-    # Check if venue matches event venue
-    if event.venue_id != booking.venue_id:
+    except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Venue does not match event venue"
+            detail=str(e)
         )
+
+async def _bulk_rows(request: Request) -> AsyncIterator[Any]:
+    """Yield the raw rows of a bulk request: a JSON array, or one JSON object per line"""
+    if request.headers.get("content-type", "").startswith(("application/x-ndjson", "application/jsonl")):
+        buffer = b""
+        async for chunk in request.stream():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                if line.strip():
+                    yield json.loads(line)
+        if buffer.strip():
+            yield json.loads(buffer)
+        return
     
-    # Check availability
-    available_tickets = crud.get_available_tickets(db, booking.event_id)
-    if available_tickets["available_tickets"] < booking.quantity:
+    rows = json.loads(await request.body())
+    if not isinstance(rows, list):
+        raise ValueError("Expected a JSON array of bookings")
+    for row in rows:
+        yield row
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(map(str, detail['loc']))}: {detail['msg']}" for detail in error.errors())
+
+@router.post("/bulk", response_model=schemas.BulkBookingResponse)
+async def create_bookings_bulk(request: Request, db: Session = Depends(get_db)):
+    """Create many bookings from a JSON array or an NDJSON body (Content-Type: application/x-ndjson).
+
+    Every row gets its own result; rows that fail validation or capacity checks do not
+    stop the others.
+    """
+    start = time.perf_counter()
+    results = []
+    bookings = []
+    try:
+        async for row in _bulk_rows(request):
+            try:
+                bookings.append(schemas.BookingCreate.model_validate(row))
+                results.append(None)
+            except ValidationError as e:
+                results.append({"status": "failed", "error": _validation_message(e)})
+    except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Not enough tickets available. Only {available_tickets['available_tickets']} tickets left."
+            detail=f"Invalid bulk body: {e}"
         )
     
+    created = iter(await run_in_threadpool(crud.create_bookings_bulk, db, bookings))
+    results = [{"index": index, **(result or next(created))} for index, result in enumerate(results)]
+    
+    elapsed = time.perf_counter() - start
+    succeeded = sum(1 for result in results if result["status"] == "created")
+    return {
+        "created": succeeded,
+        "failed": len(results) - succeeded,
+        "elapsed_ms": round(elapsed * 1000, 1),
+        "rows_per_second": round(len(results) / elapsed, 1) if elapsed else 0.0,
+        "results": results
+    }
+
+@router.get("/", response_model=schemas.BookingList)
+def get_bookings(
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(100, ge=1, le=1000),
+    ids: Optional[List[int]] = Query(None, description="Fetch these ids instead of a page (?ids=1&ids=2), in the order given"),
+    db: Session = Depends(get_db)
+):
+    """Get all bookings with event, venue, and ticket type details, one page at a time, or by ids"""
     try:
-        return crud.create_booking(db=db, booking=booking)
+        if ids is not None:
+            return {"bookings": crud.get_bookings_by_ids(db, ids), "next_cursor": None}
+        if config.FAST_LIST_RESPONSES:
+            bookings, next_cursor = crud.get_booking_rows(db, cursor=cursor, limit=limit)
+            return ORJSONResponse({"bookings": bookings, "next_cursor": next_cursor})
+        bookings, next_cursor = crud.get_bookings(db, cursor=cursor, limit=limit)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
-
-@router.get("/", response_model=List[schemas.BookingResponse])
-def get_bookings(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Get all bookings with event, venue, and ticket type details"""
-    bookings = crud.get_bookings(db, skip=skip, limit=limit)
-    return bookings
+    return {"bookings": bookings, "next_cursor": next_cursor}
 
 @router.get("/search/", response_model=List[schemas.BookingResponse])
 def search_bookings(
+    q: Optional[str] = Query(None, description="Words to match in any field, including customer name and email"),
     event_name: Optional[str] = Query(None, description="Search by event name"),
     venue_name: Optional[str] = Query(None, description="Search by venue name"),
     ticket_type: Optional[str] = Query(None, description="Search by ticket type"),
     status: Optional[models.BookingStatus] = Query(None, description="Filter by booking status"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
     db: Session = Depends(get_db)
 ):
-    """Search bookings by event name, venue, and/or ticket type"""
+    """Search bookings by event name, venue, ticket type and/or customer, best matches first"""
     bookings = crud.search_bookings(
         db=db,
         event_name=event_name,
         venue_name=venue_name,
         ticket_type=ticket_type,
-        status=status
+        status=status,
+        q=q,
+        skip=skip,
+        limit=limit
     )
     return bookings
 
+@router.get("/export")
+def export_bookings(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="ndjson or csv"),
+    event_id: Optional[int] = Query(None, description="Only bookings for this event"),
+    status: Optional[models.BookingStatus] = Query(None, description="Filter by booking status"),
+):
+    """Stream every matching booking as NDJSON or CSV without loading them into memory"""
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        export.stream_bookings(format, event_id=event_id, status=status),
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename=bookings.{format}"}
+    )
+
+@router.get("/changes", response_model=schemas.BookingChangeList)
+async def get_booking_changes(
+    request: Request,
+    since: int = Query(0, ge=0, description="Only changes with a higher seq (next_since of the previous call)"),
+    limit: int = Query(1000, ge=1, le=10000),
+    wait: float = Query(0, ge=0, le=60, description="Seconds to wait for a change if there is none yet (long poll)"),
+    last_event_id: Optional[int] = Header(None, ge=0)
+):
+    """Booking creations, updates and deletes in commit order, after since.
+
+    Poll with since set to the previous next_since, optionally long-polling with wait,
+    or send Accept: text/event-stream to have them pushed as server-sent events.
+    """
+    if "text/event-stream" in request.headers.get("accept", ""):
+        return StreamingResponse(
+            changes.stream(last_event_id if last_event_id is not None else since, limit),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache"}
+        )
+    found = await changes.read(since, limit, wait)
+    return {"changes": found, "next_since": found[-1].seq if found else since}
+
 @router.get("/{booking_id}", response_model=schemas.BookingResponse)
 def get_booking(booking_id: int, db: Session = Depends(get_db)):
     """Get a specific booking by ID"""
@@ -94,7 +253,13 @@ def get_booking(booking_id: int, db: Session = Depends(get_db)):
 @router.put("/{booking_id}", response_model=schemas.BookingResponse)
 def update_booking(booking_id: int, booking: schemas.BookingUpdate, db: Session = Depends(get_db)):
     """Update booking details"""
-    db_booking = crud.update_booking(db=db, booking_id=booking_id, booking=booking)
+    try:
+        db_booking = crud.update_booking(db=db, booking_id=booking_id, booking=booking)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     if db_booking is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -115,7 +280,13 @@ def delete_booking(booking_id: int, db: Session = Depends(get_db)):
 @router.patch("/{booking_id}/status", response_model=schemas.BookingResponse)
 def update_booking_status(booking_id: int, status_update: schemas.BookingStatusUpdate, db: Session = Depends(get_db)):
     """Update booking status (confirmed, cancelled, pending)"""
-    db_booking = crud.update_booking_status(db=db, booking_id=booking_id, status=status_update.status)
+    try:
+        db_booking = crud.update_booking_status(db=db, booking_id=booking_id, status=status_update.status)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     if db_booking is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -0,0 +1,71 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, status, Query
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from app.database import get_async_db
+from app import config, crud_async, idempotency, schemas
+from app.api.bookings import admission, booking_errors, idempotency_errors, replayed
+
+# Async versions of the booking hot paths, mounted ahead of app.api.bookings when DB_MODE=async
+router = APIRouter(prefix="/api/bookings", tags=["bookings"])
+
+@router.post("/", response_model=schemas.BookingResponse, status_code=status.HTTP_201_CREATED)
+async def create_booking(
+    booking: schemas.BookingCreate,
+    db: AsyncSession = Depends(get_async_db),
+    x_queue_token: Optional[str] = Header(None),
+    idempotency_key: Optional[str] = Header(None, min_length=1, max_length=255)
+):
+    """Create a new booking (with an admitted X-Queue-Token if the event has a waiting room).
+
+    Retries with the same Idempotency-Key and body get the first response back
+    (marked Idempotent-Replayed: true) instead of a second booking.
+    """
+    if idempotency_key is not None:
+        with idempotency_errors():
+            replay = await db.run_sync(idempotency.store.begin, idempotency_key, idempotency.fingerprint(booking))
+        if replay is not None:
+            return replayed(replay)
+    
+    try:
+        # References, venue match and capacity are all checked inside crud_async.create_booking
+        with admission(booking.event_id, x_queue_token), booking_errors():
+            return await crud_async.create_booking(db, booking, idempotency_key)
+    except HTTPException:
+        # Failures are not stored: the client may fix the request and retry with the key
+        if idempotency_key is not None:
+            await db.run_sync(idempotency.store.abandon, idempotency_key)
+        raise
+
+@router.get("/", response_model=schemas.BookingList)
+async def get_bookings(
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(100, ge=1, le=1000),
+    ids: Optional[List[int]] = Query(None, description="Fetch these ids instead of a page (?ids=1&ids=2), in the order given"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get all bookings with event, venue, and ticket type details, one page at a time, or by ids"""
+    try:
+        if ids is not None:
+            return {"bookings": await crud_async.get_bookings_by_ids(db, ids), "next_cursor": None}
+        if config.FAST_LIST_RESPONSES:
+            bookings, next_cursor = await crud_async.get_booking_rows(db, cursor=cursor, limit=limit)
+            return ORJSONResponse({"bookings": bookings, "next_cursor": next_cursor})
+        bookings, next_cursor = await crud_async.get_bookings(db, cursor=cursor, limit=limit)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    return {"bookings": bookings, "next_cursor": next_cursor}
+
+@router.get("/{booking_id:int}", response_model=schemas.BookingResponse)
+async def get_booking(booking_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Get a specific booking by ID"""
+    booking = await crud_async.get_booking(db, booking_id)
+    if booking is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Booking not found"
+        )
+    return booking
@@ -1,8 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
-from app.database import get_db
-from app import crud, schemas, models
+from typing import List, Optional
+from datetime import date
+from app.database import SessionLocal, get_db
+from app import availability, config, crud, schemas, models
 
 router = APIRouter(prefix="/api/events", tags=["events"])
 
@@ -17,13 +20,60 @@ def create_event(event: schemas.EventCreate, db: Session = Depends(get_db)):
             detail="Venue not found"
         )
     
-    return crud.create_event(db=db, event=event)
+    # Validate allotted ticket types exist
+    for allotment in event.allotments:
+        if not crud.get_ticket_type(db, allotment.ticket_type_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Ticket type not found"
+            )
+    
+    try:
+        return crud.create_event(db=db, event=event)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+@router.get("/", response_model=schemas.EventList)
+def get_events(
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(100, ge=1, le=1000),
+    ids: Optional[List[int]] = Query(None, description="Fetch these ids instead of a page (?ids=1&ids=2), in the order given"),
+    db: Session = Depends(get_db)
+):
+    """Get all events, one page at a time, or by ids"""
+    try:
+        if ids is not None:
+            return {"events": crud.get_events_by_ids(db, ids), "next_cursor": None}
+        events, next_cursor = crud.get_events(db, cursor=cursor, limit=limit)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    return {"events": events, "next_cursor": next_cursor}
 
-@router.get("/", response_model=List[schemas.EventResponse])
-def get_events(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Get all events"""
-    events = crud.get_events(db, skip=skip, limit=limit)
-    return events
+@router.get("/calendar", response_model=schemas.EventCalendar)
+def get_event_calendar(
+    start: date = Query(..., description="First day"),
+    end: date = Query(..., description="Last day"),
+    venue_id: Optional[int] = Query(None, description="Only events at this venue"),
+    db: Session = Depends(get_db)
+):
+    """Get the events between start and end grouped by day, with booked and available seats.
+
+    Served through the response cache, so responses carry an ETag and a refresh sending
+    it back as If-None-Match gets an empty 304 while nothing in the range changed.
+    """
+    try:
+        return crud.get_event_calendar(db, start, end, venue_id=venue_id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
 
 @router.get("/{event_id}", response_model=schemas.EventResponse)
 def get_event(event_id: int, db: Session = Depends(get_db)):
@@ -68,6 +118,8 @@ def get_event_bookings(event_id: int, db: Session = Depends(get_db)):
             detail="Event not found"
         )
     
+    if config.FAST_LIST_RESPONSES:
+        return ORJSONResponse(crud.get_event_booking_rows(db, event_id))
     bookings = crud.get_event_bookings(db, event_id)
     return bookings
 
@@ -82,6 +134,66 @@ def get_available_tickets(event_id: int, db: Session = Depends(get_db)):
         )
     return available_tickets
 
+def _event_exists(event_id: int) -> bool:
+    # A session of its own, closed before streaming starts: one from get_db would stay
+    # checked out of the pool until the client disconnects
+    db = SessionLocal()
+    try:
+        return crud.get_event(db, event_id) is not None
+    finally:
+        db.close()
+
+@router.get("/{event_id}/availability/stream")
+async def stream_available_tickets(event_id: int):
+    """Server-sent events with the event's available tickets, sent again whenever they change"""
+    if not await run_in_threadpool(_event_exists, event_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Event not found"
+        )
+    return StreamingResponse(
+        availability.hub.stream(event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
+
+@router.get("/{event_id}/allotments", response_model=List[schemas.TicketAllotmentResponse])
+def get_event_allotments(event_id: int, db: Session = Depends(get_db)):
+    """Get the seats set aside for each ticket type at an event"""
+    event = crud.get_event(db, event_id)
+    if not event:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Event not found"
+        )
+    
+    return crud.get_event_allotments(db, event_id)
+
+@router.put("/{event_id}/allotments", response_model=List[schemas.TicketAllotmentResponse])
+def set_event_allotments(event_id: int, allotments: schemas.TicketAllotmentList, db: Session = Depends(get_db)):
+    """Replace the seats set aside for each ticket type at an event"""
+    event = crud.get_event(db, event_id)
+    if not event:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Event not found"
+        )
+    
+    for allotment in allotments.allotments:
+        if not crud.get_ticket_type(db, allotment.ticket_type_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Ticket type not found"
+            )
+    
+    try:
+        return crud.set_event_allotments(db, event_id, allotments.allotments)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
 @router.get("/{event_id}/revenue", response_model=schemas.EventRevenue)
 def get_event_revenue(event_id: int, db: Session = Depends(get_db)):
     """Calculate total revenue for a specific event"""
@@ -91,4 +203,26 @@ def get_event_revenue(event_id: int, db: Session = Depends(get_db)):
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Event not found"
         )
-    return revenue 
\ No newline at end of file
+    return revenue
+
+@router.get("/{event_id}/revenue/daily", response_model=schemas.RevenueSeries)
+def get_event_revenue_series(
+    event_id: int,
+    start: Optional[date] = Query(None, description="First day (default: 29 days before end)"),
+    end: Optional[date] = Query(None, description="Last day (default: today, UTC)"),
+    db: Session = Depends(get_db)
+):
+    """Get daily confirmed revenue for an event"""
+    if not crud.get_event(db, event_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Event not found"
+        )
+    
+    try:
+        return crud.get_revenue_series(db, start, end, event_id=event_id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
@@ -0,0 +1,49 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from app.database import get_async_db
+from app import crud_async, schemas
+
+# Async versions of the event read paths, mounted ahead of app.api.events when DB_MODE=async
+router = APIRouter(prefix="/api/events", tags=["events"])
+
+@router.get("/", response_model=schemas.EventList)
+async def get_events(
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(100, ge=1, le=1000),
+    ids: Optional[List[int]] = Query(None, description="Fetch these ids instead of a page (?ids=1&ids=2), in the order given"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get all events, one page at a time, or by ids"""
+    try:
+        if ids is not None:
+            return {"events": await crud_async.get_events_by_ids(db, ids), "next_cursor": None}
+        events, next_cursor = await crud_async.get_events(db, cursor=cursor, limit=limit)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    return {"events": events, "next_cursor": next_cursor}
+
+@router.get("/{event_id:int}", response_model=schemas.EventResponse)
+async def get_event(event_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Get a specific event by ID"""
+    event = await crud_async.get_event(db, event_id)
+    if event is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Event not found"
+        )
+    return event
+
+@router.get("/{event_id:int}/available-tickets", response_model=schemas.AvailableTickets)
+async def get_available_tickets(event_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Get available tickets for an event"""
+    available_tickets = await crud_async.get_available_tickets(db, event_id)
+    if not available_tickets:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Event not found"
+        )
+    return available_tickets
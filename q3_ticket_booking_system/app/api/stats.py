@@ -1,7 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
+from typing import Optional
+from datetime import date
 from app.database import get_db
-from app import crud, schemas
+from app import availability, crud, holds, idempotency, response_cache, schemas
 
 router = APIRouter(prefix="/api/booking-system", tags=["statistics"])
 
@@ -9,4 +12,48 @@ router = APIRouter(prefix="/api/booking-system", tags=["statistics"])
 def get_booking_stats(db: Session = Depends(get_db)):
     """Get booking statistics (total bookings, events, venues, available tickets)"""
     stats = crud.get_booking_stats(db)
-    return stats 
\ No newline at end of file
+    return stats
+
+@router.get("/stats/stream")
+def stream_booking_stats():
+    """Server-sent events with the booking statistics, sent again whenever they change"""
+    return StreamingResponse(
+        availability.hub.stream(availability.STATS),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
+
+@router.get("/holds", response_model=schemas.HoldSweepMetrics)
+def get_hold_metrics():
+    """Get hold expiry sweeper metrics (sweep latency, holds and seats released)"""
+    return holds.sweeper.metrics()
+
+@router.get("/availability", response_model=schemas.AvailabilityStreamMetrics)
+def get_availability_stream_metrics():
+    """Get live availability stream metrics (subscribers, computations, messages sent and dropped)"""
+    return availability.hub.metrics()
+
+@router.get("/cache", response_model=schemas.ResponseCacheStats)
+def get_response_cache_stats():
+    """Get HTTP response cache statistics (entries, size, hits, misses, evictions)"""
+    return response_cache.responses.stats()
+
+@router.get("/idempotency", response_model=schemas.IdempotencyStats)
+def get_idempotency_stats():
+    """Get booking Idempotency-Key statistics (retries answered from memory or the table, new keys)"""
+    return idempotency.store.stats()
+
+@router.get("/revenue/daily", response_model=schemas.RevenueSeries)
+def get_revenue_series(
+    start: Optional[date] = Query(None, description="First day (default: 29 days before end)"),
+    end: Optional[date] = Query(None, description="Last day (default: today, UTC)"),
+    db: Session = Depends(get_db)
+):
+    """Get daily confirmed revenue across all events"""
+    try:
+        return crud.get_revenue_series(db, start, end)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
@@ -1,8 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+from datetime import date
 from app.database import get_db
-from app import crud, schemas, models
+from app import config, crud, schemas, models
 
 router = APIRouter(prefix="/api/ticket-types", tags=["ticket-types"])
 
@@ -11,11 +13,24 @@ def create_ticket_type(ticket_type: schemas.TicketTypeCreate, db: Session = Depe
     """Create a new ticket type"""
     return crud.create_ticket_type(db=db, ticket_type=ticket_type)
 
-@router.get("/", response_model=List[schemas.TicketTypeResponse])
-def get_ticket_types(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Get all ticket types"""
-    ticket_types = crud.get_ticket_types(db, skip=skip, limit=limit)
-    return ticket_types
+@router.get("/", response_model=schemas.TicketTypeList)
+def get_ticket_types(
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(100, ge=1, le=1000),
+    ids: Optional[List[int]] = Query(None, description="Fetch these ids instead of a page (?ids=1&ids=2), in the order given"),
+    db: Session = Depends(get_db)
+):
+    """Get all ticket types, one page at a time, or by ids"""
+    try:
+        if ids is not None:
+            return {"ticket_types": crud.get_ticket_types_by_ids(db, ids), "next_cursor": None}
+        ticket_types, next_cursor = crud.get_ticket_types(db, cursor=cursor, limit=limit)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    return {"ticket_types": ticket_types, "next_cursor": next_cursor}
 
 @router.get("/{ticket_type_id}", response_model=schemas.TicketTypeResponse)
 def get_ticket_type(ticket_type_id: int, db: Session = Depends(get_db)):
@@ -60,5 +75,29 @@ def get_ticket_type_bookings(ticket_type_id: int, db: Session = Depends(get_db))
             detail="Ticket type not found"
         )
     
+    if config.FAST_LIST_RESPONSES:
+        return ORJSONResponse(crud.get_ticket_type_booking_rows(db, ticket_type_id))
     bookings = crud.get_ticket_type_bookings(db, ticket_type_id)
-    return bookings 
\ No newline at end of file
+    return bookings
+
+@router.get("/{ticket_type_id}/revenue/daily", response_model=schemas.RevenueSeries)
+def get_ticket_type_revenue_series(
+    ticket_type_id: int,
+    start: Optional[date] = Query(None, description="First day (default: 29 days before end)"),
+    end: Optional[date] = Query(None, description="Last day (default: today, UTC)"),
+    db: Session = Depends(get_db)
+):
+    """Get daily confirmed revenue for a ticket type"""
+    if not crud.get_ticket_type(db, ticket_type_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Ticket type not found"
+        )
+    
+    try:
+        return crud.get_revenue_series(db, start, end, ticket_type_id=ticket_type_id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
@@ -1,6 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+from datetime import date
 from app.database import get_db
 from app import crud, schemas, models
 
@@ -11,11 +12,40 @@ def create_venue(venue: schemas.VenueCreate, db: Session = Depends(get_db)):
     """Create a new venue"""
     return crud.create_venue(db=db, venue=venue)
 
-@router.get("/", response_model=List[schemas.VenueResponse])
-def get_venues(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Get all venues"""
-    venues = crud.get_venues(db, skip=skip, limit=limit)
-    return venues
+@router.get("/", response_model=schemas.VenueList)
+def get_venues(
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(100, ge=1, le=1000),
+    ids: Optional[List[int]] = Query(None, description="Fetch these ids instead of a page (?ids=1&ids=2), in the order given"),
+    db: Session = Depends(get_db)
+):
+    """Get all venues, one page at a time, or by ids"""
+    try:
+        if ids is not None:
+            return {"venues": crud.get_venues_by_ids(db, ids), "next_cursor": None}
+        venues, next_cursor = crud.get_venues(db, cursor=cursor, limit=limit)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    return {"venues": venues, "next_cursor": next_cursor}
+
+@router.get("/occupancy", response_model=List[schemas.VenueOccupancy])
+def get_venues_occupancy(
+    ids: Optional[List[int]] = Query(None, description="Venue ids, repeated (?ids=1&ids=2); all venues if omitted"),
+    start: Optional[date] = Query(None, description="Only events on or after this day"),
+    end: Optional[date] = Query(None, description="Only events on or before this day"),
+    db: Session = Depends(get_db)
+):
+    """Get occupancy for many venues in one call; unknown ids are left out"""
+    try:
+        return crud.get_venues_occupancy(db, ids, start, end)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
 
 @router.get("/{venue_id}", response_model=schemas.VenueResponse)
 def get_venue(venue_id: int, db: Session = Depends(get_db)):
@@ -64,12 +94,45 @@ def get_venue_events(venue_id: int, db: Session = Depends(get_db)):
     return events
 
 @router.get("/{venue_id}/occupancy", response_model=schemas.VenueOccupancy)
-def get_venue_occupancy(venue_id: int, db: Session = Depends(get_db)):
-    """Get venue occupancy statistics"""
-    occupancy = crud.get_venue_occupancy(db, venue_id)
+def get_venue_occupancy(
+    venue_id: int,
+    start: Optional[date] = Query(None, description="Only events on or after this day"),
+    end: Optional[date] = Query(None, description="Only events on or before this day"),
+    db: Session = Depends(get_db)
+):
+    """Get venue occupancy statistics, per event and for the events in the date range"""
+    try:
+        occupancy = crud.get_venue_occupancy(db, venue_id, start, end)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     if not occupancy:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Venue not found"
         )
-    return occupancy 
\ No newline at end of file
+    return occupancy
+
+@router.get("/{venue_id}/revenue/daily", response_model=schemas.RevenueSeries)
+def get_venue_revenue_series(
+    venue_id: int,
+    start: Optional[date] = Query(None, description="First day (default: 29 days before end)"),
+    end: Optional[date] = Query(None, description="Last day (default: today, UTC)"),
+    db: Session = Depends(get_db)
+):
+    """Get daily confirmed revenue across a venue's events"""
+    if not crud.get_venue(db, venue_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Venue not found"
+        )
+    
+    try:
+        return crud.get_revenue_series(db, start, end, venue_id=venue_id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
@@ -0,0 +1,59 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+from app.database import get_db
+from app import config, crud, schemas, waiting_room
+
+# Queue endpoints that do not touch the database are async, so clients polling in line are
+# served on the event loop and never compete with bookings for threadpool workers
+router = APIRouter(prefix="/api/events", tags=["waiting room"])
+
+def _room_not_open():
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="No waiting room is open for this event"
+    )
+
+@router.put("/{event_id}/waiting-room", response_model=schemas.WaitingRoomStatus)
+def open_waiting_room(event_id: int, settings: schemas.WaitingRoomSettings, db: Session = Depends(get_db)):
+    """Open (or retune) the waiting room of an event; bookings then need an admitted queue token"""
+    if not crud.get_event(db, event_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Event not found"
+        )
+    
+    ttl = settings.admission_ttl_seconds or config.WAITING_ROOM_ADMISSION_TTL_SECONDS
+    return {"event_id": event_id, **waiting_room.rooms.open(event_id, settings.admit_per_second, ttl)}
+
+@router.get("/{event_id}/waiting-room", response_model=schemas.WaitingRoomStatus)
+async def get_waiting_room(event_id: int):
+    """Get the admission rate and queue length of an event's waiting room"""
+    summary = waiting_room.rooms.summary(event_id)
+    if summary is None:
+        raise _room_not_open()
+    return {"event_id": event_id, **summary}
+
+@router.delete("/{event_id}/waiting-room", status_code=status.HTTP_204_NO_CONTENT)
+async def close_waiting_room(event_id: int):
+    """Close an event's waiting room; bookings no longer need a queue token"""
+    if not waiting_room.rooms.close(event_id):
+        raise _room_not_open()
+
+@router.post("/{event_id}/waiting-room/tokens", response_model=schemas.QueueTokenStatus, status_code=status.HTTP_201_CREATED)
+async def join_waiting_room(event_id: int):
+    """Join the queue for an event and get a token to poll until it is admitted"""
+    ticket = waiting_room.rooms.join(event_id)
+    if ticket is None:
+        raise _room_not_open()
+    return {"event_id": event_id, **ticket}
+
+@router.get("/{event_id}/waiting-room/tokens/{token}", response_model=schemas.QueueTokenStatus)
+async def get_queue_token(event_id: int, token: str):
+    """Get a queue token's position and estimated wait, or its admission window once admitted"""
+    state = waiting_room.rooms.status(event_id, token)
+    if state is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Queue token not found"
+        )
+    return {"token": token, "event_id": event_id, **state}
@@ -0,0 +1,207 @@
+"""
+Live availability pushed to event and dashboard pages as server-sent events.
+
+Instead of every open page polling /api/events/{id}/available-tickets and
+/api/booking-system/stats, pages subscribe to a stream and AvailabilityHub publishes to
+them. The hub is the only reader: it tails the booking change log (woken by
+cache.changed when a write commits), recomputes the availability of each event that
+changed and has subscribers, once, and hands the same JSON to every subscriber of that
+event. Messages that equal the last one sent are skipped.
+
+Each subscriber has a bounded buffer. A client that stops reading loses its oldest
+messages, which is harmless because every message is the event's full availability.
+"""
+
+import asyncio
+import logging
+import threading
+from typing import Any, AsyncIterator, Dict, Iterable, Optional, Set, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+
+from app import cache, changes, config, crud, schemas
+from app.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# Subscription key of the booking statistics; events are keyed by their id
+STATS = "stats"
+
+# Tables whose writes change the booking statistics
+STATS_TABLES = {"bookings", "events", "venues"}
+
+# Tables whose writes can change any event's availability without a booking change
+CATALOG_TABLES = {"events", "ticket_types", "ticket_allotments"}
+
+class _Subscriber:
+    __slots__ = ("queue",)
+
+    def __init__(self, buffer_size: int):
+        self.queue: "asyncio.Queue[str]" = asyncio.Queue(maxsize=buffer_size)
+
+    def offer(self, message: str) -> bool:
+        """Queue message, dropping the oldest one if the buffer is full; False if one was dropped"""
+        dropped = self.queue.full()
+        if dropped:
+            self.queue.get_nowait()
+        self.queue.put_nowait(message)
+        return not dropped
+
+class AvailabilityHub:
+    """Background task fanning availability changes out to SSE subscribers.
+
+    Started and stopped from main.py. Runs on the event loop; queries go to the
+    threadpool with a session of their own. Writes made by other processes are picked
+    up every interval seconds, when the hub reads the change log anyway.
+    """
+
+    def __init__(self, buffer_size: int, interval: float):
+        self.buffer_size = buffer_size
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+        self._wake = changes.ChangeNotifier()
+        self._lock = threading.Lock()
+        self._catalog_changed = False
+        self._stats_changed = False
+        self._seq = 0
+        self._subscribers: Dict[Any, Set[_Subscriber]] = {}
+        self._last: Dict[Any, str] = {}
+        self._metrics = {
+            "computations": 0,
+            "messages_sent": 0,
+            "messages_dropped": 0,
+        }
+        cache.on_change(self._on_change)
+
+    def _on_change(self, tables: Tuple[str, ...]) -> None:
+        # Called from the thread that committed the write
+        with self._lock:
+            if CATALOG_TABLES.intersection(tables):
+                self._catalog_changed = True
+            if STATS_TABLES.intersection(tables):
+                self._stats_changed = True
+        self._wake.notify()
+
+    # Reading the database, in the threadpool
+    def _compute(self, keys: Iterable[Any]) -> Dict[Any, Optional[str]]:
+        db = SessionLocal()
+        try:
+            messages = {}
+            for key in keys:
+                if key == STATS:
+                    value = schemas.BookingStats.model_validate(crud.get_booking_stats(db))
+                else:
+                    available = crud.get_available_tickets(db, key)
+                    value = schemas.AvailableTickets.model_validate(available) if available else None
+                messages[key] = value.model_dump_json() if value is not None else None
+            with self._lock:
+                self._metrics["computations"] += len(messages)
+            return messages
+        finally:
+            db.close()
+
+    def _changed_events(self, since: int) -> Tuple[Set[int], int]:
+        db = SessionLocal()
+        try:
+            events = set()
+            while True:
+                batch = crud.get_booking_changes(db, since, 1000)
+                events.update(change.event_id for change in batch)
+                if len(batch) < 1000:
+                    return events, since if not batch else batch[-1].seq
+                since = batch[-1].seq
+        finally:
+            db.close()
+
+    def _last_seq(self) -> int:
+        db = SessionLocal()
+        try:
+            return crud.get_last_booking_change_seq(db)
+        finally:
+            db.close()
+
+    # Publishing, on the event loop
+    async def refresh(self) -> None:
+        """Recompute what changed since the last refresh and send it to its subscribers"""
+        with self._lock:
+            catalog_changed, self._catalog_changed = self._catalog_changed, False
+            stats_changed, self._stats_changed = self._stats_changed, False
+        events, self._seq = await run_in_threadpool(self._changed_events, self._seq)
+
+        watched = set(self._subscribers)
+        keys = watched - {STATS} if catalog_changed else watched & events
+        if STATS in watched and (stats_changed or events):
+            keys.add(STATS)
+        if not keys:
+            return
+        for key, message in (await run_in_threadpool(self._compute, keys)).items():
+            self._publish(key, message)
+
+    def _publish(self, key: Any, message: Optional[str]) -> None:
+        if message is None or message == self._last.get(key) or key not in self._subscribers:
+            return
+        self._last[key] = message
+        dropped = sum(not subscriber.offer(message) for subscriber in self._subscribers[key])
+        with self._lock:
+            self._metrics["messages_sent"] += len(self._subscribers[key])
+            self._metrics["messages_dropped"] += dropped
+
+    async def stream(self, key: Any, heartbeat: float = changes.HEARTBEAT_SECONDS) -> AsyncIterator[str]:
+        """Server-sent events for one event id (or STATS): the current value, then each change"""
+        subscriber = _Subscriber(self.buffer_size)
+        self._subscribers.setdefault(key, set()).add(subscriber)
+        try:
+            message = self._last.get(key)
+            if message is None:
+                message = (await run_in_threadpool(self._compute, [key]))[key]
+                if message is not None:
+                    self._last.setdefault(key, message)
+            if message is not None:
+                yield f"data: {message}\n\n"
+            while True:
+                try:
+                    message = await asyncio.wait_for(subscriber.queue.get(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"data: {message}\n\n"
+        finally:
+            subscribers = self._subscribers[key]
+            subscribers.discard(subscriber)
+            if not subscribers:
+                del self._subscribers[key]
+                self._last.pop(key, None)
+
+    async def run(self) -> None:
+        self._seq = await run_in_threadpool(self._last_seq)
+        while True:
+            seen = self._wake.version
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception("Availability refresh failed")
+            await self._wake.wait(seen, self.interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            metrics = dict(self._metrics)
+        metrics["running"] = self._task is not None
+        metrics["subscribers"] = sum(len(subscribers) for subscribers in self._subscribers.values())
+        metrics["streams"] = len(self._subscribers)
+        metrics["buffer_size"] = self.buffer_size
+        return metrics
+
+hub = AvailabilityHub(config.AVAILABILITY_STREAM_BUFFER, config.AVAILABILITY_STREAM_INTERVAL_SECONDS)
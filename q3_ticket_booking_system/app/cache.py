@@ -0,0 +1,71 @@
+import threading
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from app import config
+
+class SnapshotCache:
+    """Holds one computed value until it is invalidated or older than max_age seconds"""
+
+    def __init__(self, max_age: float):
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._value = None
+        self._expires_at = 0.0
+        self._generation = 0
+
+    def get(self, loader: Callable[[], Any]) -> Any:
+        with self._lock:
+            if self._value is not None and time.monotonic() < self._expires_at:
+                return self._value
+            generation = self._generation
+
+        value = loader()
+
+        # Only keep the value if nothing was written while it was being computed
+        with self._lock:
+            if generation == self._generation and self.max_age > 0:
+                self._value = value
+                self._expires_at = time.monotonic() + self.max_age
+        return value
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._value = None
+
+class TableVersions:
+    """Write counters per table; a cached value built from some tables is current while their versions are unchanged"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._versions: Dict[str, int] = {}
+
+    def get(self, *tables: str) -> Tuple[int, ...]:
+        with self._lock:
+            return tuple(self._versions.get(table, 0) for table in tables)
+
+    def bump(self, *tables: str) -> None:
+        with self._lock:
+            for table in tables:
+                self._versions[table] = self._versions.get(table, 0) + 1
+
+# Dashboard statistics, invalidated by every write through crud
+stats_snapshot = SnapshotCache(config.STATS_CACHE_TTL)
+
+# Bumped by crud after it commits a write; keys the HTTP response cache
+table_versions = TableVersions()
+
+# Called with the tables of every committed write, after the caches above are invalidated
+_listeners: List[Callable[[Tuple[str, ...]], None]] = []
+
+def on_change(listener: Callable[[Tuple[str, ...]], None]) -> None:
+    """Have listener called from the writing thread after each committed write; it must not block"""
+    _listeners.append(listener)
+
+def changed(*tables: str) -> None:
+    """Record a committed write to tables, invalidating the caches built from them"""
+    table_versions.bump(*tables)
+    stats_snapshot.invalidate()
+    for listener in _listeners:
+        listener(tables)
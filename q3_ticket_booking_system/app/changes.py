@@ -0,0 +1,98 @@
+"""
+Tailing the booking change log (models.BookingChange).
+
+GET /api/bookings/changes reads the log after a sequence number. When there is nothing
+new it long-polls, or keeps an SSE stream open, until a booking write commits: crud
+reports every committed write through cache.changed, and the notifier wakes the
+waiting readers instead of having each one query the table in a loop. Writes from
+other processes are picked up when a reader's wait times out and it queries again.
+"""
+
+import asyncio
+import threading
+from typing import AsyncIterator, List, Set, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+
+from app import cache, crud, models, schemas
+from app.database import SessionLocal
+
+HEARTBEAT_SECONDS = 15
+
+class ChangeNotifier:
+    """Counts committed booking writes and wakes the readers waiting for the next one"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = 0
+        self._waiters: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = set()
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def notify(self) -> None:
+        # Called from the threadpool thread that committed the write
+        with self._lock:
+            self._version += 1
+            waiters = list(self._waiters)
+        for loop, wake in waiters:
+            loop.call_soon_threadsafe(wake.set)
+
+    async def wait(self, seen: int, timeout: float) -> bool:
+        """Wait up to timeout seconds for a write after version seen; True if there was one"""
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        with self._lock:
+            if self._version != seen:
+                return True
+            self._waiters.add(waiter)
+        try:
+            await asyncio.wait_for(waiter[1].wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            with self._lock:
+                self._waiters.discard(waiter)
+
+notifier = ChangeNotifier()
+
+def _on_change(tables: Tuple[str, ...]) -> None:
+    if "bookings" in tables:
+        notifier.notify()
+
+cache.on_change(_on_change)
+
+def _read(since: int, limit: int) -> List[models.BookingChange]:
+    # A session per read, so a long-lived stream does not hold a connection between reads
+    db = SessionLocal()
+    try:
+        return crud.get_booking_changes(db, since, limit)
+    finally:
+        db.close()
+
+async def read(since: int, limit: int, wait: float = 0) -> List[models.BookingChange]:
+    """Changes after since, waiting up to wait seconds for one if there are none yet"""
+    seen = notifier.version
+    changes = await run_in_threadpool(_read, since, limit)
+    if changes or wait <= 0:
+        return changes
+    # Read again after a timeout too, for writes made by other processes
+    await notifier.wait(seen, wait)
+    return await run_in_threadpool(_read, since, limit)
+
+async def stream(since: int, limit: int, heartbeat: float = HEARTBEAT_SECONDS) -> AsyncIterator[str]:
+    """Server-sent events: one message per change, with its seq as the event id.
+
+    A reconnecting EventSource sends the last id back as Last-Event-ID and resumes
+    after it. A comment line goes out every heartbeat seconds without changes, so
+    proxies keep the connection open.
+    """
+    while True:
+        changes = await read(since, limit, wait=heartbeat)
+        if not changes:
+            yield ": keep-alive\n\n"
+            continue
+        for change in changes:
+            yield f"id: {change.seq}\ndata: {schemas.BookingChange.model_validate(change).model_dump_json()}\n\n"
+        since = changes[-1].seq
@@ -0,0 +1,72 @@
+import os
+
+# Database URLs for the sync stack and the async stack (SQLAlchemy URL syntax)
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./ticket_booking.db")
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", "sqlite+aiosqlite:///./ticket_booking.db")
+
+# "sync" serves every endpoint from the threadpool with blocking sessions; "async" serves
+# the booking and event hot paths from async endpoints on the async engine instead
+DB_MODE = os.getenv("DB_MODE", "sync").lower()
+
+# SQLite tuning applied to every new connection. "performance" enables WAL so readers no
+# longer wait behind booking writes; "default" leaves SQLite's stock settings alone.
+SQLITE_PROFILE = os.getenv("SQLITE_PROFILE", "performance").lower()
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+# Negative values are KiB, positive values are pages (SQLite convention)
+SQLITE_CACHE_SIZE = int(os.getenv("SQLITE_CACHE_SIZE", "-65536"))
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+
+# Connection pool sizing for both engines. A request's session keeps its connection
+# until get_db's cleanup runs on the threadpool, so a capped pool can fill up while every
+# threadpool worker waits for a connection, stalling all requests for DB_POOL_TIMEOUT.
+# Overflow is therefore unlimited by default (-1); extra SQLite connections are cheap.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "-1"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+
+# Seconds a /api/booking-system/stats snapshot may be served before it is recomputed.
+# Writes through crud invalidate it immediately; 0 disables the cache.
+STATS_CACHE_TTL = float(os.getenv("STATS_CACHE_TTL", "5"))
+
+# Memory bound, in bytes, of the HTTP response cache for venue, ticket type and event reads.
+# Entries are dropped as soon as crud writes to a table they were built from; 0 disables it.
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+# Seconds a cached response may be served at most. Table versions are per process, so this
+# is how long a write made by another worker can go unseen; 0 (single process only) keeps
+# entries until a local write or eviction.
+RESPONSE_CACHE_MAX_AGE_SECONDS = float(os.getenv("RESPONSE_CACHE_MAX_AGE_SECONDS", "5"))
+
+# Serve the booking list endpoints (/api/bookings/, /api/events/{id}/bookings,
+# /api/ticket-types/{id}/bookings) from plain rows encoded with orjson instead of validating
+# every ORM object into BookingResponse. Same JSON, much less CPU on large lists.
+FAST_LIST_RESPONSES = os.getenv("FAST_LIST_RESPONSES", "").lower() in ("1", "true", "yes")
+
+# Pending bookings hold their seats for HOLD_TTL_SECONDS; after that the background
+# sweeper cancels them and releases the seats. Off (0, holds kept forever) unless set:
+# the first sweep also cancels every pending booking made before expiry existed.
+HOLD_TTL_SECONDS = int(os.getenv("HOLD_TTL_SECONDS", "0"))
+HOLD_SWEEP_INTERVAL_SECONDS = float(os.getenv("HOLD_SWEEP_INTERVAL_SECONDS", "30"))
+HOLD_SWEEP_BATCH_SIZE = int(os.getenv("HOLD_SWEEP_BATCH_SIZE", "500"))
+
+# Seconds an admitted waiting room token stays valid for booking, unless the room sets its own
+WAITING_ROOM_ADMISSION_TTL_SECONDS = float(os.getenv("WAITING_ROOM_ADMISSION_TTL_SECONDS", "300"))
+
+# Seconds a booking's Idempotency-Key is remembered, and how many completed responses
+# are kept in memory in front of the idempotency_keys table
+IDEMPOTENCY_TTL_SECONDS = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400"))
+IDEMPOTENCY_CACHE_SIZE = int(os.getenv("IDEMPOTENCY_CACHE_SIZE", "10000"))
+
+# Live availability streams (/api/events/{id}/availability/stream, /api/booking-system/stats/stream):
+# messages buffered per client before its oldest are dropped, and how often the publisher
+# re-reads the booking change log for writes made by other processes
+AVAILABILITY_STREAM_BUFFER = int(os.getenv("AVAILABILITY_STREAM_BUFFER", "16"))
+AVAILABILITY_STREAM_INTERVAL_SECONDS = float(os.getenv("AVAILABILITY_STREAM_INTERVAL_SECONDS", "5"))
+
+# Skip the schema check on startup. For workers started after `python manage.py db upgrade`
+# has migrated the database: they serve without reading or touching the schema.
+SKIP_SCHEMA_CHECK = os.getenv("SKIP_SCHEMA_CHECK", "").lower() in ("1", "true", "yes")
+
+# Add X-DB-Statements, X-DB-Time-Ms and X-Response-Time-Ms headers to every response
+METRICS_DEBUG_HEADERS = os.getenv("METRICS_DEBUG_HEADERS", "").lower() in ("1", "true", "yes")
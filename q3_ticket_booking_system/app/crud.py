@@ -1,21 +1,37 @@
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func, and_, or_
-from typing import List, Optional, Dict, Any
+from sqlalchemy.orm import Session, aliased, joinedload
+from sqlalchemy import func, and_, or_, case, select, insert, update, delete, exists, literal, table, column, text
+from sqlalchemy.exc import IntegrityError
+from typing import List, Optional, Dict, Any, Tuple, Iterable, Iterator
 import uuid
-from datetime import datetime
+from datetime import date, datetime, timedelta
 
-from app import models, schemas
+from app import cache, models, schemas
+from app.pagination import keyset_page
+
+def _by_ids(query, ids: List[int], max_ids: int = 1000) -> List[Any]:
+    """Rows of query whose id is in ids, fetched with one IN (...) and returned in the order
+    asked for. Duplicates and unknown ids are dropped. Raises ValueError past max_ids."""
+    if len(ids) > max_ids:
+        raise ValueError(f"At most {max_ids} ids can be fetched at once")
+    wanted = list(dict.fromkeys(ids))
+    entity = query.column_descriptions[0]["entity"]
+    found = {row.id: row for row in query.filter(entity.id.in_(wanted))}
+    return [found[id] for id in wanted if id in found]
 
 # Venue CRUD operations
 def create_venue(db: Session, venue: schemas.VenueCreate) -> models.Venue:
-    db_venue = models.Venue(**venue.dict())
+    db_venue = models.Venue(**venue.model_dump())
     db.add(db_venue)
     db.commit()
+    cache.changed("venues")
     db.refresh(db_venue)
     return db_venue
 
-def get_venues(db: Session, skip: int = 0, limit: int = 100) -> List[models.Venue]:
-    return db.query(models.Venue).offset(skip).limit(limit).all()
+def get_venues(db: Session, cursor: Optional[str] = None, limit: int = 100) -> Tuple[List[models.Venue], Optional[str]]:
+    return keyset_page(db.query(models.Venue), [models.Venue.id], cursor, limit)
+
+def get_venues_by_ids(db: Session, ids: List[int]) -> List[models.Venue]:
+    return _by_ids(db.query(models.Venue), ids)
 
 def get_venue(db: Session, venue_id: int) -> Optional[models.Venue]:
     return db.query(models.Venue).filter(models.Venue.id == venue_id).first()
@@ -23,60 +39,183 @@ def get_venue(db: Session, venue_id: int) -> Optional[models.Venue]:
 def update_venue(db: Session, venue_id: int, venue: schemas.VenueUpdate) -> Optional[models.Venue]:
     db_venue = get_venue(db, venue_id)
     if db_venue:
-        update_data = venue.dict(exclude_unset=True)
+        update_data = venue.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_venue, field, value)
         db.commit()
+        cache.changed("venues")
         db.refresh(db_venue)
     return db_venue
 
 def delete_venue(db: Session, venue_id: int) -> bool:
     db_venue = get_venue(db, venue_id)
     if db_venue:
+        _log_deletes(db, models.Booking.venue_id == venue_id)
         db.delete(db_venue)
         db.commit()
+        cache.changed("venues", "events", "bookings")
         return True
     return False
 
 def get_venue_events(db: Session, venue_id: int) -> List[models.Event]:
     return db.query(models.Event).filter(models.Event.venue_id == venue_id).all()
 
-def get_venue_occupancy(db: Session, venue_id: int) -> Dict[str, Any]:
-    venue = get_venue(db, venue_id)
-    if not venue:
-        return None
-    
-    # Get total events at this venue
-    total_events = db.query(models.Event).filter(models.Event.venue_id == venue_id).count()
+def get_venue_occupancy(db: Session, venue_id: int, start: Optional[date] = None, end: Optional[date] = None) -> Dict[str, Any]:
+    occupancy = get_venues_occupancy(db, [venue_id], start, end)
+    return occupancy[0] if occupancy else None
+
+def get_venues_occupancy(db: Session, venue_ids: Optional[List[int]] = None, start: Optional[date] = None,
+                         end: Optional[date] = None) -> List[Dict[str, Any]]:
+    """Occupancy of each event at the given venues (all venues if None) dated between start and end.
+
+    Read from the inventory counters with one grouped query over the events, so the
+    cost follows the number of events rather than bookings. A venue's rate is its
+    confirmed seats over the summed capacity of the events in the window. Unknown
+    venue ids are skipped. Raises ValueError if start is after end.
+    """
+    if start and end and start > end:
+        raise ValueError("start must be on or before end")
     
-    # Get total bookings for this venue
-    total_booked = db.query(func.sum(models.Booking.quantity)).filter(
-        models.Booking.venue_id == venue_id,
-        models.Booking.status == models.BookingStatus.CONFIRMED
-    ).scalar() or 0
+    venues = db.query(models.Venue.id, models.Venue.name).order_by(models.Venue.id)
+    events = db.query(
+        models.Event.venue_id,
+        models.Event.id,
+        models.Event.name,
+        models.Event.date,
+        models.Event.capacity,
+        models.EventInventory.reserved,
+        func.coalesce(func.sum(models.TicketInventory.confirmed), 0).label('confirmed')
+    ).outerjoin(models.Event.inventory).outerjoin(
+        models.TicketInventory, models.TicketInventory.event_id == models.Event.id
+    ).group_by(
+        # reserved too: Event.id is the key, but PostgreSQL will not infer the inventory row from it
+        models.Event.id, models.EventInventory.reserved
+    ).order_by(models.Event.venue_id, models.Event.date, models.Event.id)
+    if venue_ids is not None:
+        venues = venues.filter(models.Venue.id.in_(venue_ids))
+        events = events.filter(models.Event.venue_id.in_(venue_ids))
+    if start:
+        events = events.filter(models.Event.date >= start)
+    if end:
+        events = events.filter(models.Event.date < end + timedelta(days=1))
     
-    # Calculate occupancy rate
-    occupancy_rate = (total_booked / venue.capacity * 100) if venue.capacity > 0 else 0
+    rows = _with_inventory(db, events)
     
-    return {
-        "venue_id": venue.id,
-        "venue_name": venue.name,
-        "total_capacity": venue.capacity,
-        "total_booked": total_booked,
-        "occupancy_rate": round(occupancy_rate, 2),
-        "total_events": total_events
+    occupancy = {
+        venue.id: {
+            "venue_id": venue.id,
+            "venue_name": venue.name,
+            "start": start,
+            "end": end,
+            "total_capacity": 0,
+            "total_booked": 0,
+            "occupancy_rate": 0,
+            "total_events": 0,
+            "events": []
+        }
+        for venue in venues
     }
+    for row in rows:
+        venue = occupancy.get(row.venue_id)
+        if venue is None:
+            continue
+        venue["total_capacity"] += row.capacity
+        venue["total_booked"] += row.confirmed
+        venue["total_events"] += 1
+        venue["events"].append({
+            "event_id": row.id,
+            "event_name": row.name,
+            "date": row.date,
+            "capacity": row.capacity,
+            "booked": row.confirmed,
+            "held": row.reserved,
+            "occupancy_rate": round(row.confirmed / row.capacity * 100, 2) if row.capacity > 0 else 0
+        })
+    for venue in occupancy.values():
+        if venue["total_capacity"] > 0:
+            venue["occupancy_rate"] = round(venue["total_booked"] / venue["total_capacity"] * 100, 2)
+    return list(occupancy.values())
+
+def _with_inventory(db: Session, query) -> List[Any]:
+    """Run a query over events outer-joined to their inventory (selecting id and reserved),
+    first seeding the counters of any event that predates them"""
+    rows = query.all()
+    untracked = [row.id for row in rows if row.reserved is None]
+    if untracked:
+        for event_id in untracked:
+            _seed_event_inventory(db, event_id)
+        db.commit()
+        rows = query.all()
+    return rows
 
 # Event CRUD operations
 def create_event(db: Session, event: schemas.EventCreate) -> models.Event:
-    db_event = models.Event(**event.dict())
+    allotted = sum(allotment.quantity for allotment in event.allotments)
+    if allotted > event.capacity:
+        raise ValueError(f"Allotments total {allotted} seats but the event capacity is {event.capacity}")
+    
+    db_event = models.Event(**event.model_dump(exclude={"allotments"}))
+    db_event.inventory = models.EventInventory(reserved=0)
     db.add(db_event)
     db.commit()
+    cache.changed("events")
     db.refresh(db_event)
+    if event.allotments:
+        set_event_allotments(db, db_event.id, event.allotments)
+        db.refresh(db_event)
     return db_event
 
-def get_events(db: Session, skip: int = 0, limit: int = 100) -> List[models.Event]:
-    return db.query(models.Event).options(joinedload(models.Event.venue)).offset(skip).limit(limit).all()
+def get_events(db: Session, cursor: Optional[str] = None, limit: int = 100) -> Tuple[List[models.Event], Optional[str]]:
+    query = db.query(models.Event).options(joinedload(models.Event.venue))
+    return keyset_page(query, [models.Event.date, models.Event.id], cursor, limit)
+
+def get_event_calendar(db: Session, start: date, end: date, venue_id: Optional[int] = None) -> Dict[str, Any]:
+    """Events dated between start and end (inclusive), bucketed by day, with their seats.
+
+    One query over the (date, venue_id) index joined to venues and the inventory
+    counters. Days without events are left out. Raises ValueError for a backwards range
+    or one longer than a year.
+    """
+    if start > end:
+        raise ValueError("start must be on or before end")
+    if (end - start).days > 366:
+        raise ValueError("The calendar covers at most 366 days per request")
+    
+    query = db.query(
+        models.Event.id,
+        models.Event.name,
+        models.Event.date,
+        models.Event.venue_id,
+        models.Venue.name.label('venue_name'),
+        models.Event.capacity,
+        models.EventInventory.reserved
+    ).join(models.Event.venue).outerjoin(models.Event.inventory).filter(
+        models.Event.date >= start,
+        models.Event.date < end + timedelta(days=1)
+    ).order_by(models.Event.date, models.Event.id)
+    if venue_id is not None:
+        query = query.filter(models.Event.venue_id == venue_id)
+    
+    days: Dict[date, Dict[str, Any]] = {}
+    for row in _with_inventory(db, query):
+        day = days.setdefault(row.date.date(), {"day": row.date.date(), "booked": 0, "available": 0, "events": []})
+        available = max(row.capacity - row.reserved, 0)
+        day["booked"] += row.reserved
+        day["available"] += available
+        day["events"].append({
+            "id": row.id,
+            "name": row.name,
+            "date": row.date,
+            "venue_id": row.venue_id,
+            "venue_name": row.venue_name,
+            "capacity": row.capacity,
+            "booked": row.reserved,
+            "available": available
+        })
+    return {"start": start, "end": end, "venue_id": venue_id, "days": list(days.values())}
+
+def get_events_by_ids(db: Session, ids: List[int]) -> List[models.Event]:
+    return _by_ids(db.query(models.Event).options(joinedload(models.Event.venue)), ids)
 
 def get_event(db: Session, event_id: int) -> Optional[models.Event]:
     return db.query(models.Event).options(joinedload(models.Event.venue)).filter(models.Event.id == event_id).first()
@@ -84,18 +223,21 @@ def get_event(db: Session, event_id: int) -> Optional[models.Event]:
 def update_event(db: Session, event_id: int, event: schemas.EventUpdate) -> Optional[models.Event]:
     db_event = get_event(db, event_id)
     if db_event:
-        update_data = event.dict(exclude_unset=True)
+        update_data = event.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_event, field, value)
         db.commit()
+        cache.changed("events")
         db.refresh(db_event)
     return db_event
 
 def delete_event(db: Session, event_id: int) -> bool:
     db_event = get_event(db, event_id)
     if db_event:
+        _log_deletes(db, models.Booking.event_id == event_id)
         db.delete(db_event)
         db.commit()
+        cache.changed("events", "bookings")
         return True
     return False
 
@@ -111,55 +253,59 @@ def get_event_revenue(db: Session, event_id: int) -> Dict[str, Any]:
     if not event:
         return None
     
-    # Get total revenue and bookings for this event
+    # Summed from the event's daily rollups rather than its bookings
     result = db.query(
-        func.sum(models.Booking.total_amount).label('total_revenue'),
-        func.count(models.Booking.id).label('total_bookings'),
-        func.avg(models.Booking.total_amount / models.Booking.quantity).label('avg_ticket_price')
-    ).filter(
-        models.Booking.event_id == event_id,
-        models.Booking.status == models.BookingStatus.CONFIRMED
-    ).first()
+        func.sum(models.RevenueRollup.revenue).label('total_revenue'),
+        func.sum(models.RevenueRollup.bookings).label('total_bookings'),
+        func.sum(models.RevenueRollup.unit_price_total).label('unit_price_total')
+    ).filter(models.RevenueRollup.event_id == event_id).first()
     
+    total_bookings = result.total_bookings or 0
     return {
         "event_id": event.id,
         "event_name": event.name,
-        "total_revenue": result.total_revenue or 0,
-        "total_bookings": result.total_bookings or 0,
-        "average_ticket_price": round(result.avg_ticket_price or 0, 2)
+        "total_revenue": round(result.total_revenue or 0, 2),
+        "total_bookings": total_bookings,
+        "average_ticket_price": round(result.unit_price_total / total_bookings, 2) if total_bookings else 0
     }
 
 def get_available_tickets(db: Session, event_id: int) -> Dict[str, Any]:
-    event = get_event(db, event_id)
+    event = db.query(
+        models.Event.id,
+        models.Event.name,
+        models.Event.capacity,
+        models.EventInventory.reserved
+    ).outerjoin(models.Event.inventory).filter(models.Event.id == event_id).first()
     if not event:
         return None
     
-    # Get total booked tickets for this event
-    total_booked = db.query(func.sum(models.Booking.quantity)).filter(
-        models.Booking.event_id == event_id,
-        models.Booking.status == models.BookingStatus.CONFIRMED
-    ).scalar() or 0
+    # Seats held by pending and confirmed bookings, read from the inventory counter
+    total_booked = event.reserved if event.reserved is not None else get_reserved_tickets(db, event_id)
     
     available_tickets = event.capacity - total_booked
     
-    # Get ticket types with their availability
-    ticket_types = db.query(models.TicketType).all()
-    ticket_types_available = []
+    # Per ticket type counters for this event, one lookup on the inventory primary key
+    ticket_types = db.query(
+        models.TicketType.id,
+        models.TicketType.name,
+        models.TicketType.price,
+        func.coalesce(models.TicketInventory.booked, 0).label('booked'),
+        func.coalesce(models.TicketInventory.confirmed, 0).label('confirmed'),
+        models.TicketInventory.remaining
+    ).outerjoin(models.TicketInventory, and_(
+        models.TicketInventory.ticket_type_id == models.TicketType.id,
+        models.TicketInventory.event_id == event_id
+    )).all()
     
-    for ticket_type in ticket_types:
-        booked_for_type = db.query(func.sum(models.Booking.quantity)).filter(
-            models.Booking.event_id == event_id,
-            models.Booking.ticket_type_id == ticket_type.id,
-            models.Booking.status == models.BookingStatus.CONFIRMED
-        ).scalar() or 0
-        
-        ticket_types_available.append({
-            "ticket_type_id": ticket_type.id,
-            "ticket_type_name": ticket_type.name,
-            "price": ticket_type.price,
-            "booked": booked_for_type,
-            "available": available_tickets  # Simplified - in real app, you'd track per ticket type
-        })
+    ticket_types_available = [{
+        "ticket_type_id": ticket_type.id,
+        "ticket_type_name": ticket_type.name,
+        "price": ticket_type.price,
+        "booked": ticket_type.booked,
+        "confirmed": ticket_type.confirmed,
+        "allotment": None if ticket_type.remaining is None else ticket_type.remaining + ticket_type.booked,
+        "available": available_tickets if ticket_type.remaining is None else min(ticket_type.remaining, available_tickets)
+    } for ticket_type in ticket_types]
     
     return {
         "event_id": event.id,
@@ -170,16 +316,398 @@ def get_available_tickets(db: Session, event_id: int) -> Dict[str, Any]:
         "ticket_types_available": ticket_types_available
     }
 
+# Inventory operations
+def _held(quantity: int, status: Optional[models.BookingStatus]) -> int:
+    return quantity if status not in (None, models.BookingStatus.CANCELLED) else 0
+
+def _confirmed(quantity: int, status: Optional[models.BookingStatus]) -> int:
+    return quantity if status == models.BookingStatus.CONFIRMED else 0
+
+def _ticket_totals():
+    """Inventory counters recomputed from the bookings table, grouped by (event_id, ticket_type_id)"""
+    return select(
+        models.Booking.event_id,
+        models.Booking.ticket_type_id,
+        func.sum(case((models.Booking.status != models.BookingStatus.CANCELLED, models.Booking.quantity), else_=0)),
+        func.sum(case((models.Booking.status == models.BookingStatus.CONFIRMED, models.Booking.quantity), else_=0))
+    ).group_by(models.Booking.event_id, models.Booking.ticket_type_id)
+
+def _sync_remaining(db: Session, event_id: Optional[int] = None) -> None:
+    """Recompute each tier's remaining seats as its allotment minus what is booked"""
+    allotments = db.query(models.TicketAllotment.event_id, models.TicketAllotment.ticket_type_id).filter(
+        ~exists().where(
+            models.TicketInventory.event_id == models.TicketAllotment.event_id,
+            models.TicketInventory.ticket_type_id == models.TicketAllotment.ticket_type_id
+        )
+    )
+    if event_id is not None:
+        allotments = allotments.filter(models.TicketAllotment.event_id == event_id)
+    db.execute(insert(models.TicketInventory).from_select(["event_id", "ticket_type_id"], allotments))
+    
+    allotment = select(models.TicketAllotment.quantity).where(
+        models.TicketAllotment.event_id == models.TicketInventory.event_id,
+        models.TicketAllotment.ticket_type_id == models.TicketInventory.ticket_type_id
+    ).scalar_subquery()
+    stmt = update(models.TicketInventory).values(
+        remaining=allotment - models.TicketInventory.booked
+    ).execution_options(synchronize_session=False)
+    if event_id is not None:
+        stmt = stmt.where(models.TicketInventory.event_id == event_id)
+    db.execute(stmt)
+
+def _seed_event_inventory(db: Session, event_id: int) -> None:
+    """Create the inventory rows for an event that predates the counters, from its bookings"""
+    if db.query(exists().where(models.EventInventory.event_id == event_id)).scalar():
+        return
+    
+    untracked = ~exists().where(models.EventInventory.event_id == event_id)
+    db.execute(delete(models.TicketInventory).where(models.TicketInventory.event_id == event_id, untracked))
+    db.execute(insert(models.TicketInventory).from_select(
+        ["event_id", "ticket_type_id", "booked", "confirmed"],
+        _ticket_totals().where(models.Booking.event_id == event_id, untracked)
+    ))
+    
+    held = select(func.coalesce(func.sum(models.Booking.quantity), 0)).where(
+        models.Booking.event_id == event_id,
+        models.Booking.status != models.BookingStatus.CANCELLED
+    ).scalar_subquery()
+    db.execute(insert(models.EventInventory).from_select(
+        ["event_id", "reserved"],
+        select(literal(event_id), held).where(untracked)
+    ))
+    _sync_remaining(db, event_id)
+
+def get_reserved_tickets(db: Session, event_id: int) -> int:
+    reserved = db.query(models.EventInventory.reserved).filter(
+        models.EventInventory.event_id == event_id
+    ).scalar()
+    if reserved is None:
+        _seed_event_inventory(db, event_id)
+        db.commit()
+        reserved = db.query(models.EventInventory.reserved).filter(
+            models.EventInventory.event_id == event_id
+        ).scalar() or 0
+    return reserved
+
+def reserve_tickets(db: Session, event_id: int, quantity: int) -> bool:
+    """Hold seats for an event if capacity allows.
+
+    The capacity check and the increment are a single conditional UPDATE, so
+    concurrent bookings can never both pass the check. The caller commits.
+    """
+    capacity = select(models.Event.capacity).where(models.Event.id == event_id).scalar_subquery()
+    stmt = update(models.EventInventory).where(
+        models.EventInventory.event_id == event_id,
+        models.EventInventory.reserved + quantity <= capacity
+    ).values(
+        reserved=models.EventInventory.reserved + quantity
+    ).execution_options(synchronize_session=False)
+    
+    if db.execute(stmt).rowcount:
+        return True
+    
+    # No row matched: either sold out or the event has no inventory row yet
+    if db.query(exists().where(models.EventInventory.event_id == event_id)).scalar():
+        return False
+    _seed_event_inventory(db, event_id)
+    return db.execute(stmt).rowcount > 0
+
+def release_tickets(db: Session, event_id: int, quantity: int) -> None:
+    """Give seats back to an event's inventory. The caller commits."""
+    _seed_event_inventory(db, event_id)
+    db.execute(
+        update(models.EventInventory).where(
+            models.EventInventory.event_id == event_id
+        ).values(
+            reserved=case(
+                (models.EventInventory.reserved > quantity, models.EventInventory.reserved - quantity),
+                else_=0
+            )
+        ).execution_options(synchronize_session=False)
+    )
+
+def _adjust_ticket_inventory(db: Session, event_id: int, ticket_type_id: int, booked: int, confirmed: int) -> bool:
+    """Move the tier counters, refusing to take a tier with an allotment below zero"""
+    stmt = update(models.TicketInventory).where(
+        models.TicketInventory.event_id == event_id,
+        models.TicketInventory.ticket_type_id == ticket_type_id
+    ).values(
+        booked=models.TicketInventory.booked + booked,
+        confirmed=models.TicketInventory.confirmed + confirmed,
+        remaining=models.TicketInventory.remaining - booked
+    ).execution_options(synchronize_session=False)
+    if booked > 0:
+        stmt = stmt.where(or_(
+            models.TicketInventory.remaining.is_(None),
+            models.TicketInventory.remaining >= booked
+        ))
+    
+    if db.execute(stmt).rowcount:
+        return True
+    
+    # No row matched: either the tier is sold out or it has no inventory row yet
+    tracked = exists().where(
+        models.TicketInventory.event_id == event_id,
+        models.TicketInventory.ticket_type_id == ticket_type_id
+    )
+    if db.query(tracked).scalar():
+        return False
+    _seed_event_inventory(db, event_id)
+    if db.query(tracked).scalar():
+        return db.execute(stmt).rowcount > 0
+    db.execute(insert(models.TicketInventory).values(
+        event_id=event_id, ticket_type_id=ticket_type_id, booked=booked, confirmed=confirmed
+    ))
+    return True
+
+def _move_seats(db: Session, event_id: int, ticket_type_id: int, old: tuple, new: tuple) -> None:
+    """Apply a booking's (quantity, status) change to the inventory counters.
+
+    Raises ValueError, after rolling back, when the event or the ticket type's
+    allotment does not have enough seats left. The caller commits, so the
+    counters change in the same transaction as the booking row.
+    """
+    held = _held(*new) - _held(*old)
+    confirmed = _confirmed(*new) - _confirmed(*old)
+    
+    if held > 0 and not reserve_tickets(db, event_id, held):
+        raise _sold_out_error(db, event_id)
+    if held < 0:
+        release_tickets(db, event_id, -held)
+    if (held or confirmed) and not _adjust_ticket_inventory(db, event_id, ticket_type_id, held, confirmed):
+        raise _tier_sold_out_error(db, event_id, ticket_type_id)
+
+def _sold_out_error(db: Session, event_id: int) -> ValueError:
+    db.rollback()
+    event = db.query(models.Event.capacity).filter(models.Event.id == event_id).first()
+    available = max(event.capacity - get_reserved_tickets(db, event_id), 0) if event else 0
+    return ValueError(f"Not enough tickets available. Only {available} tickets left.")
+
+def _tier_sold_out_error(db: Session, event_id: int, ticket_type_id: int) -> ValueError:
+    db.rollback()
+    tier = db.query(models.TicketType.name, models.TicketInventory.remaining).join(
+        models.TicketInventory, models.TicketInventory.ticket_type_id == models.TicketType.id
+    ).filter(
+        models.TicketInventory.event_id == event_id,
+        models.TicketInventory.ticket_type_id == ticket_type_id
+    ).first()
+    return ValueError(f"Not enough {tier.name} tickets available. Only {max(tier.remaining, 0)} tickets left.")
+
+# Allotment operations
+def get_event_allotments(db: Session, event_id: int) -> List[models.TicketAllotment]:
+    return db.query(models.TicketAllotment).filter(models.TicketAllotment.event_id == event_id).all()
+
+def set_event_allotments(db: Session, event_id: int, allotments: List[schemas.TicketAllotmentCreate]) -> List[models.TicketAllotment]:
+    """Replace an event's per ticket type allotments and resize the tier counters to match"""
+    event = db.query(models.Event.capacity).filter(models.Event.id == event_id).first()
+    quantities = {allotment.ticket_type_id: allotment.quantity for allotment in allotments}
+    if sum(quantities.values()) > event.capacity:
+        raise ValueError(f"Allotments total {sum(quantities.values())} seats but the event capacity is {event.capacity}")
+    
+    get_reserved_tickets(db, event_id)
+    booked = dict(db.query(models.TicketInventory.ticket_type_id, models.TicketInventory.booked).filter(
+        models.TicketInventory.event_id == event_id
+    ).all())
+    for ticket_type_id, quantity in quantities.items():
+        if quantity < booked.get(ticket_type_id, 0):
+            raise ValueError(f"Allotment for ticket type {ticket_type_id} cannot be below the {booked[ticket_type_id]} seats already booked")
+    
+    db.query(models.TicketAllotment).filter(models.TicketAllotment.event_id == event_id).delete(synchronize_session=False)
+    db.add_all([
+        models.TicketAllotment(event_id=event_id, ticket_type_id=ticket_type_id, quantity=quantity)
+        for ticket_type_id, quantity in quantities.items()
+    ])
+    db.flush()
+    _sync_remaining(db, event_id)
+    db.commit()
+    cache.changed("ticket_allotments")
+    return get_event_allotments(db, event_id)
+
+def rebuild_inventory(db: Session) -> None:
+    """Recompute every inventory counter from the bookings table in one transaction"""
+    db.query(models.TicketInventory).delete(synchronize_session=False)
+    db.query(models.EventInventory).delete(synchronize_session=False)
+    db.execute(insert(models.TicketInventory).from_select(
+        ["event_id", "ticket_type_id", "booked", "confirmed"], _ticket_totals()
+    ))
+    db.execute(insert(models.EventInventory).from_select(
+        ["event_id", "reserved"],
+        select(
+            models.Event.id,
+            func.coalesce(func.sum(models.TicketInventory.booked), 0)
+        ).outerjoin(models.TicketInventory, models.TicketInventory.event_id == models.Event.id).group_by(models.Event.id)
+    ))
+    _sync_remaining(db)
+    db.commit()
+
+def verify_inventory(db: Session) -> List[Dict[str, Any]]:
+    """Compare the inventory counters with the bookings table and return every row that drifted.
+
+    Events without an event_inventory row are skipped: their counters do not exist yet
+    and are seeded from their bookings (_seed_event_inventory) the first time they are used.
+    """
+    tracked = set(db.scalars(select(models.EventInventory.event_id)))
+    allotments = {
+        (row.event_id, row.ticket_type_id): row.quantity
+        for row in db.query(models.TicketAllotment)
+        if row.event_id in tracked
+    }
+    expected = {
+        (event_id, ticket_type_id): (booked, confirmed)
+        for event_id, ticket_type_id, booked, confirmed in db.execute(_ticket_totals())
+        if event_id in tracked
+    }
+    stored = {
+        (row.event_id, row.ticket_type_id): (row.booked, row.confirmed, row.remaining)
+        for row in db.query(models.TicketInventory)
+        if row.event_id in tracked
+    }
+    
+    mismatches = []
+    for key in sorted(expected.keys() | stored.keys() | allotments.keys()):
+        booked, confirmed = expected.get(key, (0, 0))
+        remaining = allotments[key] - booked if key in allotments else None
+        want = (booked, confirmed, remaining)
+        have = stored.get(key, (0, 0, None))
+        if want != have:
+            mismatches.append({
+                "event_id": key[0],
+                "ticket_type_id": key[1],
+                "expected": {"booked": want[0], "confirmed": want[1], "remaining": want[2]},
+                "stored": {"booked": have[0], "confirmed": have[1], "remaining": have[2]}
+            })
+    
+    held = {}
+    for (event_id, _), (booked, _) in expected.items():
+        held[event_id] = held.get(event_id, 0) + booked
+    for event_id, reserved in db.query(models.EventInventory.event_id, models.EventInventory.reserved):
+        if reserved != held.get(event_id, 0):
+            mismatches.append({
+                "event_id": event_id,
+                "ticket_type_id": None,
+                "expected": {"booked": held.get(event_id, 0)},
+                "stored": {"booked": reserved}
+            })
+    return mismatches
+
+# Revenue rollups
+def _revenue(quantity: int, total_amount: float, status: Optional[models.BookingStatus]) -> Tuple[int, int, float, float]:
+    """What a booking adds to its rollup row: (bookings, tickets, revenue, unit price)"""
+    if status != models.BookingStatus.CONFIRMED:
+        return 0, 0, 0.0, 0.0
+    return 1, quantity, total_amount, total_amount / quantity
+
+def _roll_revenue(db: Session, booking: models.Booking, old: tuple, new: tuple) -> None:
+    """Apply a booking's (quantity, total_amount, status) change to its day's rollup. The caller commits."""
+    bookings, tickets, revenue, unit_price = (n - o for n, o in zip(_revenue(*new), _revenue(*old)))
+    if not (bookings or tickets or revenue):
+        return
+    
+    key = {
+        "day": (booking.created_at or datetime.utcnow()).date(),
+        "event_id": booking.event_id,
+        "venue_id": booking.venue_id,
+        "ticket_type_id": booking.ticket_type_id
+    }
+    stmt = update(models.RevenueRollup).where(
+        *(getattr(models.RevenueRollup, field) == value for field, value in key.items())
+    ).values(
+        bookings=models.RevenueRollup.bookings + bookings,
+        tickets=models.RevenueRollup.tickets + tickets,
+        revenue=models.RevenueRollup.revenue + revenue,
+        unit_price_total=models.RevenueRollup.unit_price_total + unit_price
+    ).execution_options(synchronize_session=False)
+    if not db.execute(stmt).rowcount:
+        db.execute(insert(models.RevenueRollup).values(
+            **key, bookings=bookings, tickets=tickets, revenue=revenue, unit_price_total=unit_price
+        ))
+
+def get_revenue_series(db: Session, start: Optional[date] = None, end: Optional[date] = None, event_id: Optional[int] = None,
+                       venue_id: Optional[int] = None, ticket_type_id: Optional[int] = None) -> Dict[str, Any]:
+    """Daily confirmed revenue between start and end (inclusive), read from the rollups.
+
+    end defaults to today (UTC, like booking timestamps) and start to 29 days before end.
+    Days without confirmed bookings are left out. Raises ValueError if start is after end.
+    """
+    end = end or datetime.utcnow().date()
+    start = start or end - timedelta(days=29)
+    if start > end:
+        raise ValueError("start must be on or before end")
+    
+    query = db.query(
+        models.RevenueRollup.day,
+        func.sum(models.RevenueRollup.revenue).label('revenue'),
+        func.sum(models.RevenueRollup.bookings).label('bookings'),
+        func.sum(models.RevenueRollup.tickets).label('tickets')
+    ).filter(
+        models.RevenueRollup.day >= start,
+        models.RevenueRollup.day <= end
+    )
+    for field, value in (("event_id", event_id), ("venue_id", venue_id), ("ticket_type_id", ticket_type_id)):
+        if value is not None:
+            query = query.filter(getattr(models.RevenueRollup, field) == value)
+    query = query.group_by(models.RevenueRollup.day).having(
+        func.sum(models.RevenueRollup.bookings) > 0
+    ).order_by(models.RevenueRollup.day)
+    
+    points = [
+        {"day": row.day, "revenue": round(row.revenue, 2), "bookings": row.bookings, "tickets": row.tickets}
+        for row in query
+    ]
+    return {
+        "start": start,
+        "end": end,
+        "total_revenue": round(sum(point["revenue"] for point in points), 2),
+        "total_bookings": sum(point["bookings"] for point in points),
+        "points": points
+    }
+
+def rebuild_revenue_rollups(db: Session) -> int:
+    """Recompute the rollups from the confirmed bookings and return the number of rows written"""
+    db.query(models.RevenueRollup).delete(synchronize_session=False)
+    db.execute(text(models.REVENUE_ROLLUP_BACKFILL))
+    db.commit()
+    return db.query(models.RevenueRollup).count()
+
+def verify_revenue_rollups(db: Session) -> List[Dict[str, Any]]:
+    """Compare the rollups with the confirmed bookings and return every row that drifted"""
+    def totals(rows):
+        return {
+            (str(row[0]), row[1], row[2], row[3]): (row[4], row[5], round(row[6], 2))
+            for row in rows if row[4]
+        }
+    
+    expected = totals(db.execute(text(models.REVENUE_ROLLUP_TOTALS)))
+    stored = totals(db.query(
+        models.RevenueRollup.day, models.RevenueRollup.event_id, models.RevenueRollup.venue_id,
+        models.RevenueRollup.ticket_type_id, models.RevenueRollup.bookings, models.RevenueRollup.tickets,
+        models.RevenueRollup.revenue
+    ))
+    
+    return [
+        {
+            "day": key[0], "event_id": key[1], "venue_id": key[2], "ticket_type_id": key[3],
+            "expected": dict(zip(("bookings", "tickets", "revenue"), expected.get(key, (0, 0, 0)))),
+            "stored": dict(zip(("bookings", "tickets", "revenue"), stored.get(key, (0, 0, 0))))
+        }
+        for key in sorted(expected.keys() | stored.keys())
+        if expected.get(key) != stored.get(key)
+    ]
+
 # Ticket Type CRUD operations
 def create_ticket_type(db: Session, ticket_type: schemas.TicketTypeCreate) -> models.TicketType:
-    db_ticket_type = models.TicketType(**ticket_type.dict())
+    db_ticket_type = models.TicketType(**ticket_type.model_dump())
     db.add(db_ticket_type)
     db.commit()
+    cache.changed("ticket_types")
     db.refresh(db_ticket_type)
     return db_ticket_type
 
-def get_ticket_types(db: Session, skip: int = 0, limit: int = 100) -> List[models.TicketType]:
-    return db.query(models.TicketType).offset(skip).limit(limit).all()
+def get_ticket_types(db: Session, cursor: Optional[str] = None, limit: int = 100) -> Tuple[List[models.TicketType], Optional[str]]:
+    return keyset_page(db.query(models.TicketType), [models.TicketType.id], cursor, limit)
+
+def get_ticket_types_by_ids(db: Session, ids: List[int]) -> List[models.TicketType]:
+    return _by_ids(db.query(models.TicketType), ids)
 
 def get_ticket_type(db: Session, ticket_type_id: int) -> Optional[models.TicketType]:
     return db.query(models.TicketType).filter(models.TicketType.id == ticket_type_id).first()
@@ -187,18 +715,29 @@ def get_ticket_type(db: Session, ticket_type_id: int) -> Optional[models.TicketT
 def update_ticket_type(db: Session, ticket_type_id: int, ticket_type: schemas.TicketTypeUpdate) -> Optional[models.TicketType]:
     db_ticket_type = get_ticket_type(db, ticket_type_id)
     if db_ticket_type:
-        update_data = ticket_type.dict(exclude_unset=True)
+        update_data = ticket_type.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_ticket_type, field, value)
         db.commit()
+        cache.changed("ticket_types")
         db.refresh(db_ticket_type)
     return db_ticket_type
 
 def delete_ticket_type(db: Session, ticket_type_id: int) -> bool:
     db_ticket_type = get_ticket_type(db, ticket_type_id)
     if db_ticket_type:
+        # Its bookings are deleted with it, so give their seats back to each event
+        held_by_event = db.query(models.Booking.event_id, func.sum(models.Booking.quantity)).filter(
+            models.Booking.ticket_type_id == ticket_type_id,
+            models.Booking.status != models.BookingStatus.CANCELLED
+        ).group_by(models.Booking.event_id).all()
+        for event_id, held in held_by_event:
+            release_tickets(db, event_id, held)
+        
+        _log_deletes(db, models.Booking.ticket_type_id == ticket_type_id)
         db.delete(db_ticket_type)
         db.commit()
+        cache.changed("ticket_types", "bookings")
         return True
     return False
 
@@ -210,35 +749,299 @@ def get_ticket_type_bookings(db: Session, ticket_type_id: int) -> List[models.Bo
     ).filter(models.Booking.ticket_type_id == ticket_type_id).all()
 
 # Booking CRUD operations
-def create_booking(db: Session, booking: schemas.BookingCreate) -> models.Booking:
-    # Get ticket type to calculate total amount
-    ticket_type = get_ticket_type(db, booking.ticket_type_id)
+def create_booking(db: Session, booking: schemas.BookingCreate, idempotency_key: Optional[str] = None) -> models.Booking:
+    """Validate, hold seats for and insert a booking.
+
+    The event, venue and ticket type are fetched in one query, the seats are held
+    with the conditional inventory updates, the row is inserted with RETURNING and
+    the change is logged, so a booking costs five statements. Raises LookupError for a missing event,
+    venue or ticket type and ValueError when the booking cannot be made.
+
+    With an idempotency_key (reserved by reserve_idempotency_key) the response is
+    stored against the key in the booking's transaction, so a retry finds either the
+    booking or a key that can be tried again, never a booking it cannot see.
+    """
+    found = db.query(models.Event, models.Venue, models.TicketType).select_from(models.Event).outerjoin(
+        models.Venue, models.Venue.id == booking.venue_id
+    ).outerjoin(
+        models.TicketType, models.TicketType.id == booking.ticket_type_id
+    ).filter(models.Event.id == booking.event_id).first()
+    if not found:
+        raise LookupError("Event not found")
+    event, venue, ticket_type = found
+    if not venue:
+        raise LookupError("Venue not found")
     if not ticket_type:
-        raise ValueError("Invalid ticket type")
+        raise LookupError("Ticket type not found")
+    if event.venue_id != booking.venue_id:
+        raise ValueError("Venue does not match event venue")
     
-    # Calculate total amount
-    total_amount = ticket_type.price * booking.quantity
-    
-    # Generate unique booking code
-    booking_code = f"BK-{uuid.uuid4().hex[:8].upper()}"
+    # Hold the seats first; the booking row is only written if the hold succeeded
+    _move_seats(db, booking.event_id, booking.ticket_type_id, (0, None), (booking.quantity, models.BookingStatus.PENDING))
     
     # Create booking
     db_booking = models.Booking(
-        **booking.dict(),
-        total_amount=total_amount,
-        booking_code=booking_code
+        **booking.model_dump(),
+        total_amount=ticket_type.price * booking.quantity,
+        booking_code=_booking_code(),
+        event=event,
+        venue=venue,
+        ticket_type=ticket_type
     )
     db.add(db_booking)
+    db.flush()
+    _log_changes(db, "created", [db_booking])
+    
+    # Detach the fully loaded objects so the commit does not expire them; the caller
+    # gets the booking as inserted instead of paying for a refresh SELECT per object.
+    # event.venue is the venue loaded above (identity map), so this issues no query.
+    event.venue
+    for instance in (db_booking, event, venue, ticket_type):
+        db.expunge(instance)
+    if idempotency_key is not None:
+        db.execute(update(models.IdempotencyKey).where(models.IdempotencyKey.key == idempotency_key).values(
+            response=schemas.BookingResponse.model_validate(db_booking).model_dump_json()
+        ).execution_options(synchronize_session=False))
     db.commit()
-    db.refresh(db_booking)
+    cache.changed("bookings")
     return db_booking
 
-def get_bookings(db: Session, skip: int = 0, limit: int = 100) -> List[models.Booking]:
-    return db.query(models.Booking).options(
+def _booking_code() -> str:
+    return f"BK-{uuid.uuid4().hex[:8].upper()}"
+
+def _unique_booking_codes(db: Session, count: int) -> List[str]:
+    """Booking codes for a batch, redrawn until none clash with each other or the table"""
+    codes = set()
+    while len(codes) < count:
+        fresh = {_booking_code() for _ in range(count - len(codes))} - codes
+        taken = set(db.scalars(select(models.Booking.booking_code).where(models.Booking.booking_code.in_(fresh))))
+        codes |= fresh - taken
+    return list(codes)
+
+def create_bookings_bulk(db: Session, bookings: List[schemas.BookingCreate], batch_size: int = 1000) -> List[Dict[str, Any]]:
+    """Create many bookings at once, returning one result dict per input row in order.
+
+    References are checked with one query per table instead of per row, capacity is
+    allocated per event and per ticket type allotment in input order, and accepted
+    rows are written with one executemany INSERT and one commit per batch. Rows that
+    fail get {"status": "failed", "error": ...} and do not affect the others.
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(bookings)
+    
+    events = dict(db.query(models.Event.id, models.Event.venue_id).filter(
+        models.Event.id.in_({booking.event_id for booking in bookings})
+    ).all())
+    venue_ids = set(db.scalars(select(models.Venue.id).where(
+        models.Venue.id.in_({booking.venue_id for booking in bookings})
+    )))
+    ticket_types = {row.id: row for row in db.query(models.TicketType.id, models.TicketType.name, models.TicketType.price).filter(
+        models.TicketType.id.in_({booking.ticket_type_id for booking in bookings})
+    )}
+    
+    for index, booking in enumerate(bookings):
+        if booking.event_id not in events:
+            results[index] = _bulk_failure("Event not found")
+        elif booking.venue_id not in venue_ids:
+            results[index] = _bulk_failure("Venue not found")
+        elif booking.ticket_type_id not in ticket_types:
+            results[index] = _bulk_failure("Ticket type not found")
+        elif events[booking.event_id] != booking.venue_id:
+            results[index] = _bulk_failure("Venue does not match event venue")
+    
+    valid = [index for index, result in enumerate(results) if result is None]
+    for start in range(0, len(valid), batch_size):
+        _create_booking_batch(db, bookings, valid[start:start + batch_size], ticket_types, results)
+    return results
+
+def _bulk_failure(error: str) -> Dict[str, Any]:
+    return {"status": "failed", "error": error}
+
+def _create_booking_batch(db: Session, bookings: List[schemas.BookingCreate], indexes: List[int],
+                          ticket_types: Dict[int, Any], results: List[Optional[Dict[str, Any]]]) -> None:
+    event_ids = {bookings[index].event_id for index in indexes}
+    for event_id in event_ids:
+        _seed_event_inventory(db, event_id)
+    
+    # Seats left per event and per allotted tier, drawn down in input order
+    seats_left = dict(db.query(models.Event.id, models.Event.capacity - models.EventInventory.reserved).join(
+        models.EventInventory, models.EventInventory.event_id == models.Event.id
+    ).filter(models.Event.id.in_(event_ids)).all())
+    tier_left = {
+        (row.event_id, row.ticket_type_id): row.remaining
+        for row in db.query(models.TicketInventory).filter(
+            models.TicketInventory.event_id.in_(event_ids),
+            models.TicketInventory.remaining.isnot(None)
+        )
+    }
+    
+    accepted: Dict[Tuple[int, int], List[int]] = {}
+    for index in indexes:
+        booking = bookings[index]
+        tier = (booking.event_id, booking.ticket_type_id)
+        if booking.quantity > seats_left[booking.event_id]:
+            results[index] = _bulk_failure(f"Not enough tickets available. Only {max(seats_left[booking.event_id], 0)} tickets left.")
+        elif booking.quantity > tier_left.get(tier, booking.quantity):
+            results[index] = _bulk_failure(f"Not enough {ticket_types[booking.ticket_type_id].name} tickets available. Only {max(tier_left[tier], 0)} tickets left.")
+        else:
+            seats_left[booking.event_id] -= booking.quantity
+            if tier in tier_left:
+                tier_left[tier] -= booking.quantity
+            accepted.setdefault(tier, []).append(index)
+    
+    # Hold the seats with the same conditional updates as create_booking, so a
+    # single booking that slipped in since the counts were read cannot be oversold
+    for (event_id, ticket_type_id), tier_indexes in list(accepted.items()):
+        quantity = sum(bookings[index].quantity for index in tier_indexes)
+        if not reserve_tickets(db, event_id, quantity):
+            error = "Not enough tickets available."
+        elif not _adjust_ticket_inventory(db, event_id, ticket_type_id, quantity, 0):
+            release_tickets(db, event_id, quantity)
+            error = f"Not enough {ticket_types[ticket_type_id].name} tickets available."
+        else:
+            continue
+        for index in accepted.pop((event_id, ticket_type_id)):
+            results[index] = _bulk_failure(error)
+    
+    indexes = [index for tier_indexes in accepted.values() for index in tier_indexes]
+    if not indexes:
+        db.rollback()
+        return
+    rows = [
+        {
+            **bookings[index].model_dump(),
+            "total_amount": ticket_types[bookings[index].ticket_type_id].price * bookings[index].quantity,
+            "booking_code": code,
+            "status": models.BookingStatus.PENDING
+        }
+        for index, code in zip(indexes, _unique_booking_codes(db, len(indexes)))
+    ]
+    inserted = db.execute(
+        insert(models.Booking).returning(*BOOKING_CHANGE_COLUMNS, sort_by_parameter_order=True), rows
+    ).all()
+    _log_changes(db, "created", inserted)
+    db.commit()
+    cache.changed("bookings")
+    
+    for index, row, booking in zip(indexes, rows, inserted):
+        results[index] = {"status": "created", "id": booking.id, "booking_code": row["booking_code"]}
+
+def get_bookings(db: Session, cursor: Optional[str] = None, limit: int = 100) -> Tuple[List[models.Booking], Optional[str]]:
+    query = db.query(models.Booking).options(
+        joinedload(models.Booking.event),
+        joinedload(models.Booking.venue),
+        joinedload(models.Booking.ticket_type)
+    )
+    return keyset_page(query, [models.Booking.id], cursor, limit)
+
+# Fast list path: bookings as plain dicts shaped like schemas.BookingResponse, built from
+# one joined row each instead of ORM objects validated through from_attributes
+def _response_fields(schema, nested=()) -> List[str]:
+    return [name for name in schema.model_fields if name not in nested]
+
+_event_venue = aliased(models.Venue)
+_BOOKING_ROW_PARTS = [
+    (None, models.Booking, _response_fields(schemas.BookingResponse, ("event", "venue", "ticket_type"))),
+    ("event", models.Event, _response_fields(schemas.EventResponse, ("venue",))),
+    ("event_venue", _event_venue, _response_fields(schemas.VenueResponse)),
+    ("venue", models.Venue, _response_fields(schemas.VenueResponse)),
+    ("ticket_type", models.TicketType, _response_fields(schemas.TicketTypeResponse)),
+]
+BOOKING_ROW_COLUMNS = [
+    getattr(entity, field).label(f"{prefix}__{field}" if prefix else field)
+    for prefix, entity, fields in _BOOKING_ROW_PARTS
+    for field in fields
+]
+
+def _booking_rows(db: Session):
+    return db.query(*BOOKING_ROW_COLUMNS).select_from(models.Booking).outerjoin(
+        models.Event, models.Event.id == models.Booking.event_id
+    ).outerjoin(
+        _event_venue, _event_venue.id == models.Event.venue_id
+    ).outerjoin(
+        models.Venue, models.Venue.id == models.Booking.venue_id
+    ).outerjoin(
+        models.TicketType, models.TicketType.id == models.Booking.ticket_type_id
+    )
+
+def booking_dicts(rows: Iterable[Any]) -> List[Dict[str, Any]]:
+    """Build BookingResponse-shaped dicts from rows of BOOKING_ROW_COLUMNS"""
+    slices = []
+    start = 0
+    for _, _, fields in _BOOKING_ROW_PARTS:
+        slices.append((fields, start, start + len(fields), start + fields.index("id")))
+        start += len(fields)
+    (booking_fields, _, booking_end, _), *related = slices
+    
+    def part(row, fields, start, end, id_index):
+        return dict(zip(fields, row[start:end])) if row[id_index] is not None else None
+    
+    results = []
+    for row in rows:
+        booking = dict(zip(booking_fields, row[:booking_end]))
+        event, event_venue, venue, ticket_type = (part(row, *spec) for spec in related)
+        if event is not None:
+            event["venue"] = event_venue
+        booking["event"] = event
+        booking["venue"] = venue
+        booking["ticket_type"] = ticket_type
+        results.append(booking)
+    return results
+
+def get_booking_rows(db: Session, cursor: Optional[str] = None, limit: int = 100) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    rows, next_cursor = keyset_page(_booking_rows(db), [models.Booking.id], cursor, limit)
+    return booking_dicts(rows), next_cursor
+
+def get_event_booking_rows(db: Session, event_id: int) -> List[Dict[str, Any]]:
+    return booking_dicts(_booking_rows(db).filter(models.Booking.event_id == event_id))
+
+def get_ticket_type_booking_rows(db: Session, ticket_type_id: int) -> List[Dict[str, Any]]:
+    return booking_dicts(_booking_rows(db).filter(models.Booking.ticket_type_id == ticket_type_id))
+
+# Columns of a booking export row, flattened across the joined tables
+BOOKING_EXPORT_COLUMNS = [
+    models.Booking.id.label("id"),
+    models.Booking.booking_code.label("booking_code"),
+    models.Booking.status.label("status"),
+    models.Booking.event_id.label("event_id"),
+    models.Event.name.label("event_name"),
+    models.Event.date.label("event_date"),
+    models.Booking.venue_id.label("venue_id"),
+    models.Venue.name.label("venue_name"),
+    models.Booking.ticket_type_id.label("ticket_type_id"),
+    models.TicketType.name.label("ticket_type_name"),
+    models.Booking.customer_name.label("customer_name"),
+    models.Booking.customer_email.label("customer_email"),
+    models.Booking.quantity.label("quantity"),
+    models.Booking.total_amount.label("total_amount"),
+    models.Booking.created_at.label("created_at"),
+]
+
+def iter_booking_export_rows(db: Session, event_id: Optional[int] = None, status: Optional[models.BookingStatus] = None,
+                             batch_size: int = 1000) -> Iterator[List[Any]]:
+    """Yield bookings as batches of plain row tuples, fetched batch_size at a time from the cursor"""
+    stmt = select(*BOOKING_EXPORT_COLUMNS).join(
+        models.Event, models.Booking.event_id == models.Event.id
+    ).join(
+        models.Venue, models.Booking.venue_id == models.Venue.id
+    ).join(
+        models.TicketType, models.Booking.ticket_type_id == models.TicketType.id
+    ).order_by(models.Booking.id)
+    
+    if event_id is not None:
+        stmt = stmt.where(models.Booking.event_id == event_id)
+    if status:
+        stmt = stmt.where(models.Booking.status == status)
+    
+    result = db.execute(stmt.execution_options(yield_per=batch_size))
+    for batch in result.partitions():
+        yield batch
+
+def get_bookings_by_ids(db: Session, ids: List[int]) -> List[models.Booking]:
+    return _by_ids(db.query(models.Booking).options(
         joinedload(models.Booking.event),
         joinedload(models.Booking.venue),
         joinedload(models.Booking.ticket_type)
-    ).offset(skip).limit(limit).all()
+    ), ids)
 
 def get_booking(db: Session, booking_id: int) -> Optional[models.Booking]:
     return db.query(models.Booking).options(
@@ -250,85 +1053,320 @@ def get_booking(db: Session, booking_id: int) -> Optional[models.Booking]:
 def update_booking(db: Session, booking_id: int, booking: schemas.BookingUpdate) -> Optional[models.Booking]:
     db_booking = get_booking(db, booking_id)
     if db_booking:
-        update_data = booking.dict(exclude_unset=True)
+        update_data = booking.model_dump(exclude_unset=True)
         
-        # If quantity is updated, recalculate total amount
+        # If quantity is updated, recalculate total amount and adjust the held seats
         if 'quantity' in update_data:
             ticket_type = get_ticket_type(db, db_booking.ticket_type_id)
             update_data['total_amount'] = ticket_type.price * update_data['quantity']
+            
+            _move_seats(db, db_booking.event_id, db_booking.ticket_type_id,
+                        (db_booking.quantity, db_booking.status),
+                        (update_data['quantity'], db_booking.status))
+            _roll_revenue(db, db_booking,
+                          (db_booking.quantity, db_booking.total_amount, db_booking.status),
+                          (update_data['quantity'], update_data['total_amount'], db_booking.status))
         
         for field, value in update_data.items():
             setattr(db_booking, field, value)
+        _log_changes(db, "updated", [db_booking])
         db.commit()
+        cache.changed("bookings")
         db.refresh(db_booking)
     return db_booking
 
 def update_booking_status(db: Session, booking_id: int, status: models.BookingStatus) -> Optional[models.Booking]:
     db_booking = get_booking(db, booking_id)
     if db_booking:
+        _move_seats(db, db_booking.event_id, db_booking.ticket_type_id,
+                    (db_booking.quantity, db_booking.status),
+                    (db_booking.quantity, status))
+        _roll_revenue(db, db_booking,
+                      (db_booking.quantity, db_booking.total_amount, db_booking.status),
+                      (db_booking.quantity, db_booking.total_amount, status))
+        
         db_booking.status = status
+        _log_changes(db, "updated", [db_booking])
         db.commit()
+        cache.changed("bookings")
         db.refresh(db_booking)
     return db_booking
 
 def delete_booking(db: Session, booking_id: int) -> bool:
     db_booking = get_booking(db, booking_id)
     if db_booking:
+        _move_seats(db, db_booking.event_id, db_booking.ticket_type_id,
+                    (db_booking.quantity, db_booking.status), (0, None))
+        _roll_revenue(db, db_booking, (db_booking.quantity, db_booking.total_amount, db_booking.status), (0, 0.0, None))
+        _log_changes(db, "deleted", [db_booking])
         db.delete(db_booking)
         db.commit()
+        cache.changed("bookings")
         return True
     return False
 
+def expire_stale_holds(db: Session, created_before: datetime, batch_size: int = 500) -> Tuple[int, int]:
+    """Cancel pending bookings created before created_before and release their seats.
+
+    Works through the (status, created_at) index in batches, one transaction each.
+    The UPDATE re-checks the status, so a booking confirmed while the sweep runs is
+    left alone. Returns (bookings expired, seats released).
+    """
+    expired = released = 0
+    while True:
+        stale = db.scalars(select(models.Booking.id).where(
+            models.Booking.status == models.BookingStatus.PENDING,
+            models.Booking.created_at < created_before
+        ).order_by(models.Booking.created_at).limit(batch_size)).all()
+        if not stale:
+            return expired, released
+        
+        rows = db.execute(update(models.Booking).where(
+            models.Booking.id.in_(stale),
+            models.Booking.status == models.BookingStatus.PENDING
+        ).values(
+            status=models.BookingStatus.CANCELLED
+        ).returning(*BOOKING_CHANGE_COLUMNS).execution_options(synchronize_session=False)).all()
+        _log_changes(db, "updated", rows)
+        
+        seats: Dict[Tuple[int, int], int] = {}
+        for row in rows:
+            seats[row.event_id, row.ticket_type_id] = seats.get((row.event_id, row.ticket_type_id), 0) + row.quantity
+        for (event_id, ticket_type_id), quantity in seats.items():
+            release_tickets(db, event_id, quantity)
+            _adjust_ticket_inventory(db, event_id, ticket_type_id, -quantity, 0)
+        db.commit()
+        cache.changed("bookings")
+        
+        expired += len(rows)
+        released += sum(seats.values())
+
+# Booking change log (models.BookingChange), appended to in each booking write's transaction
+BOOKING_CHANGE_COLUMNS = (
+    models.Booking.id, models.Booking.event_id, models.Booking.ticket_type_id,
+    models.Booking.status, models.Booking.quantity, models.Booking.total_amount
+)
+
+def _log_changes(db: Session, operation: str, bookings: Iterable[Any]) -> None:
+    """Append a change for each booking, read from its id, event_id, ticket_type_id, status, quantity and total_amount"""
+    changes = [
+        {
+            "operation": operation,
+            "booking_id": booking.id,
+            "event_id": booking.event_id,
+            "ticket_type_id": booking.ticket_type_id,
+            "status": booking.status,
+            "quantity": booking.quantity,
+            "total_amount": booking.total_amount
+        }
+        for booking in bookings
+    ]
+    if changes:
+        db.execute(insert(models.BookingChange), changes)
+
+def _log_deletes(db: Session, *criteria) -> None:
+    """Log the deletion of every booking matching criteria, before a cascade removes them"""
+    db.execute(insert(models.BookingChange).from_select(
+        ["operation", "booking_id", "event_id", "ticket_type_id", "status", "quantity", "total_amount"],
+        select(literal("deleted"), *BOOKING_CHANGE_COLUMNS).where(*criteria).order_by(models.Booking.id)
+    ))
+
+def get_booking_changes(db: Session, since: int = 0, limit: int = 1000) -> List[models.BookingChange]:
+    """Changes with a seq above since, oldest first"""
+    return db.query(models.BookingChange).filter(
+        models.BookingChange.seq > since
+    ).order_by(models.BookingChange.seq).limit(limit).all()
+
+def get_last_booking_change_seq(db: Session) -> int:
+    return db.query(func.coalesce(func.max(models.BookingChange.seq), 0)).scalar()
+
+def prune_booking_changes(db: Session, changed_before: datetime) -> int:
+    """Delete changes logged before changed_before and return how many were deleted.
+
+    changed_at is not indexed (every booking write appends to the log), but it grows
+    with seq. So the first seq logged at or after changed_before is found by binary
+    search over the primary key, and everything below it is deleted as a seq range.
+    """
+    seq, changed_at = models.BookingChange.seq, models.BookingChange.changed_at
+    # Separate statements: SQLite reads a lone MIN or MAX of the key off the end of the table
+    low, high = db.scalar(select(func.min(seq))), db.scalar(select(func.max(seq)))
+    if low is None:
+        return 0
+    
+    cut = high + 1
+    while low <= high:
+        middle = (low + high) // 2
+        # The first change at or after middle; there is one, as middle <= the last seq
+        row = db.execute(select(seq, changed_at).where(seq >= middle).order_by(seq).limit(1)).one()
+        if row.changed_at >= changed_before:
+            cut, high = row.seq, middle - 1
+        else:
+            low = row.seq + 1
+    
+    deleted = db.query(models.BookingChange).filter(seq < cut).delete(synchronize_session=False)
+    db.commit()
+    return deleted
+
+# Idempotency keys for booking creation (see app.idempotency)
+IDEMPOTENCY_PURGE_BATCH = 100
+
+def reserve_idempotency_key(db: Session, key: str, fingerprint: str, expired_before: datetime,
+                            abandoned_before: datetime) -> Optional[models.IdempotencyKey]:
+    """Claim key for a new request: None if it is now ours, else the row that holds it.
+
+    A row created before expired_before, or still without a response since before
+    abandoned_before (its request died mid-way; the response is written with the
+    booking, so none was made), no longer holds the key and is replaced. Up to
+    IDEMPOTENCY_PURGE_BATCH other expired keys are deleted on the way, oldest first
+    through the created_at index, so the table stays bounded without a sweeper.
+    """
+    expired = select(models.IdempotencyKey.key).where(
+        models.IdempotencyKey.created_at < expired_before
+    ).order_by(models.IdempotencyKey.created_at).limit(IDEMPOTENCY_PURGE_BATCH)
+    db.execute(delete(models.IdempotencyKey).where(or_(
+        models.IdempotencyKey.key.in_(expired),
+        and_(
+            models.IdempotencyKey.key == key,
+            or_(
+                models.IdempotencyKey.created_at < expired_before,
+                and_(models.IdempotencyKey.response.is_(None), models.IdempotencyKey.created_at < abandoned_before)
+            )
+        )
+    )).execution_options(synchronize_session=False))
+    db.add(models.IdempotencyKey(key=key, fingerprint=fingerprint))
+    try:
+        db.commit()
+        return None
+    except IntegrityError:
+        db.rollback()
+    
+    existing = db.get(models.IdempotencyKey, key)
+    if existing is None:
+        # Released by its request between our INSERT and this read; try again
+        return reserve_idempotency_key(db, key, fingerprint, expired_before, abandoned_before)
+    return existing
+
+def release_idempotency_key(db: Session, key: str) -> None:
+    """Free a reserved key whose request failed, so the client can retry with it"""
+    db.rollback()
+    db.execute(delete(models.IdempotencyKey).where(
+        models.IdempotencyKey.key == key,
+        models.IdempotencyKey.response.is_(None)
+    ).execution_options(synchronize_session=False))
+    db.commit()
+
+# Rows of the booking_search FTS5 index (see models.BOOKING_SEARCH_DDL)
+booking_search = table("booking_search", column("rowid"), column("rank"))
+
+def _fts_phrase(value: str) -> str:
+    return '"' + value.replace('"', '""') + '"'
+
 def search_bookings(db: Session, event_name: str = None, venue_name: str = None, 
-                   ticket_type: str = None, status: models.BookingStatus = None) -> List[models.Booking]:
+                   ticket_type: str = None, status: models.BookingStatus = None,
+                   q: str = None, skip: int = 0, limit: int = 100) -> List[models.Booking]:
+    """Search bookings through the full-text index, best matches first.
+
+    Field filters match as substrings, like ILIKE '%term%'; q matches every word
+    against any field, customer name and email included. The trigram index needs
+    at least three characters per term, so shorter terms use the ILIKE search.
+    """
+    fields = {"event_name": event_name, "venue_name": venue_name, "ticket_type": ticket_type}
+    phrases = [f"{field} : {_fts_phrase(value)}" for field, value in fields.items() if value]
+    words = q.split() if q else []
+    phrases += [_fts_phrase(word) for word in words]
+    
+    terms = [value for value in fields.values() if value] + words
+    if not terms or db.bind.dialect.name != "sqlite" or min(len(term) for term in terms) < 3:
+        return search_bookings_ilike(db, event_name, venue_name, ticket_type, status, q, skip, limit)
+    
+    stmt = select(models.Booking.id).join(
+        booking_search, booking_search.c.rowid == models.Booking.id
+    ).where(
+        text("booking_search MATCH :match").bindparams(match=" AND ".join(phrases))
+    )
+    if status:
+        stmt = stmt.where(models.Booking.status == status)
+    ids = db.execute(stmt.order_by(booking_search.c.rank).offset(skip).limit(limit)).scalars().all()
+    
+    bookings = {
+        booking.id: booking
+        for booking in db.query(models.Booking).options(
+            joinedload(models.Booking.event),
+            joinedload(models.Booking.venue),
+            joinedload(models.Booking.ticket_type)
+        ).filter(models.Booking.id.in_(ids))
+    }
+    return [bookings[booking_id] for booking_id in ids]
+
+def search_bookings_ilike(db: Session, event_name: str = None, venue_name: str = None, 
+                          ticket_type: str = None, status: models.BookingStatus = None,
+                          q: str = None, skip: int = 0, limit: int = 100) -> List[models.Booking]:
     query = db.query(models.Booking).options(
         joinedload(models.Booking.event),
         joinedload(models.Booking.venue),
         joinedload(models.Booking.ticket_type)
     )
     
+    if event_name or venue_name or ticket_type or q:
+        query = query.join(models.Event).join(models.Venue).join(models.TicketType)
+    
     if event_name:
-        query = query.join(models.Event).filter(models.Event.name.ilike(f"%{event_name}%"))
+        query = query.filter(models.Event.name.ilike(f"%{event_name}%"))
     
     if venue_name:
-        query = query.join(models.Venue).filter(models.Venue.name.ilike(f"%{venue_name}%"))
+        query = query.filter(models.Venue.name.ilike(f"%{venue_name}%"))
     
     if ticket_type:
-        query = query.join(models.TicketType).filter(models.TicketType.name.ilike(f"%{ticket_type}%"))
+        query = query.filter(models.TicketType.name.ilike(f"%{ticket_type}%"))
+    
+    for word in (q.split() if q else []):
+        query = query.filter(or_(
+            models.Event.name.ilike(f"%{word}%"),
+            models.Venue.name.ilike(f"%{word}%"),
+            models.TicketType.name.ilike(f"%{word}%"),
+            models.Booking.customer_name.ilike(f"%{word}%"),
+            models.Booking.customer_email.ilike(f"%{word}%")
+        ))
     
     if status:
         query = query.filter(models.Booking.status == status)
     
-    return query.all()
+    return query.order_by(models.Booking.id).offset(skip).limit(limit).all()
+
+def rebuild_search_index(db: Session) -> int:
+    """Repopulate the full-text index from the bookings table and return the number of rows indexed"""
+    db.execute(text("DELETE FROM booking_search"))
+    db.execute(text(models.BOOKING_SEARCH_INDEX))
+    db.commit()
+    return db.execute(select(func.count()).select_from(booking_search)).scalar()
 
 def get_booking_stats(db: Session) -> Dict[str, Any]:
-    # Get total counts
-    total_bookings = db.query(models.Booking).count()
-    total_events = db.query(models.Event).count()
-    total_venues = db.query(models.Venue).count()
-    
-    # Get status counts
-    confirmed_bookings = db.query(models.Booking).filter(
-        models.Booking.status == models.BookingStatus.CONFIRMED
-    ).count()
-    pending_bookings = db.query(models.Booking).filter(
-        models.Booking.status == models.BookingStatus.PENDING
-    ).count()
-    cancelled_bookings = db.query(models.Booking).filter(
-        models.Booking.status == models.BookingStatus.CANCELLED
-    ).count()
-    
-    # Get total revenue
-    total_revenue = db.query(func.sum(models.Booking.total_amount)).filter(
-        models.Booking.status == models.BookingStatus.CONFIRMED
-    ).scalar() or 0
+    return cache.stats_snapshot.get(lambda: _compute_booking_stats(db))
+
+def _compute_booking_stats(db: Session) -> Dict[str, Any]:
+    # One pass over bookings with conditional aggregates; table counts ride along as subqueries
+    def count_status(status: models.BookingStatus):
+        return func.coalesce(func.sum(case((models.Booking.status == status, 1), else_=0)), 0)
+    
+    result = db.query(
+        func.count(models.Booking.id).label('total_bookings'),
+        select(func.count(models.Event.id)).scalar_subquery().label('total_events'),
+        select(func.count(models.Venue.id)).scalar_subquery().label('total_venues'),
+        count_status(models.BookingStatus.CONFIRMED).label('confirmed_bookings'),
+        count_status(models.BookingStatus.PENDING).label('pending_bookings'),
+        count_status(models.BookingStatus.CANCELLED).label('cancelled_bookings'),
+        func.coalesce(func.sum(case(
+            (models.Booking.status == models.BookingStatus.CONFIRMED, models.Booking.total_amount),
+            else_=0
+        )), 0).label('total_revenue')
+    ).select_from(models.Booking).one()
     
     return {
-        "total_bookings": total_bookings,
-        "total_events": total_events,
-        "total_venues": total_venues,
-        "total_revenue": total_revenue,
-        "confirmed_bookings": confirmed_bookings,
-        "pending_bookings": pending_bookings,
-        "cancelled_bookings": cancelled_bookings
-    } 
\ No newline at end of file
+        "total_bookings": result.total_bookings,
+        "total_events": result.total_events,
+        "total_venues": result.total_venues,
+        "total_revenue": result.total_revenue,
+        "confirmed_bookings": result.confirmed_bookings,
+        "pending_bookings": result.pending_bookings,
+        "cancelled_bookings": result.cancelled_bookings
+    }
@@ -0,0 +1,78 @@
+"""
+Async counterparts of the crud functions used by the async routers.
+
+Each one runs the sync implementation through AsyncSession.run_sync, so the SQL and
+the inventory rules live in one place while the I/O goes through the async driver.
+Results are converted to response schemas inside run_sync: relationships cannot be
+lazy-loaded once control is back on the event loop. They are loaded before validation
+too, since a lazy load inside model_validate would suspend pydantic mid-validation.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud, models, schemas
+
+def _booking_response(booking: models.Booking) -> schemas.BookingResponse:
+    # Touch every relationship the schema reads so the loads happen here, not in pydantic
+    booking.event and booking.event.venue
+    booking.venue, booking.ticket_type
+    return schemas.BookingResponse.model_validate(booking)
+
+async def get_venue(db: AsyncSession, venue_id: int) -> Optional[schemas.VenueResponse]:
+    def load(session):
+        venue = crud.get_venue(session, venue_id)
+        return schemas.VenueResponse.model_validate(venue) if venue else None
+    return await db.run_sync(load)
+
+async def get_events(db: AsyncSession, cursor: Optional[str] = None, limit: int = 100) -> Tuple[List[schemas.EventResponse], Optional[str]]:
+    def load(session):
+        events, next_cursor = crud.get_events(session, cursor=cursor, limit=limit)
+        return [schemas.EventResponse.model_validate(event) for event in events], next_cursor
+    return await db.run_sync(load)
+
+async def get_events_by_ids(db: AsyncSession, ids: List[int]) -> List[schemas.EventResponse]:
+    def load(session):
+        return [schemas.EventResponse.model_validate(event) for event in crud.get_events_by_ids(session, ids)]
+    return await db.run_sync(load)
+
+async def get_event(db: AsyncSession, event_id: int) -> Optional[schemas.EventResponse]:
+    def load(session):
+        event = crud.get_event(session, event_id)
+        return schemas.EventResponse.model_validate(event) if event else None
+    return await db.run_sync(load)
+
+async def get_available_tickets(db: AsyncSession, event_id: int) -> Optional[Dict[str, Any]]:
+    return await db.run_sync(crud.get_available_tickets, event_id)
+
+async def get_ticket_type(db: AsyncSession, ticket_type_id: int) -> Optional[schemas.TicketTypeResponse]:
+    def load(session):
+        ticket_type = crud.get_ticket_type(session, ticket_type_id)
+        return schemas.TicketTypeResponse.model_validate(ticket_type) if ticket_type else None
+    return await db.run_sync(load)
+
+async def create_booking(db: AsyncSession, booking: schemas.BookingCreate, idempotency_key: Optional[str] = None) -> schemas.BookingResponse:
+    def create(session):
+        return _booking_response(crud.create_booking(session, booking, idempotency_key))
+    return await db.run_sync(create)
+
+async def get_bookings(db: AsyncSession, cursor: Optional[str] = None, limit: int = 100) -> Tuple[List[schemas.BookingResponse], Optional[str]]:
+    def load(session):
+        bookings, next_cursor = crud.get_bookings(session, cursor=cursor, limit=limit)
+        return [_booking_response(booking) for booking in bookings], next_cursor
+    return await db.run_sync(load)
+
+async def get_booking_rows(db: AsyncSession, cursor: Optional[str] = None, limit: int = 100) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    return await db.run_sync(crud.get_booking_rows, cursor, limit)
+
+async def get_bookings_by_ids(db: AsyncSession, ids: List[int]) -> List[schemas.BookingResponse]:
+    def load(session):
+        return [_booking_response(booking) for booking in crud.get_bookings_by_ids(session, ids)]
+    return await db.run_sync(load)
+
+async def get_booking(db: AsyncSession, booking_id: int) -> Optional[schemas.BookingResponse]:
+    def load(session):
+        booking = crud.get_booking(session, booking_id)
+        return _booking_response(booking) if booking else None
+    return await db.run_sync(load)
@@ -1,18 +1,65 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
-# SQLite database URL
-SQLALCHEMY_DATABASE_URL = "sqlite:///./ticket_booking.db"
+from app import config
+
+# Database URL, SQLite by default
+SQLALCHEMY_DATABASE_URL = config.DATABASE_URL
+
+def sqlite_pragmas(profile: str = config.SQLITE_PROFILE) -> dict:
+    """PRAGMA settings run on every new SQLite connection for the given profile"""
+    if profile != "performance":
+        return {}
+    return {
+        "journal_mode": config.SQLITE_JOURNAL_MODE,
+        "synchronous": config.SQLITE_SYNCHRONOUS,
+        "mmap_size": config.SQLITE_MMAP_SIZE,
+        "cache_size": config.SQLITE_CACHE_SIZE,
+        "busy_timeout": config.SQLITE_BUSY_TIMEOUT_MS,
+    }
+
+def engine_options(url: str, is_async: bool = False) -> dict:
+    """Keyword arguments for create_engine/create_async_engine for this URL"""
+    parsed = make_url(url)
+    if parsed.get_backend_name() != "sqlite":
+        return {"pool_size": config.DB_POOL_SIZE, "max_overflow": config.DB_MAX_OVERFLOW, "pool_timeout": config.DB_POOL_TIMEOUT}
+    options = {"connect_args": {"check_same_thread": False}}
+    # In-memory databases live on a single connection, so there is no pool to size
+    if parsed.database and parsed.database != ":memory:":
+        options.update(pool_size=config.DB_POOL_SIZE, max_overflow=config.DB_MAX_OVERFLOW, pool_timeout=config.DB_POOL_TIMEOUT)
+        # aiosqlite defaults to NullPool, which reconnects (and re-runs the pragmas) per session
+        if is_async:
+            options["poolclass"] = AsyncAdaptedQueuePool
+    return options
+
+def apply_sqlite_pragmas(engine: Engine, pragmas: dict) -> None:
+    """Run pragmas on each connection the engine opens (pass async_engine.sync_engine for async)"""
+    if not pragmas or engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
 
 # Create SQLAlchemy engine
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **engine_options(SQLALCHEMY_DATABASE_URL))
+apply_sqlite_pragmas(engine, sqlite_pragmas())
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine and sessions for DB_MODE=async (aiosqlite by default)
+async_engine = create_async_engine(config.ASYNC_DATABASE_URL, **engine_options(config.ASYNC_DATABASE_URL, is_async=True))
+apply_sqlite_pragmas(async_engine.sync_engine, sqlite_pragmas())
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 # Create Base class
 Base = declarative_base()
 
@@ -22,4 +69,9 @@ def get_db():
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+# Dependency to get an async database session
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,47 @@
+import csv
+import enum
+import io
+import json
+from datetime import datetime
+from typing import Any, Iterable, Iterator, List
+
+from app import crud
+from app.database import SessionLocal
+
+FIELDS = [column.key for column in crud.BOOKING_EXPORT_COLUMNS]
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    return value
+
+def ndjson_chunks(batches: Iterable[List[Any]]) -> Iterator[str]:
+    for batch in batches:
+        yield "".join(
+            json.dumps(dict(zip(FIELDS, map(_plain, row))), separators=(",", ":")) + "\n"
+            for row in batch
+        )
+
+def csv_chunks(batches: Iterable[List[Any]]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(FIELDS)
+    for batch in batches:
+        writer.writerows([map(_plain, row) for row in batch])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    # Header only, when there are no bookings
+    if buffer.tell():
+        yield buffer.getvalue()
+
+def stream_bookings(fmt: str, **filters) -> Iterator[str]:
+    """Encode bookings chunk by chunk, with a session that lives as long as the stream"""
+    db = SessionLocal()
+    try:
+        batches = crud.iter_booking_export_rows(db, **filters)
+        yield from (csv_chunks(batches) if fmt == "csv" else ndjson_chunks(batches))
+    finally:
+        db.close()
@@ -0,0 +1,97 @@
+import asyncio
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+from app import config, crud
+from app.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+class HoldSweeper:
+    """Background task that expires pending bookings older than the hold TTL.
+
+    Started and stopped from main.py. Each sweep runs in the threadpool with its
+    own session, so it never blocks the event loop. Counters are kept for the
+    /api/booking-system/holds metrics endpoint.
+    """
+
+    def __init__(self, ttl: float, interval: float, batch_size: int):
+        self.ttl = ttl
+        self.interval = interval
+        self.batch_size = batch_size
+        self._task: Optional[asyncio.Task] = None
+        self._lock = threading.Lock()
+        self._metrics = {
+            "sweeps": 0,
+            "failed_sweeps": 0,
+            "holds_released": 0,
+            "seats_released": 0,
+            "last_sweep_ms": 0.0,
+            "max_sweep_ms": 0.0,
+            "total_sweep_ms": 0.0,
+            "last_sweep_at": None,
+        }
+
+    def sweep(self) -> int:
+        """Expire stale holds once and record the sweep; returns the number of bookings expired"""
+        if self.ttl <= 0:
+            # Holds never expire; a TTL of 0 would otherwise make every pending booking stale
+            return 0
+        start = time.perf_counter()
+        db = SessionLocal()
+        try:
+            # created_at is stored in UTC (CURRENT_TIMESTAMP)
+            expired, seats = crud.expire_stale_holds(
+                db, datetime.utcnow() - timedelta(seconds=self.ttl), self.batch_size
+            )
+        finally:
+            db.close()
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with self._lock:
+            self._metrics["sweeps"] += 1
+            self._metrics["holds_released"] += expired
+            self._metrics["seats_released"] += seats
+            self._metrics["last_sweep_ms"] = elapsed_ms
+            self._metrics["max_sweep_ms"] = max(self._metrics["max_sweep_ms"], elapsed_ms)
+            self._metrics["total_sweep_ms"] += elapsed_ms
+            self._metrics["last_sweep_at"] = datetime.utcnow()
+        return expired
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await run_in_threadpool(self.sweep)
+            except Exception:
+                with self._lock:
+                    self._metrics["failed_sweeps"] += 1
+                logger.exception("Hold expiry sweep failed")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None and self.ttl > 0:
+            self._task = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            metrics = dict(self._metrics)
+        metrics["running"] = self._task is not None
+        metrics["hold_ttl_seconds"] = self.ttl
+        metrics["average_sweep_ms"] = metrics["total_sweep_ms"] / metrics["sweeps"] if metrics["sweeps"] else 0.0
+        return metrics
+
+sweeper = HoldSweeper(config.HOLD_TTL_SECONDS, config.HOLD_SWEEP_INTERVAL_SECONDS, config.HOLD_SWEEP_BATCH_SIZE)
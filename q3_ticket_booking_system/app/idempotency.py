@@ -0,0 +1,139 @@
+"""
+Idempotency keys for POST /api/bookings/.
+
+A client that sends an Idempotency-Key header can retry a booking after a timeout
+without booking twice: the first request reserves the key in the idempotency_keys
+table, the booking's transaction stores its response against it, and every retry
+with the same key and body gets that response back without touching inventory.
+Completed responses are also kept in an in-process LRU, so repeated retries are a
+dictionary lookup. Keys expire IDEMPOTENCY_TTL_SECONDS after their first use.
+Outcome counts are served at /api/booking-system/idempotency and in /metrics.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from app import config, crud, metrics
+
+# A key still without a response after this long belongs to a request that died
+ABANDONED_AFTER_SECONDS = 60
+
+class KeyInProgress(Exception):
+    """The key's first request has not finished yet"""
+
+def fingerprint(request: BaseModel) -> str:
+    return hashlib.sha256(request.model_dump_json().encode()).hexdigest()
+
+class IdempotencyStore:
+    """Key -> response store: the idempotency_keys table behind an LRU of completed responses"""
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # key -> (fingerprint, response JSON, expires at in UTC)
+        self._entries: "OrderedDict[str, Tuple[str, bytes, datetime]]" = OrderedDict()
+        self.memory_hits = 0
+        self.table_hits = 0
+        self.misses = 0
+        # Retries rejected with 409 (first request still running) and 422 (different body)
+        self.in_progress = 0
+        self.mismatches = 0
+
+    def begin(self, db: Session, key: str, request_fingerprint: str) -> Optional[bytes]:
+        """The stored response for a retried key, or None once the key is reserved for this request.
+
+        Raises ValueError when the key was used with a different request body and
+        KeyInProgress while its first request is still running.
+        """
+        now = datetime.utcnow()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] <= now:
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                if entry[0] == request_fingerprint:
+                    self.memory_hits += 1
+                    return entry[1]
+        if entry is not None:
+            self._count_mismatch()
+            raise ValueError("Idempotency-Key was already used with a different request")
+
+        # created_at is stored in UTC (CURRENT_TIMESTAMP)
+        existing = crud.reserve_idempotency_key(
+            db, key, request_fingerprint,
+            expired_before=now - timedelta(seconds=self.ttl),
+            abandoned_before=now - timedelta(seconds=ABANDONED_AFTER_SECONDS)
+        )
+        if existing is None:
+            with self._lock:
+                self.misses += 1
+            return None
+        if existing.fingerprint != request_fingerprint:
+            self._count_mismatch()
+            raise ValueError("Idempotency-Key was already used with a different request")
+        if existing.response is None:
+            with self._lock:
+                self.in_progress += 1
+            raise KeyInProgress("A request with this Idempotency-Key is still being processed")
+
+        response = existing.response.encode()
+        with self._lock:
+            self.table_hits += 1
+            self._entries[key] = (existing.fingerprint, response, existing.created_at + timedelta(seconds=self.ttl))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return response
+
+    def _count_mismatch(self) -> None:
+        with self._lock:
+            self.mismatches += 1
+
+    def abandon(self, db: Session, key: str) -> None:
+        """Release a key whose request failed, so it can be retried"""
+        crud.release_idempotency_key(db, key)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits = self.memory_hits + self.table_hits
+            lookups = hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "memory_hits": self.memory_hits,
+                "table_hits": self.table_hits,
+                "misses": self.misses,
+                "in_progress": self.in_progress,
+                "mismatches": self.mismatches,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0
+            }
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "memory_hit": self.memory_hits,
+                "table_hit": self.table_hits,
+                "miss": self.misses,
+                "in_progress": self.in_progress,
+                "mismatch": self.mismatches
+            }
+
+# Shared by every request of this process
+store = IdempotencyStore(config.IDEMPOTENCY_TTL_SECONDS, config.IDEMPOTENCY_CACHE_SIZE)
+
+metrics.registry.add_counter(
+    "booking_idempotency_requests_total",
+    "Booking requests with an Idempotency-Key, by outcome",
+    "outcome",
+    store.counts
+)
@@ -0,0 +1,177 @@
+"""
+Index advisor: EXPLAIN QUERY PLAN over the SQL the crud layer issues.
+
+run() builds a throwaway SQLite database from the models, seeds a few rows, then calls
+each crud read and write path (WORKLOAD) while recording the statements it executes.
+Every statement is explained with the parameters it ran with, and plan steps that read
+a whole table ("SCAN bookings") instead of searching an index are reported. Scans a step
+is meant to do (listing every ticket type, whole-table rebuilds) are declared in its
+WORKLOAD entry and reported as expected; anything else is flagged.
+"""
+
+import os
+import re
+import tempfile
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, Tuple
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, sessionmaker
+
+from app import crud, models, schemas
+from app.pagination import encode_cursor
+
+# "SCAN bookings" or "SCAN b" reads every row of the table; "SCAN bookings USING
+# [COVERING] INDEX ..." walks an index in order, and SEARCH seeks into one
+FULL_SCAN = re.compile(r"SCAN (\w+)$")
+
+@dataclass
+class Step:
+    name: str
+    run: Callable[[Session, Dict[str, Any]], Any]
+    expected_scans: Tuple[str, ...] = ()
+
+@dataclass
+class Finding:
+    step: str
+    table: str
+    statement: str
+    plan: List[str]
+    expected: bool
+
+@dataclass
+class Report:
+    findings: List[Finding] = field(default_factory=list)
+    statements: int = 0
+
+    @property
+    def unexpected(self) -> List[Finding]:
+        return [finding for finding in self.findings if not finding.expected]
+
+def _booking(ids: Dict[str, Any], quantity: int = 1) -> schemas.BookingCreate:
+    return schemas.BookingCreate(
+        event_id=ids["event"], venue_id=ids["venue"], ticket_type_id=ids["ticket_type"],
+        customer_name="Advisor", customer_email="advisor@example.com", quantity=quantity
+    )
+
+def _next_page(list_fn, *keys):
+    # A page after the first, so the keyset condition is planned too; the first page
+    # alone is an ORDER BY ... LIMIT that stops after a page of rows
+    return lambda db, ids: list_fn(db, cursor=encode_cursor([ids[key] for key in keys]), limit=1)
+
+def _export(db: Session, ids: Dict[str, Any]) -> None:
+    for _ in crud.iter_booking_export_rows(db, event_id=ids["event"], status=models.BookingStatus.CONFIRMED):
+        pass
+
+WORKLOAD = [
+    # First, before any read seeds the untracked event through _with_inventory
+    Step("seed_event_inventory", lambda db, ids: crud._seed_event_inventory(db, ids["untracked_event"])),
+    Step("get_venues", _next_page(crud.get_venues, "venue")),
+    Step("get_venue_events", lambda db, ids: crud.get_venue_events(db, ids["venue"])),
+    Step("get_venues_occupancy", lambda db, ids: crud.get_venues_occupancy(db, [ids["venue"]], date.today(), date.today() + timedelta(days=60))),
+    Step("get_events", _next_page(crud.get_events, "event_date", "event")),
+    Step("get_event_calendar", lambda db, ids: crud.get_event_calendar(db, date.today(), date.today() + timedelta(days=41))),
+    Step("get_events_by_ids", lambda db, ids: crud.get_events_by_ids(db, [ids["event"]])),
+    Step("get_event_bookings", lambda db, ids: crud.get_event_bookings(db, ids["event"])),
+    Step("get_event_booking_rows", lambda db, ids: crud.get_event_booking_rows(db, ids["event"])),
+    Step("get_event_revenue", lambda db, ids: crud.get_event_revenue(db, ids["event"])),
+    Step("get_available_tickets", lambda db, ids: crud.get_available_tickets(db, ids["event"]), ("ticket_types",)),
+    Step("get_revenue_series", lambda db, ids: crud.get_revenue_series(db, event_id=ids["event"])),
+    Step("get_ticket_types", _next_page(crud.get_ticket_types, "ticket_type")),
+    Step("get_ticket_type_bookings", lambda db, ids: crud.get_ticket_type_bookings(db, ids["ticket_type"])),
+    Step("get_ticket_type_booking_rows", lambda db, ids: crud.get_ticket_type_booking_rows(db, ids["ticket_type"])),
+    Step("get_bookings", _next_page(crud.get_bookings, "booking")),
+    Step("get_booking_rows", _next_page(crud.get_booking_rows, "booking")),
+    Step("get_bookings_by_ids", lambda db, ids: crud.get_bookings_by_ids(db, [ids["booking"]])),
+    Step("get_booking_changes", lambda db, ids: crud.get_booking_changes(db, since=1)),
+    Step("search_bookings", lambda db, ids: crud.search_bookings(db, event_name="Advisor", status=models.BookingStatus.CONFIRMED)),
+    Step("iter_booking_export_rows", _export),
+    Step("get_booking_stats", lambda db, ids: crud._compute_booking_stats(db), ("bookings", "events", "venues")),
+    Step("create_booking", lambda db, ids: crud.create_booking(db, _booking(ids))),
+    Step("update_booking", lambda db, ids: crud.update_booking(db, ids["booking"], schemas.BookingUpdate(quantity=2))),
+    Step("update_booking_status", lambda db, ids: crud.update_booking_status(db, ids["booking"], models.BookingStatus.CONFIRMED)),
+    Step("expire_stale_holds", lambda db, ids: crud.expire_stale_holds(db, datetime.now() + timedelta(days=1))),
+    Step("delete_booking", lambda db, ids: crud.delete_booking(db, ids["booking"])),
+    Step("delete_ticket_type", lambda db, ids: crud.delete_ticket_type(db, ids["spare_ticket_type"])),
+    Step("delete_event", lambda db, ids: crud.delete_event(db, ids["event"])),
+    Step("delete_venue", lambda db, ids: crud.delete_venue(db, ids["venue"])),
+    Step("verify_inventory", lambda db, ids: crud.verify_inventory(db), ("bookings", "ticket_inventory", "ticket_allotments", "event_inventory", "events")),
+    Step("prune_booking_changes", lambda db, ids: crud.prune_booking_changes(db, datetime.utcnow() - timedelta(days=7))),
+    Step("verify_revenue_rollups", lambda db, ids: crud.verify_revenue_rollups(db), ("bookings", "revenue_rollups")),
+]
+
+def _seed(db: Session) -> Dict[str, Any]:
+    venue = crud.create_venue(db, schemas.VenueCreate(name="Advisor Hall", address="1 Plan Street", capacity=500))
+    crud.create_venue(db, schemas.VenueCreate(name="Advisor Annex", address="2 Plan Street", capacity=100))
+    ticket_type = crud.create_ticket_type(db, schemas.TicketTypeCreate(name="Advisor Standard", price=40.0))
+    spare = crud.create_ticket_type(db, schemas.TicketTypeCreate(name="Advisor Spare", price=10.0))
+    when = datetime.now() + timedelta(days=30)
+    night = crud.create_event(db, schemas.EventCreate(
+        name="Advisor Night", date=when, venue_id=venue.id, capacity=200,
+        allotments=[schemas.TicketAllotmentCreate(ticket_type_id=ticket_type.id, quantity=100)]
+    ))
+    untracked = crud.create_event(db, schemas.EventCreate(name="Advisor Matinee", date=when, venue_id=venue.id, capacity=50))
+    ids = {"venue": venue.id, "ticket_type": ticket_type.id, "spare_ticket_type": spare.id,
+           "event": night.id, "event_date": night.date, "untracked_event": untracked.id}
+    bookings = [crud.create_booking(db, _booking(ids)) for _ in range(3)]
+    crud.update_booking_status(db, bookings[0].id, models.BookingStatus.CONFIRMED)
+    crud.create_booking(db, _booking({**ids, "ticket_type": spare.id}))
+    ids["booking"] = bookings[1].id
+    # Leave one event without inventory counters, like a database that predates them
+    db.query(models.TicketInventory).filter(models.TicketInventory.event_id == untracked.id).delete()
+    db.query(models.EventInventory).filter(models.EventInventory.event_id == untracked.id).delete()
+    db.commit()
+    return ids
+
+@contextmanager
+def _recording(engine):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters[0] if executemany and parameters else parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+def explain(conn, statement: str, parameters: Any = ()) -> List[str]:
+    """The EXPLAIN QUERY PLAN steps of statement, one detail string per step"""
+    return [row[3] for row in conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters or ())]
+
+def full_scans(plan: List[str]) -> List[str]:
+    """Tables (or aliases) that plan reads in full"""
+    return [match.group(1) for match in map(FULL_SCAN.match, plan) if match]
+
+def run(workload: List[Step] = WORKLOAD) -> Report:
+    directory = tempfile.mkdtemp()
+    engine = create_engine(f"sqlite:///{os.path.join(directory, 'advisor.db')}")
+    models.Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    report = Report()
+    try:
+        ids = _seed(db)
+        for step in workload:
+            with _recording(engine) as statements:
+                step.run(db, ids)
+                db.commit()
+            seen = set()
+            for statement, parameters in statements:
+                if statement in seen or not statement.lstrip().upper().startswith(("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")):
+                    continue
+                seen.add(statement)
+                report.statements += 1
+                plan = explain(db.connection(), statement, parameters)
+                for table in full_scans(plan):
+                    report.findings.append(Finding(step.name, table, statement, plan, _base_table(table) in step.expected_scans))
+    finally:
+        db.close()
+        engine.dispose()
+    return report
+
+def _base_table(name: str) -> str:
+    # SQLAlchemy aliases tables as <table>_<n>
+    return re.sub(r"_\d+$", "", name)
@@ -0,0 +1,70 @@
+"""
+Schema migrations, run with Alembic from alembic/versions.
+
+The app no longer calls create_all: on startup ensure_schema() reads the database's
+revision (one SELECT) and only upgrades when it is behind. Deployments that migrate
+first (python manage.py db upgrade) can start workers with SKIP_SCHEMA_CHECK=1 so they
+never touch the schema at all.
+"""
+
+import os
+from typing import Optional, Sequence
+
+from alembic import command, op
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy.engine import Engine
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def alembic_config(connection=None) -> Config:
+    cfg = Config(os.path.join(ROOT, "alembic.ini"))
+    cfg.set_main_option("script_location", os.path.join(ROOT, "alembic"))
+    # Leave the app's logging alone when migrating in-process
+    cfg.attributes["configure_logger"] = False
+    if connection is not None:
+        cfg.attributes["connection"] = connection
+    return cfg
+
+def include_name(name: Optional[str], type_: str, parent_names) -> bool:
+    """Leave the FTS5 search table and its shadow tables out of autogenerate comparisons"""
+    return not (type_ == "table" and name is not None and name.startswith("booking_search"))
+
+def head_revision() -> str:
+    return ScriptDirectory.from_config(alembic_config()).get_current_head()
+
+def current_revision(engine: Engine) -> Optional[str]:
+    with engine.connect() as conn:
+        return MigrationContext.configure(conn).get_current_revision()
+
+def upgrade(engine: Engine, revision: str = "head") -> None:
+    # Not engine.begin(): Alembic runs and commits the migration transactions itself, so
+    # create_index_online can step outside them
+    with engine.connect() as conn:
+        command.upgrade(alembic_config(conn), revision)
+
+def ensure_schema(engine: Engine) -> bool:
+    """Upgrade the database to the latest revision if it is behind; True if it was.
+
+    Databases created by create_all before migrations existed have no revision; the
+    baseline migration only adds what they are missing.
+    """
+    if current_revision(engine) == head_revision():
+        return False
+    upgrade(engine)
+    return True
+
+def create_index_online(name: str, table: str, columns: Sequence[str], unique: bool = False) -> None:
+    """Create an index from a migration without holding the migration's transaction open.
+
+    PostgreSQL builds it CONCURRENTLY. SQLite has no concurrent build, so the index is
+    built in a transaction of its own: WAL readers carry on, and writers wait for this
+    one index (up to their busy timeout) rather than for the rest of the migration.
+    IF NOT EXISTS makes a retried or half-applied migration safe to run again.
+    """
+    with op.get_context().autocommit_block():
+        op.create_index(
+            name, table, columns, unique=unique, if_not_exists=True,
+            postgresql_concurrently=op.get_bind().dialect.name == "postgresql"
+        )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey, Text, Enum
+from sqlalchemy import Column, Integer, String, Date, DateTime, Float, ForeignKey, Text, Enum, Index, DDL, event
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -38,6 +38,57 @@ class Event(Base):
     # Relationships
     venue = relationship("Venue", back_populates="events")
     bookings = relationship("Booking", back_populates="event", cascade="all, delete-orphan")
+    inventory = relationship("EventInventory", back_populates="event", uselist=False, cascade="all, delete-orphan")
+    ticket_inventory = relationship("TicketInventory", back_populates="event", cascade="all, delete-orphan")
+    allotments = relationship("TicketAllotment", back_populates="event", cascade="all, delete-orphan")
+    revenue = relationship("RevenueRollup", back_populates="event", cascade="all, delete-orphan")
+
+    # Venue occupancy groups a venue's events within a date range; the calendar feed
+    # reads a date range across venues
+    __table_args__ = (
+        Index("ix_events_venue_id_date", "venue_id", "date"),
+        Index("ix_events_date_venue_id", "date", "venue_id"),
+    )
+
+class TicketAllotment(Base):
+    __tablename__ = "ticket_allotments"
+
+    event_id = Column(Integer, ForeignKey("events.id"), primary_key=True)
+    ticket_type_id = Column(Integer, ForeignKey("ticket_types.id"), primary_key=True)
+    quantity = Column(Integer, nullable=False)  # Seats set aside for this ticket type at this event
+
+    # Relationships
+    event = relationship("Event", back_populates="allotments")
+    ticket_type = relationship("TicketType", back_populates="allotments")
+
+    # The primary key leads with event_id; deleting a ticket type looks its allotments up by tier
+    __table_args__ = (Index("ix_ticket_allotments_ticket_type_id", "ticket_type_id"),)
+
+class EventInventory(Base):
+    __tablename__ = "event_inventory"
+
+    event_id = Column(Integer, ForeignKey("events.id"), primary_key=True)
+    reserved = Column(Integer, nullable=False, default=0)  # Seats held by pending and confirmed bookings
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    # Relationships
+    event = relationship("Event", back_populates="inventory")
+
+class TicketInventory(Base):
+    __tablename__ = "ticket_inventory"
+
+    event_id = Column(Integer, ForeignKey("events.id"), primary_key=True)
+    ticket_type_id = Column(Integer, ForeignKey("ticket_types.id"), primary_key=True)
+    booked = Column(Integer, nullable=False, default=0)  # Pending and confirmed quantity
+    confirmed = Column(Integer, nullable=False, default=0)
+    remaining = Column(Integer)  # Seats left in this tier; NULL when only the event capacity limits it
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    # Relationships
+    event = relationship("Event", back_populates="ticket_inventory")
+    ticket_type = relationship("TicketType", back_populates="inventory")
+
+    __table_args__ = (Index("ix_ticket_inventory_ticket_type_id", "ticket_type_id"),)
 
 class TicketType(Base):
     __tablename__ = "ticket_types"
@@ -51,6 +102,9 @@ class TicketType(Base):
 
     # Relationships
     bookings = relationship("Booking", back_populates="ticket_type", cascade="all, delete-orphan")
+    inventory = relationship("TicketInventory", back_populates="ticket_type", cascade="all, delete-orphan")
+    allotments = relationship("TicketAllotment", back_populates="ticket_type", cascade="all, delete-orphan")
+    revenue = relationship("RevenueRollup", back_populates="ticket_type", cascade="all, delete-orphan")
 
 class Booking(Base):
     __tablename__ = "bookings"
@@ -71,4 +125,142 @@ class Booking(Base):
     # Relationships
     event = relationship("Event", back_populates="bookings")
     venue = relationship("Venue", back_populates="bookings")
-    ticket_type = relationship("TicketType", back_populates="bookings") 
\ No newline at end of file
+    ticket_type = relationship("TicketType", back_populates="bookings") 
+
+    __table_args__ = (
+        # Lets the hold expiry sweep find stale pending bookings without scanning the table
+        Index("ix_bookings_status_created_at", "status", "created_at"),
+        # Per-event listings, cascades and inventory seeding; the trailing columns cover the
+        # seat sums grouped by ticket type, so those never touch the table rows
+        Index("ix_bookings_event_covering", "event_id", "ticket_type_id", "status", "quantity", "total_amount"),
+        # Per-tier listings and the seats a tier holds per event when it is deleted
+        Index("ix_bookings_ticket_type_covering", "ticket_type_id", "event_id", "status", "quantity"),
+        # Venue deletes and the search index trigger on venue renames
+        Index("ix_bookings_venue_id", "venue_id"),
+    )
+
+class RevenueRollup(Base):
+    """Confirmed bookings summed per day, event, venue and ticket type.
+
+    Kept current by the booking status, quantity and delete paths. Bookings count
+    towards the day they were made, so the table can always be rebuilt from bookings.
+    """
+    __tablename__ = "revenue_rollups"
+
+    day = Column(Date, primary_key=True)
+    event_id = Column(Integer, ForeignKey("events.id"), primary_key=True)
+    venue_id = Column(Integer, ForeignKey("venues.id"), primary_key=True)
+    ticket_type_id = Column(Integer, ForeignKey("ticket_types.id"), primary_key=True)
+    bookings = Column(Integer, nullable=False, default=0)
+    tickets = Column(Integer, nullable=False, default=0)
+    revenue = Column(Float, nullable=False, default=0)
+    unit_price_total = Column(Float, nullable=False, default=0)  # Sum of total_amount / quantity, for average ticket price
+
+    # Relationships
+    event = relationship("Event", back_populates="revenue")
+    ticket_type = relationship("TicketType", back_populates="revenue")
+
+    __table_args__ = (
+        Index("ix_revenue_rollups_event_day", "event_id", "day"),
+        Index("ix_revenue_rollups_venue_day", "venue_id", "day"),
+        Index("ix_revenue_rollups_ticket_type_day", "ticket_type_id", "day"),
+    )
+
+class IdempotencyKey(Base):
+    """A client's Idempotency-Key for POST /api/bookings/ and the response it got.
+
+    The row is inserted before the booking is attempted, so a concurrent retry finds
+    it, and response is filled in by the booking's own transaction. Rows expire after
+    IDEMPOTENCY_TTL_SECONDS and are purged by app.idempotency as new keys come in.
+    """
+    __tablename__ = "idempotency_keys"
+
+    key = Column(String, primary_key=True)
+    fingerprint = Column(String, nullable=False)  # sha256 of the request body the key was first used with
+    response = Column(Text)  # BookingResponse JSON; NULL while the first request is still running
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (Index("ix_idempotency_keys_created_at", "created_at"),)
+
+class BookingChange(Base):
+    """Append-only log of booking writes, tailed through GET /api/bookings/changes.
+
+    crud appends a row in the same transaction as every booking insert, update and
+    delete (cascaded deletes included), so the log never shows a write that was rolled
+    back or misses one that committed. seq only ever grows (AUTOINCREMENT never reuses
+    a value), so consumers resume from the last seq they saw.
+    """
+    __tablename__ = "booking_changes"
+
+    seq = Column(Integer, primary_key=True)
+    operation = Column(String, nullable=False)  # created, updated or deleted
+    booking_id = Column(Integer, nullable=False)  # No foreign key: deleted bookings stay in the log
+    event_id = Column(Integer, nullable=False)
+    ticket_type_id = Column(Integer, nullable=False)
+    status = Column(Enum(BookingStatus))
+    quantity = Column(Integer, nullable=False)
+    total_amount = Column(Float, nullable=False)
+    changed_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = {"sqlite_autoincrement": True}
+
+# Rollup rows recomputed from the confirmed bookings; REVENUE_ROLLUP_BACKFILL writes them
+REVENUE_ROLLUP_TOTALS = """
+    SELECT date(created_at), event_id, venue_id, ticket_type_id,
+           count(*), sum(quantity), sum(total_amount), sum(total_amount * 1.0 / quantity)
+    FROM bookings
+    WHERE status = 'CONFIRMED'
+    GROUP BY date(created_at), event_id, venue_id, ticket_type_id
+"""
+
+REVENUE_ROLLUP_BACKFILL = (
+    "INSERT INTO revenue_rollups (day, event_id, venue_id, ticket_type_id, bookings, tickets, revenue, unit_price_total)"
+    + REVENUE_ROLLUP_TOTALS
+)
+
+# Full-text index over the fields booking search filters on. FTS5 virtual tables are
+# outside the ORM, so create_all creates it alongside the tables (and the baseline
+# migration does the same) and triggers keep it in sync.
+# The trigram tokenizer keeps the substring semantics of the old ILIKE '%term%' search.
+BOOKING_SEARCH_INDEX = """
+    INSERT INTO booking_search (rowid, event_name, venue_name, ticket_type, customer_name, customer_email)
+    SELECT bookings.id, events.name, venues.name, ticket_types.name, bookings.customer_name, bookings.customer_email
+    FROM bookings
+    JOIN events ON events.id = bookings.event_id
+    JOIN venues ON venues.id = bookings.venue_id
+    JOIN ticket_types ON ticket_types.id = bookings.ticket_type_id
+"""
+
+BOOKING_SEARCH_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS booking_search USING fts5(
+        event_name, venue_name, ticket_type, customer_name, customer_email, tokenize = 'trigram'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS booking_search_insert AFTER INSERT ON bookings BEGIN
+        INSERT INTO booking_search (rowid, event_name, venue_name, ticket_type, customer_name, customer_email)
+        SELECT new.id, events.name, venues.name, ticket_types.name, new.customer_name, new.customer_email
+        FROM events, venues, ticket_types
+        WHERE events.id = new.event_id AND venues.id = new.venue_id AND ticket_types.id = new.ticket_type_id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS booking_search_delete AFTER DELETE ON bookings BEGIN
+        DELETE FROM booking_search WHERE rowid = old.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS booking_search_update AFTER UPDATE OF customer_name, customer_email ON bookings BEGIN
+        UPDATE booking_search SET customer_name = new.customer_name, customer_email = new.customer_email
+        WHERE rowid = new.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS booking_search_event_name AFTER UPDATE OF name ON events BEGIN
+        UPDATE booking_search SET event_name = new.name
+        WHERE rowid IN (SELECT id FROM bookings WHERE event_id = new.id);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS booking_search_venue_name AFTER UPDATE OF name ON venues BEGIN
+        UPDATE booking_search SET venue_name = new.name
+        WHERE rowid IN (SELECT id FROM bookings WHERE venue_id = new.id);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS booking_search_ticket_type_name AFTER UPDATE OF name ON ticket_types BEGIN
+        UPDATE booking_search SET ticket_type = new.name
+        WHERE rowid IN (SELECT id FROM bookings WHERE ticket_type_id = new.id);
+    END""",
+]
+
+for statement in BOOKING_SEARCH_DDL:
+    event.listen(Base.metadata, "after_create", DDL(statement).execute_if(dialect="sqlite"))
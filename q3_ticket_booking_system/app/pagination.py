@@ -0,0 +1,51 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import DateTime, and_, or_
+from sqlalchemy.orm import Query
+
+def encode_cursor(values: List[Any]) -> str:
+    """Pack the sort key of the last row on a page into an opaque URL-safe token"""
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str, columns: List[Any]) -> List[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError
+        # Nested lists or objects would reach the database as bind parameters
+        if not all(isinstance(value, (str, int, float)) for value in values):
+            raise ValueError
+        return [
+            datetime.fromisoformat(value) if isinstance(column.type, DateTime) else value
+            for column, value in zip(columns, values)
+        ]
+    except (TypeError, ValueError):
+        raise ValueError("Invalid cursor")
+
+def _after(columns: List[Any], values: List[Any]):
+    # (a, b) > (x, y) spelled out as a > x OR (a = x AND b > y), which SQLite can seek on
+    column, value = columns[0], values[0]
+    if len(columns) == 1:
+        return column > value
+    return or_(column > value, and_(column == value, _after(columns[1:], values[1:])))
+
+def keyset_page(query: Query, columns: List[Any], cursor: Optional[str], limit: int) -> Tuple[List[Any], Optional[str]]:
+    """Return one page of query ordered by columns, and the cursor of the page after it.
+
+    Unlike OFFSET, the cost of a page does not grow with its depth: the cursor
+    becomes a range condition on the sort key instead of rows to skip.
+    """
+    if cursor:
+        query = query.filter(_after(columns, decode_cursor(cursor, columns)))
+    rows = query.order_by(*columns).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([getattr(rows[-1], column.key) for column in columns])
+    return rows, next_cursor
@@ -0,0 +1,186 @@
+"""
+HTTP response cache for the read-heavy catalog endpoints.
+
+ResponseCacheMiddleware serves GETs of venues, ticket types and events (lists, single
+items and the calendar feed) from an in-process LRU keyed by path and query string.
+Each entry remembers the versions of the tables it was built from (cache.table_versions,
+bumped by every crud write), so a write makes it stale without explicit invalidation.
+Those versions only count this process's writes, so entries also expire after
+RESPONSE_CACHE_MAX_AGE_SECONDS: with several workers, that bounds how long one serves
+a response another worker's write has outdated. A hit skips routing, the database
+session and serialization. Responses carry a strong ETag and Cache-Control: no-cache,
+and a matching If-None-Match gets an empty 304.
+"""
+
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from app import cache, config
+
+# Cacheable paths and the tables their responses are built from
+CACHED_ROUTES = (
+    (re.compile(r"/api/venues/(\d+)?"), ("venues",)),
+    (re.compile(r"/api/ticket-types/(\d+)?"), ("ticket_types",)),
+    (re.compile(r"/api/events/(\d+)?"), ("events", "venues")),
+    (re.compile(r"/api/events/calendar"), ("events", "venues", "bookings")),
+)
+
+def etag_for(body: bytes) -> str:
+    return f'"{hashlib.sha1(body).hexdigest()}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    return if_none_match.strip() == "*" or etag in {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+
+class _Entry:
+    __slots__ = ("versions", "body", "headers", "etag", "route", "size", "created")
+
+    def __init__(self, versions: Tuple[int, ...], body: bytes, headers: List[Tuple[bytes, bytes]], route: Any):
+        self.versions = versions
+        self.body = body
+        self.etag = etag_for(body)
+        self.headers = [(name, value) for name, value in headers if name not in (b"etag", b"cache-control")] + [
+            (b"etag", self.etag.encode()), (b"cache-control", b"no-cache")
+        ]
+        self.route = route
+        self.size = len(body) + sum(len(name) + len(value) for name, value in self.headers)
+        self.created = time.monotonic()
+
+class ResponseCache:
+    """LRU of responses bounded by the total size of their bodies and headers, in bytes,
+    and by their age in seconds (0 for no age limit)"""
+
+    def __init__(self, max_bytes: int, max_age: float = 0):
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, bytes], _Entry]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Tuple[str, bytes], versions: Tuple[int, ...]) -> Optional[_Entry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.max_age > 0 and time.monotonic() - entry.created >= self.max_age:
+                # Too old to trust: another worker may have written since it was built
+                del self._entries[key]
+                self._bytes -= entry.size
+                self.expirations += 1
+                entry = None
+            if entry is not None and entry.versions == versions:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+            return None
+
+    def put(self, key: Tuple[str, bytes], entry: _Entry) -> None:
+        if entry.size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.size
+            self._entries[key] = entry
+            self._bytes += entry.size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "max_age_seconds": self.max_age,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations
+            }
+
+# Shared by every request of this process
+responses = ResponseCache(config.RESPONSE_CACHE_MAX_BYTES, config.RESPONSE_CACHE_MAX_AGE_SECONDS)
+
+class ResponseCacheMiddleware:
+    """ASGI middleware answering cacheable GETs from the response cache"""
+
+    def __init__(self, app, cache: ResponseCache = responses, routes=CACHED_ROUTES):
+        self.app = app
+        self.cache = cache
+        self.routes = routes
+
+    def _tables(self, scope) -> Optional[Tuple[str, ...]]:
+        if scope["type"] != "http" or scope["method"] != "GET":
+            return None
+        for pattern, tables in self.routes:
+            if pattern.fullmatch(scope["path"]):
+                return tables
+        return None
+
+    async def __call__(self, scope, receive, send):
+        tables = self._tables(scope)
+        if tables is None:
+            await self.app(scope, receive, send)
+            return
+
+        key = (scope["path"], scope["query_string"])
+        if_none_match = next((value.decode("latin-1") for name, value in scope["headers"] if name == b"if-none-match"), None)
+        # Read before the response is built, so a write landing meanwhile leaves the entry stale
+        versions = cache.table_versions.get(*tables)
+        entry = self.cache.get(key, versions)
+        if entry is not None:
+            # Let route-labelled middleware (metrics) see which endpoint was served
+            scope["route"] = entry.route
+            await self._send(entry, if_none_match, send)
+            return
+
+        start = None
+        chunks = []
+
+        async def capture(message):
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+                if start["status"] != 200:
+                    await send(message)
+                return
+            if start["status"] != 200:
+                await send(message)
+                return
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                entry = _Entry(versions, b"".join(chunks), list(start["headers"]), scope.get("route"))
+                self.cache.put(key, entry)
+                await self._send(entry, if_none_match, send)
+
+        await self.app(scope, receive, capture)
+
+    async def _send(self, entry: _Entry, if_none_match: Optional[str], send) -> None:
+        if etag_matches(if_none_match, entry.etag):
+            await send({
+                "type": "http.response.start",
+                "status": 304,
+                "headers": [(name, value) for name, value in entry.headers if name in (b"etag", b"cache-control")]
+            })
+            await send({"type": "http.response.body", "body": b""})
+            return
+        await send({"type": "http.response.start", "status": 200, "headers": entry.headers})
+        await send({"type": "http.response.body", "body": entry.body})
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, EmailStr, validator
 from typing import Optional, List
-from datetime import datetime
+from datetime import date, datetime
 from app.models import BookingStatus
 
 # Base schemas
@@ -39,6 +39,16 @@ class TicketTypeBase(BaseModel):
             raise ValueError('Price must be positive')
         return v
 
+class TicketAllotmentBase(BaseModel):
+    ticket_type_id: int
+    quantity: int
+
+    @validator('quantity')
+    def quantity_must_be_positive(cls, v):
+        if v <= 0:
+            raise ValueError('Quantity must be positive')
+        return v
+
 class BookingBase(BaseModel):
     event_id: int
     venue_id: int
@@ -57,9 +67,12 @@ class BookingBase(BaseModel):
 class VenueCreate(VenueBase):
     pass
 
-class EventCreate(EventBase):
+class TicketAllotmentCreate(TicketAllotmentBase):
     pass
 
+class EventCreate(EventBase):
+    allotments: List[TicketAllotmentCreate] = []
+
 class TicketTypeCreate(TicketTypeBase):
     pass
 
@@ -142,6 +155,12 @@ class TicketTypeResponse(TicketTypeBase):
     class Config:
         from_attributes = True
 
+class TicketAllotmentResponse(TicketAllotmentBase):
+    event_id: int
+
+    class Config:
+        from_attributes = True
+
 class BookingResponse(BookingBase):
     id: int
     total_amount: float
@@ -159,15 +178,87 @@ class BookingResponse(BookingBase):
 # List response schemas
 class VenueList(BaseModel):
     venues: List[VenueResponse]
+    next_cursor: Optional[str] = None
 
 class EventList(BaseModel):
     events: List[EventResponse]
+    next_cursor: Optional[str] = None
 
 class TicketTypeList(BaseModel):
     ticket_types: List[TicketTypeResponse]
+    next_cursor: Optional[str] = None
 
 class BookingList(BaseModel):
     bookings: List[BookingResponse]
+    next_cursor: Optional[str] = None
+
+class BookingChange(BaseModel):
+    seq: int
+    operation: str  # created, updated or deleted
+    booking_id: int
+    event_id: int
+    ticket_type_id: int
+    status: Optional[BookingStatus] = None
+    quantity: int
+    total_amount: float
+    changed_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class BookingChangeList(BaseModel):
+    changes: List[BookingChange]
+    next_since: int  # Pass as since to get the changes after these
+
+class BulkBookingResult(BaseModel):
+    index: int
+    status: str
+    id: Optional[int] = None
+    booking_code: Optional[str] = None
+    error: Optional[str] = None
+
+class BulkBookingResponse(BaseModel):
+    created: int
+    failed: int
+    elapsed_ms: float
+    rows_per_second: float
+    results: List[BulkBookingResult]
+
+class TicketAllotmentList(BaseModel):
+    allotments: List[TicketAllotmentCreate]
+
+# Waiting room schemas
+class WaitingRoomSettings(BaseModel):
+    admit_per_second: float
+    admission_ttl_seconds: Optional[float] = None
+
+    @validator('admit_per_second')
+    def rate_must_be_positive(cls, v):
+        if v <= 0:
+            raise ValueError('Admission rate must be positive')
+        return v
+
+    @validator('admission_ttl_seconds')
+    def ttl_must_be_positive(cls, v):
+        if v is not None and v <= 0:
+            raise ValueError('Admission TTL must be positive')
+        return v
+
+class WaitingRoomStatus(BaseModel):
+    event_id: int
+    admit_per_second: float
+    admission_ttl_seconds: float
+    joined: int
+    admitted: int
+    waiting: int
+
+class QueueTokenStatus(BaseModel):
+    token: str
+    event_id: int
+    status: str
+    position: Optional[int] = None
+    estimated_wait_seconds: Optional[float] = None
+    expires_in_seconds: Optional[float] = None
 
 # Statistics schemas
 class BookingStats(BaseModel):
@@ -179,6 +270,49 @@ class BookingStats(BaseModel):
     pending_bookings: int
     cancelled_bookings: int
 
+class HoldSweepMetrics(BaseModel):
+    running: bool
+    hold_ttl_seconds: float
+    sweeps: int
+    failed_sweeps: int
+    holds_released: int
+    seats_released: int
+    last_sweep_ms: float
+    max_sweep_ms: float
+    average_sweep_ms: float
+    last_sweep_at: Optional[datetime] = None
+
+class AvailabilityStreamMetrics(BaseModel):
+    running: bool
+    subscribers: int
+    streams: int
+    buffer_size: int
+    computations: int
+    messages_sent: int
+    messages_dropped: int
+
+class ResponseCacheStats(BaseModel):
+    entries: int
+    bytes: int
+    max_bytes: int
+    max_age_seconds: float
+    hits: int
+    misses: int
+    hit_rate: float
+    evictions: int
+    expirations: int
+
+class IdempotencyStats(BaseModel):
+    entries: int
+    max_entries: int
+    ttl_seconds: float
+    memory_hits: int
+    table_hits: int
+    misses: int
+    in_progress: int
+    mismatches: int
+    hit_rate: float
+
 class EventRevenue(BaseModel):
     event_id: int
     event_name: str
@@ -186,13 +320,60 @@ class EventRevenue(BaseModel):
     total_bookings: int
     average_ticket_price: float
 
+class RevenuePoint(BaseModel):
+    day: date
+    revenue: float
+    bookings: int
+    tickets: int
+
+class RevenueSeries(BaseModel):
+    start: date
+    end: date
+    total_revenue: float
+    total_bookings: int
+    points: List[RevenuePoint]
+
+class EventOccupancy(BaseModel):
+    event_id: int
+    event_name: str
+    date: datetime
+    capacity: int
+    booked: int
+    held: int
+    occupancy_rate: float
+
+class CalendarEvent(BaseModel):
+    id: int
+    name: str
+    date: datetime
+    venue_id: int
+    venue_name: str
+    capacity: int
+    booked: int
+    available: int
+
+class CalendarDay(BaseModel):
+    day: date
+    booked: int
+    available: int
+    events: List[CalendarEvent]
+
+class EventCalendar(BaseModel):
+    start: date
+    end: date
+    venue_id: Optional[int] = None
+    days: List[CalendarDay]
+
 class VenueOccupancy(BaseModel):
     venue_id: int
     venue_name: str
+    start: Optional[date] = None
+    end: Optional[date] = None
     total_capacity: int
     total_booked: int
     occupancy_rate: float
     total_events: int
+    events: List[EventOccupancy]
 
 class AvailableTickets(BaseModel):
     event_id: int
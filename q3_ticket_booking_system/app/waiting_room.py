@@ -0,0 +1,171 @@
+import secrets
+import threading
+import time
+from typing import Any, Dict, Optional
+
+class _QueueToken:
+    __slots__ = ("seq", "admitted_at", "used")
+
+    def __init__(self, seq: int):
+        self.seq = seq
+        self.admitted_at: Optional[float] = None
+        self.used = False
+
+class WaitingRoom:
+    """Admission queue for one event.
+
+    Clients join in order and are admitted at admit_per_second. Admission is computed
+    from the clock rather than by a background task: the number of admitted positions
+    grows by admit_per_second every second, and a token is admitted once its position
+    is below that count. Up to one second of admissions (at least one) can build up
+    while nobody is waiting, starting full when the room opens, so a quiet event admits
+    newcomers immediately. An admitted token may book once within admission_ttl
+    seconds of being admitted.
+    """
+
+    def __init__(self, admit_per_second: float, admission_ttl: float):
+        self.admit_per_second = admit_per_second
+        self.admission_ttl = admission_ttl
+        self.joined = 0
+        self._released = self._burst()
+        self._last = time.monotonic()
+        self._last_prune = self._last
+        self._tokens: Dict[str, _QueueToken] = {}
+
+    def _burst(self) -> float:
+        # Admissions that may build up unused; below one a newcomer would always wait
+        return max(self.admit_per_second, 1.0)
+
+    def _advance(self, now: float) -> None:
+        self._released = min(self._released + (now - self._last) * self.admit_per_second, self.joined + self._burst())
+        self._last = now
+        if now - self._last_prune > 60:
+            self._prune(now)
+
+    def _prune(self, now: float) -> None:
+        # Start the clock on tokens admitted but never polled, and drop spent ones
+        admitted = int(self._released)
+        for token, ticket in list(self._tokens.items()):
+            if ticket.seq < admitted and ticket.admitted_at is None:
+                ticket.admitted_at = now
+            elif ticket.used or (ticket.admitted_at is not None and now - ticket.admitted_at > self.admission_ttl):
+                del self._tokens[token]
+        self._last_prune = now
+
+    def join(self) -> str:
+        self._advance(time.monotonic())
+        token = secrets.token_urlsafe(16)
+        self._tokens[token] = _QueueToken(self.joined)
+        self.joined += 1
+        return token
+
+    def status(self, token: str) -> Optional[Dict[str, Any]]:
+        """Where a token stands: waiting (with position and ETA), admitted, expired or used"""
+        ticket = self._tokens.get(token)
+        if ticket is None:
+            return None
+        now = time.monotonic()
+        self._advance(now)
+
+        if ticket.used:
+            return {"status": "used"}
+        if ticket.seq >= int(self._released):
+            position = ticket.seq - int(self._released) + 1
+            return {"status": "waiting", "position": position, "estimated_wait_seconds": position / self.admit_per_second}
+        if ticket.admitted_at is None:
+            ticket.admitted_at = now
+        expires_in = self.admission_ttl - (now - ticket.admitted_at)
+        if expires_in <= 0:
+            return {"status": "expired"}
+        return {"status": "admitted", "expires_in_seconds": expires_in}
+
+    def summary(self) -> Dict[str, Any]:
+        self._advance(time.monotonic())
+        admitted = min(int(self._released), self.joined)
+        return {
+            "admit_per_second": self.admit_per_second,
+            "admission_ttl_seconds": self.admission_ttl,
+            "joined": self.joined,
+            "admitted": admitted,
+            "waiting": self.joined - admitted
+        }
+
+    def mark_used(self, token: str, used: bool) -> None:
+        ticket = self._tokens.get(token)
+        if ticket is not None:
+            ticket.used = used
+
+class WaitingRooms:
+    """The open waiting rooms of this process, by event id. Thread-safe."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rooms: Dict[int, WaitingRoom] = {}
+
+    def open(self, event_id: int, admit_per_second: float, admission_ttl: float) -> Dict[str, Any]:
+        with self._lock:
+            room = self._rooms.get(event_id)
+            if room is None:
+                room = self._rooms[event_id] = WaitingRoom(admit_per_second, admission_ttl)
+            else:
+                # Reconfigure in place so clients already in line keep their places
+                room._advance(time.monotonic())
+                room.admit_per_second = admit_per_second
+                room.admission_ttl = admission_ttl
+            return room.summary()
+
+    def close(self, event_id: int) -> bool:
+        with self._lock:
+            return self._rooms.pop(event_id, None) is not None
+
+    def summary(self, event_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            room = self._rooms.get(event_id)
+            return room.summary() if room else None
+
+    def join(self, event_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            room = self._rooms.get(event_id)
+            if room is None:
+                return None
+            token = room.join()
+            return {"token": token, **room.status(token)}
+
+    def status(self, event_id: int, token: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            room = self._rooms.get(event_id)
+            return room.status(token) if room else None
+
+    def claim(self, event_id: int, token: Optional[str]) -> None:
+        """Spend an admitted token on a booking attempt.
+
+        Does nothing for events without a waiting room. Raises ValueError if the token
+        is missing or not currently admitted. Claiming marks the token used, so two
+        concurrent requests cannot book with it; give it back with release() if the
+        booking fails.
+        """
+        with self._lock:
+            room = self._rooms.get(event_id)
+            if room is None:
+                return
+            if not token:
+                raise ValueError("This event has a waiting room: join the queue and book with the admitted X-Queue-Token")
+            state = room.status(token)
+            if state is None:
+                raise ValueError("Unknown queue token for this event")
+            if state["status"] == "waiting":
+                raise ValueError(f"Queue token not admitted yet (position {state['position']})")
+            if state["status"] != "admitted":
+                raise ValueError(f"Queue token is {state['status']}; join the queue again")
+            room.mark_used(token, True)
+
+    def release(self, event_id: int, token: Optional[str]) -> None:
+        """Make a claimed token usable again after its booking attempt failed"""
+        with self._lock:
+            room = self._rooms.get(event_id)
+            if room is not None and token:
+                room.mark_used(token, False)
+
+# Waiting rooms are held in memory, per process: with several workers each one keeps its
+# own queue and admits at the full rate
+rooms = WaitingRooms()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Load test comparing the sync stack (threadpool endpoints, blocking sessions) with the
+async stack (DB_MODE=async: async endpoints on the aiosqlite engine).
+Drives booking creation and the bookings/events list endpoints in-process through
+httpx's ASGI transport and reports p50/p99 latency, requests/sec and failed requests
+(e.g. "database is locked" under write contention) for each stack.
+
+Usage: python benchmarks/bench_async_stack.py [--requests 2000] [--concurrency 100]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# The engines open ./ticket_booking.db, so work from a throwaway directory
+os.chdir(tempfile.mkdtemp())
+
+import httpx
+from fastapi import FastAPI
+
+from app import models
+from app.database import engine
+from app.api import events, venues, ticket_types, bookings, stats, events_async, bookings_async
+
+
+def build_app(mode):
+    app = FastAPI()
+    if mode == "async":
+        app.include_router(events_async.router)
+        app.include_router(bookings_async.router)
+    for module in (events, venues, ticket_types, bookings, stats):
+        app.include_router(module.router)
+    return app
+
+
+async def seed(client, mode, capacity):
+    venue = (await client.post("/api/venues/", json={"name": f"Load Hall {mode}", "address": "1 Load Street", "capacity": capacity})).json()
+    ticket_type = (await client.post("/api/ticket-types/", json={"name": f"Standard {mode}", "price": 50.0})).json()
+    event = (await client.post("/api/events/", json={
+        "name": f"Load Test {mode}", "date": "2030-01-01T19:00:00", "venue_id": venue["id"], "capacity": capacity
+    })).json()
+    return {
+        "event_id": event["id"],
+        "venue_id": venue["id"],
+        "ticket_type_id": ticket_type["id"],
+        "customer_name": "Load Tester",
+        "customer_email": "load@example.com",
+        "quantity": 1
+    }
+
+
+async def drive(client, requests, concurrency, send):
+    latencies = []
+    failures = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(n):
+        async with semaphore:
+            start = time.perf_counter()
+            response = await send(n)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 300:
+                failures.append(response.status_code)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(n) for n in range(requests)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    return statistics.median(latencies) * 1000, p99 * 1000, requests / elapsed, len(failures)
+
+
+async def run(requests, concurrency):
+    models.Base.metadata.create_all(bind=engine)
+    print(f"🚀 {requests} requests per scenario, {concurrency} in flight\n")
+    print(f"{'Stack':<8}{'Scenario':<16}{'p50 (ms)':>10}{'p99 (ms)':>10}{'req/s':>10}{'errors':>8}")
+
+    for mode in ("sync", "async"):
+        transport = httpx.ASGITransport(app=build_app(mode), raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            booking = await seed(client, mode, capacity=requests * 2)
+            scenarios = [
+                ("create booking", lambda n: client.post("/api/bookings/", json=booking)),
+                ("list bookings", lambda n: client.get("/api/bookings/", params={"limit": 20})),
+                ("list events", lambda n: client.get("/api/events/", params={"limit": 20})),
+            ]
+            for name, send in scenarios:
+                p50, p99, rate, errors = await drive(client, requests, concurrency, send)
+                print(f"{mode:<8}{name:<16}{p50:>10.1f}{p99:>10.1f}{rate:>10.0f}{errors:>8}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.concurrency))
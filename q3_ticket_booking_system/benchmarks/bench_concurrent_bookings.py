@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Concurrency stress benchmark for the seat reservation path.
+Fires thousands of parallel bookings at a single event through crud.create_booking,
+asserts the event is never oversold and reports bookings/sec.
+
+Usage: python benchmarks/bench_concurrent_bookings.py [--bookings 5000] [--workers 64] [--capacity 1000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+
+from app import crud, models, schemas
+
+
+def setup_database(path, capacity):
+    engine = create_engine(
+        f"sqlite:///{path}", connect_args={"check_same_thread": False, "timeout": 60}
+    )
+    models.Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    db = Session()
+    venue = crud.create_venue(db, schemas.VenueCreate(name="Stress Arena", address="1 Load Street", capacity=capacity))
+    ticket_type = crud.create_ticket_type(db, schemas.TicketTypeCreate(name="Standard", price=50.0))
+    event = crud.create_event(db, schemas.EventCreate(
+        name="Hot On-Sale",
+        date=datetime.now() + timedelta(days=30),
+        venue_id=venue.id,
+        capacity=capacity
+    ))
+    ids = (event.id, venue.id, ticket_type.id)
+    db.close()
+    return engine, Session, ids
+
+
+def book_one(Session, ids, n):
+    event_id, venue_id, ticket_type_id = ids
+    db = Session()
+    try:
+        crud.create_booking(db, schemas.BookingCreate(
+            event_id=event_id,
+            venue_id=venue_id,
+            ticket_type_id=ticket_type_id,
+            customer_name=f"Customer {n}",
+            customer_email=f"customer{n}@example.com",
+            quantity=1
+        ))
+        return "booked"
+    except ValueError:
+        return "sold_out"
+    except Exception:
+        db.rollback()
+        return "error"
+    finally:
+        db.close()
+
+
+def run(bookings, workers, capacity):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine, Session, ids = setup_database(os.path.join(tmp, "stress.db"), capacity)
+
+        print(f"🚀 Firing {bookings} bookings at one event (capacity {capacity}) with {workers} workers")
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(lambda n: book_one(Session, ids, n), range(bookings)))
+        elapsed = time.perf_counter() - start
+
+        db = Session()
+        sold = db.query(func.coalesce(func.sum(models.Booking.quantity), 0)).filter(
+            models.Booking.event_id == ids[0]
+        ).scalar()
+        reserved = crud.get_reserved_tickets(db, ids[0])
+        db.close()
+        engine.dispose()
+
+    booked = results.count("booked")
+    print(f"✅ Booked: {booked}  Sold out: {results.count('sold_out')}  Errors: {results.count('error')}")
+    print(f"✅ Seats sold: {sold} / {capacity}  Inventory counter: {reserved}")
+    print(f"✅ Throughput: {bookings / elapsed:.0f} requests/sec, {booked / elapsed:.0f} bookings/sec")
+
+    assert sold <= capacity, f"Oversold: {sold} seats sold for capacity {capacity}"
+    assert sold == booked == reserved, "Inventory counter drifted from the bookings table"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bookings", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=64)
+    parser.add_argument("--capacity", type=int, default=1000)
+    args = parser.parse_args()
+    run(args.bookings, args.workers, args.capacity)
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Secondary index benchmark for the bookings table.
+Fills a throwaway database with bookings spread over many events, venues and ticket
+types, then times the crud queries that filter or group bookings by event, ticket type
+or venue, first with the secondary booking indexes dropped and then with them in place.
+
+Usage: python benchmarks/bench_indexes.py [--rows 1000000] [--events 1000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, func, insert, select, text
+from sqlalchemy.orm import sessionmaker
+
+from app import crud, models
+
+INDEXES = [
+    index for index in models.Booking.__table__.indexes
+    if index.name in ("ix_bookings_event_covering", "ix_bookings_ticket_type_covering", "ix_bookings_venue_id")
+]
+
+STATUSES = [models.BookingStatus.CONFIRMED, models.BookingStatus.PENDING, models.BookingStatus.CANCELLED]
+
+
+def setup_database(path, rows, events):
+    engine = create_engine(f"sqlite:///{path}")
+    models.Base.metadata.create_all(bind=engine)
+    venues, ticket_types = max(events // 10, 1), 5
+
+    with engine.begin() as conn:
+        conn.execute(insert(models.Venue), [
+            {"id": n, "name": f"Bench Hall {n}", "address": f"{n} Bench Road", "capacity": rows} for n in range(1, venues + 1)
+        ])
+        conn.execute(insert(models.TicketType), [
+            {"id": n, "name": f"Tier {n}", "price": 10.0 * n} for n in range(1, ticket_types + 1)
+        ])
+        conn.execute(insert(models.Event), [
+            {"id": n, "name": f"Bench Night {n}", "date": datetime.now() + timedelta(days=n % 365),
+             "venue_id": (n - 1) % venues + 1, "capacity": rows}
+            for n in range(1, events + 1)
+        ])
+        # Bulk load without the search index triggers; this benchmark never searches
+        for trigger in ("booking_search_insert", "booking_search_delete", "booking_search_update"):
+            conn.execute(text(f"DROP TRIGGER IF EXISTS {trigger}"))
+        batch = 50_000
+        for start in range(0, rows, batch):
+            conn.execute(insert(models.Booking), [
+                {
+                    "event_id": n % events + 1,
+                    "venue_id": n % events % venues + 1,
+                    "ticket_type_id": n % ticket_types + 1,
+                    "customer_name": f"Customer {n}",
+                    "customer_email": f"customer{n}@example.com",
+                    "quantity": n % 4 + 1,
+                    "total_amount": 10.0 * (n % ticket_types + 1) * (n % 4 + 1),
+                    "status": STATUSES[n % 3],
+                    "booking_code": f"BK-{n:08X}"
+                }
+                for n in range(start, min(start + batch, rows))
+            ])
+    return engine, sessionmaker(bind=engine)
+
+
+def queries(events):
+    event_id, ticket_type_id, venue_id = events // 2, 3, 1
+    held = crud._ticket_totals().where(models.Booking.event_id == event_id)
+    tier_held = select(models.Booking.event_id, func.sum(models.Booking.quantity)).where(
+        models.Booking.ticket_type_id == ticket_type_id,
+        models.Booking.status != models.BookingStatus.CANCELLED
+    ).group_by(models.Booking.event_id)
+    return [
+        ("event bookings", lambda db: crud.get_event_booking_rows(db, event_id)),
+        ("event seat totals", lambda db: db.execute(held).all()),
+        ("ticket type seats per event", lambda db: db.execute(tier_held).all()),
+        ("venue bookings (cascade)", lambda db: db.query(models.Booking.id).filter(models.Booking.venue_id == venue_id).all()),
+    ]
+
+
+def timed(fn, db, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(db)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(rows, events, repeat):
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"🚀 Loading {rows} bookings over {events} events...")
+        engine, Session = setup_database(os.path.join(tmp, "bench.db"), rows, events)
+        results = {}
+        for label in ("without", "with"):
+            with engine.begin() as conn:
+                for index in INDEXES:
+                    if label == "without":
+                        index.drop(conn, checkfirst=True)
+                    else:
+                        index.create(conn, checkfirst=True)
+            db = Session()
+            try:
+                for name, fn in queries(events):
+                    results[name, label] = timed(fn, db, repeat)
+            finally:
+                db.close()
+
+        print(f"\n{'Query':<32}{'no index (ms)':>16}{'indexed (ms)':>16}{'speedup':>10}")
+        for name, _ in queries(events):
+            without, indexed = results[name, "without"], results[name, "with"]
+            print(f"{name:<32}{without * 1000:>16.2f}{indexed * 1000:>16.2f}{without / indexed:>9.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--events", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.rows, args.events, args.repeat)
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+List serialization benchmark for the booking list endpoints.
+Fills a throwaway database with bookings, then fetches GET /api/events/{id}/bookings
+(every booking in one response) and pages through GET /api/bookings/ in-process, once
+through the ORM + BookingResponse validation path and once with FAST_LIST_RESPONSES
+(plain rows encoded by orjson). Reports rows/sec for each and checks both paths return
+the same JSON.
+
+Usage: python benchmarks/bench_list_serialization.py [--rows 20000] [--page-size 1000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# The engines open ./ticket_booking.db, so work from a throwaway directory
+os.chdir(tempfile.mkdtemp())
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import insert
+
+from app import config, models
+from app.database import engine
+from app.api import bookings, events
+
+
+def setup_database(rows):
+    models.Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(models.Venue).values(id=1, name="Bench Hall", address="1 Bench Road", capacity=rows))
+        conn.execute(insert(models.TicketType).values(id=1, name="Standard", price=50.0, description="General admission"))
+        conn.execute(insert(models.Event).values(
+            id=1, name="Bench Night", description="Serialization benchmark",
+            date=datetime.now() + timedelta(days=30), venue_id=1, capacity=rows
+        ))
+        conn.execute(insert(models.Booking), [
+            {
+                "event_id": 1,
+                "venue_id": 1,
+                "ticket_type_id": 1,
+                "customer_name": f"Customer {n}",
+                "customer_email": f"customer{n}@example.com",
+                "quantity": 1,
+                "total_amount": 50.0,
+                "status": models.BookingStatus.CONFIRMED,
+                "booking_code": f"BK-{n:08X}"
+            }
+            for n in range(rows)
+        ])
+
+
+def build_app():
+    app = FastAPI()
+    for module in (events, bookings):
+        app.include_router(module.router)
+    return app
+
+
+def event_bookings(client, page_size):
+    response = client.get("/api/events/1/bookings")
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def paged_bookings(client, page_size):
+    rows, cursor = [], None
+    while True:
+        params = {"limit": page_size, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/api/bookings/", params=params)
+        assert response.status_code == 200, response.text
+        page = response.json()
+        rows.extend(page["bookings"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            return rows
+
+
+def timed(fetch, client, page_size, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = fetch(client, page_size)
+        best = min(best, time.perf_counter() - start)
+    return rows, best
+
+
+def run(rows, page_size, repeat):
+    print(f"🚀 Loading {rows} bookings...")
+    setup_database(rows)
+    client = TestClient(build_app())
+
+    print(f"\n{'Endpoint':<28}{'Path':<10}{'best (ms)':>12}{'rows/s':>12}")
+    for name, fetch in (("/api/events/1/bookings", event_bookings), ("/api/bookings/ (paged)", paged_bookings)):
+        results = {}
+        for mode in ("pydantic", "fast"):
+            config.FAST_LIST_RESPONSES = mode == "fast"
+            results[mode], elapsed = timed(fetch, client, page_size, repeat)
+            print(f"{name:<28}{mode:<10}{elapsed * 1000:>12.1f}{len(results[mode]) / elapsed:>12.0f}")
+        assert results["pydantic"] == results["fast"], "Fast path JSON differs from BookingResponse"
+    print("\n✅ Both paths returned identical JSON")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.rows, args.page_size, args.repeat)
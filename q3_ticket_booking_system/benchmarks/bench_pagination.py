@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Deep pagination benchmark for GET /api/bookings.
+Fills a throwaway database with bookings, then times fetching page 1 and a deep page
+with the old OFFSET query and with the keyset cursor used by crud.get_bookings.
+
+Usage: python benchmarks/bench_pagination.py [--rows 1000000] [--page-size 100] [--page 10000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import joinedload, sessionmaker
+
+from app import crud, models
+from app.pagination import encode_cursor
+
+
+def setup_database(path, rows):
+    engine = create_engine(f"sqlite:///{path}")
+    models.Base.metadata.create_all(bind=engine)
+
+    with engine.begin() as conn:
+        conn.execute(insert(models.Venue).values(id=1, name="Bench Hall", address="1 Bench Road", capacity=rows))
+        conn.execute(insert(models.TicketType).values(id=1, name="Standard", price=50.0))
+        conn.execute(insert(models.Event).values(
+            id=1, name="Bench Night", date=datetime.now() + timedelta(days=30), venue_id=1, capacity=rows
+        ))
+        batch = 50_000
+        for start in range(0, rows, batch):
+            conn.execute(insert(models.Booking), [
+                {
+                    "event_id": 1,
+                    "venue_id": 1,
+                    "ticket_type_id": 1,
+                    "customer_name": f"Customer {n}",
+                    "customer_email": f"customer{n}@example.com",
+                    "quantity": 1,
+                    "total_amount": 50.0,
+                    "status": models.BookingStatus.CONFIRMED,
+                    "booking_code": f"BK-{n:08X}"
+                }
+                for n in range(start, min(start + batch, rows))
+            ])
+    return engine, sessionmaker(bind=engine)
+
+
+def timed(fn, repeat=20):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = fn()
+        best = min(best, time.perf_counter() - start)
+    assert rows, "Page came back empty"
+    return best * 1000
+
+
+def offset_page(db, page, page_size):
+    return db.query(models.Booking).options(
+        joinedload(models.Booking.event),
+        joinedload(models.Booking.venue),
+        joinedload(models.Booking.ticket_type)
+    ).offset((page - 1) * page_size).limit(page_size).all()
+
+
+def cursor_page(db, page, page_size):
+    # Booking ids are dense here, so the cursor for page N is the id ending page N - 1
+    cursor = encode_cursor([(page - 1) * page_size]) if page > 1 else None
+    bookings, _ = crud.get_bookings(db, cursor=cursor, limit=page_size)
+    return bookings
+
+
+def run(rows, page_size, page):
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"🚀 Loading {rows} bookings...")
+        engine, Session = setup_database(os.path.join(tmp, "pagination.db"), rows)
+        db = Session()
+
+        print(f"\n{'Method':<10}{'Page 1 (ms)':>14}{f'Page {page} (ms)':>18}")
+        for name, fetch in (("offset", offset_page), ("cursor", cursor_page)):
+            first = timed(lambda: fetch(db, 1, page_size))
+            deep = timed(lambda: fetch(db, page, page_size))
+            print(f"{name:<10}{first:>14.2f}{deep:>18.2f}")
+
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--page", type=int, default=10_000)
+    args = parser.parse_args()
+    run(args.rows, args.page_size, args.page)
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Booking search benchmark: FTS5 trigram index vs the ILIKE '%term%' scan.
+Fills a throwaway database with bookings spread over many events, venues and customers,
+then times the same searches through crud.search_bookings and crud.search_bookings_ilike.
+
+Usage: python benchmarks/bench_search.py [--rows 1000000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app import crud, models
+
+ADJECTIVES = ["Rock", "Jazz", "Summer", "Midnight", "Grand", "Electric", "Acoustic", "Festival", "Classic", "Indie"]
+NOUNS = ["Concert", "Night", "Sessions", "Gala", "Showcase", "Tour", "Live", "Parade", "Revue", "Weekend"]
+FIRST_NAMES = ["John", "Jane", "Alice", "Bob", "Carlos", "Priya", "Mei", "Olga", "Kwame", "Sven"]
+LAST_NAMES = ["Doe", "Smith", "Brown", "Johnson", "Garcia", "Patel", "Chen", "Ivanova", "Mensah", "Larsen"]
+
+SEARCHES = [
+    ("event name", {"event_name": "Midnight Gala"}),
+    ("venue name", {"venue_name": "Hall 17"}),
+    ("customer, rare", {"q": "zanzibar"}),
+    ("event + status", {"event_name": "Jazz", "status": models.BookingStatus.CONFIRMED}),
+]
+
+
+def setup_database(path, rows):
+    engine = create_engine(f"sqlite:///{path}")
+    models.Base.metadata.create_all(bind=engine)
+    rng = random.Random(42)
+
+    with engine.begin() as conn:
+        conn.execute(insert(models.Venue), [
+            {"id": n, "name": f"Hall {n}", "address": f"{n} Bench Road", "capacity": 100_000} for n in range(1, 51)
+        ])
+        conn.execute(insert(models.TicketType), [
+            {"id": 1, "name": "VIP", "price": 150.0},
+            {"id": 2, "name": "Standard", "price": 75.0},
+            {"id": 3, "name": "Economy", "price": 35.0},
+        ])
+        events = [
+            {
+                "id": n,
+                "name": f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} {n}",
+                "date": datetime.now() + timedelta(days=n),
+                "venue_id": rng.randint(1, 50),
+                "capacity": 100_000
+            }
+            for n in range(1, 501)
+        ]
+        conn.execute(insert(models.Event), events)
+
+        batch = 50_000
+        for start in range(0, rows, batch):
+            chunk = []
+            for n in range(start, min(start + batch, rows)):
+                event = events[rng.randrange(len(events))]
+                first = "Zanzibar" if n % 100_000 == 0 else rng.choice(FIRST_NAMES)
+                last = rng.choice(LAST_NAMES)
+                chunk.append({
+                    "event_id": event["id"],
+                    "venue_id": event["venue_id"],
+                    "ticket_type_id": rng.randint(1, 3),
+                    "customer_name": f"{first} {last}",
+                    "customer_email": f"{first.lower()}.{last.lower()}{n}@example.com",
+                    "quantity": 1,
+                    "total_amount": 75.0,
+                    "status": rng.choice(list(models.BookingStatus)),
+                    "booking_code": f"BK-{n:08X}"
+                })
+            conn.execute(insert(models.Booking), chunk)
+    return engine, sessionmaker(bind=engine)
+
+
+def timed(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, len(results)
+
+
+def run(rows):
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"🚀 Loading {rows} bookings (the search index is filled by triggers)...")
+        start = time.perf_counter()
+        engine, Session = setup_database(os.path.join(tmp, "search.db"), rows)
+        print(f"✅ Loaded in {time.perf_counter() - start:.1f}s")
+        db = Session()
+
+        print(f"\n{'Search':<18}{'ILIKE (ms)':>12}{'FTS5 (ms)':>12}{'Hits':>8}")
+        for name, filters in SEARCHES:
+            ilike_ms, ilike_hits = timed(lambda: crud.search_bookings_ilike(db, **filters))
+            fts_ms, fts_hits = timed(lambda: crud.search_bookings(db, **filters))
+            print(f"{name:<18}{ilike_ms:>12.1f}{fts_ms:>12.1f}{fts_hits:>8}")
+            assert ilike_hits == fts_hits or 100 in (ilike_hits, fts_hits), "Searches disagree on the number of hits"
+
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+    run(args.rows)
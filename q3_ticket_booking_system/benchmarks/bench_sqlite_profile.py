@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Mixed read/write benchmark for the SQLite profiles in app.database.
+Runs booking writers and availability/list readers side by side for a fixed time against
+a throwaway database, once with SQLITE_PROFILE=default (rollback journal) and once with
+SQLITE_PROFILE=performance (WAL + pragmas), and reports throughput and p99 latency.
+
+Usage: python benchmarks/bench_sqlite_profile.py [--seconds 10] [--writers 8] [--readers 32]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import crud, models, schemas
+from app.database import apply_sqlite_pragmas, engine_options, sqlite_pragmas
+
+
+def setup_database(path, profile):
+    url = f"sqlite:///{path}"
+    engine = create_engine(url, **engine_options(url))
+    apply_sqlite_pragmas(engine, sqlite_pragmas(profile))
+    models.Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    db = Session()
+    venue = crud.create_venue(db, schemas.VenueCreate(name="Profile Arena", address="1 Load Street", capacity=1_000_000))
+    ticket_type = crud.create_ticket_type(db, schemas.TicketTypeCreate(name="Standard", price=50.0))
+    event = crud.create_event(db, schemas.EventCreate(
+        name="Profile Night",
+        date=datetime.now() + timedelta(days=30),
+        venue_id=venue.id,
+        capacity=1_000_000
+    ))
+    ids = (event.id, venue.id, ticket_type.id)
+    db.close()
+    return engine, Session, ids
+
+
+def write(Session, ids, n):
+    event_id, venue_id, ticket_type_id = ids
+    db = Session()
+    try:
+        crud.create_booking(db, schemas.BookingCreate(
+            event_id=event_id,
+            venue_id=venue_id,
+            ticket_type_id=ticket_type_id,
+            customer_name=f"Customer {n}",
+            customer_email=f"customer{n}@example.com",
+            quantity=1
+        ))
+    finally:
+        db.close()
+
+
+def read(Session, ids, n):
+    db = Session()
+    try:
+        crud.get_available_tickets(db, ids[0])
+        crud.get_bookings(db, limit=20)
+    finally:
+        db.close()
+
+
+def worker(op, Session, ids, deadline, latencies, errors):
+    n = 0
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            op(Session, ids, f"{threading.get_ident()}-{n}")
+            latencies.append(time.perf_counter() - start)
+        except Exception:
+            errors.append(op.__name__)
+        n += 1
+
+
+def p99(latencies):
+    if not latencies:
+        return float("nan")
+    ordered = sorted(latencies)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000
+
+
+def run(seconds, writers, readers):
+    print(f"🚀 {writers} writers and {readers} readers for {seconds}s per profile\n")
+    print(f"{'Profile':<13}{'writes/s':>10}{'write p99':>11}{'reads/s':>10}{'read p99':>10}{'errors':>8}")
+
+    for profile in ("default", "performance"):
+        with tempfile.TemporaryDirectory() as tmp:
+            engine, Session, ids = setup_database(os.path.join(tmp, "profile.db"), profile)
+            write_latencies, read_latencies, errors = [], [], []
+            deadline = time.perf_counter() + seconds
+            threads = [
+                threading.Thread(target=worker, args=(write, Session, ids, deadline, write_latencies, errors))
+                for _ in range(writers)
+            ] + [
+                threading.Thread(target=worker, args=(read, Session, ids, deadline, read_latencies, errors))
+                for _ in range(readers)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            engine.dispose()
+
+        print(f"{profile:<13}{len(write_latencies) / seconds:>10.0f}{p99(write_latencies):>9.1f}ms"
+              f"{len(read_latencies) / seconds:>10.0f}{p99(read_latencies):>8.1f}ms{len(errors):>8}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=32)
+    args = parser.parse_args()
+    run(args.seconds, args.writers, args.readers)
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+On-sale simulation: thousands of virtual clients trying to book the same event.
+Runs two scenarios in-process through httpx's ASGI transport on a throwaway database:
+
+  stampede      every client checks availability and books at once
+  waiting room  clients join the event's queue, poll their token (sleeping for the
+                estimated wait) and book once admitted at --rate per second
+
+and reports bookings/sec, admitted/sec, booking request p50/p99 latency and the
+end-to-end time clients spent from arrival to a confirmed seat.
+
+Usage: python benchmarks/sim_waiting_room.py [--clients 3000] [--rate 100]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# The engines open ./ticket_booking.db, so work from a throwaway directory
+os.chdir(tempfile.mkdtemp())
+
+import httpx
+from fastapi import FastAPI
+
+from app import models
+from app.database import engine
+from app.api import events, venues, ticket_types, bookings, waiting_room
+
+
+def build_app():
+    app = FastAPI()
+    for module in (events, venues, ticket_types, bookings, waiting_room):
+        app.include_router(module.router)
+    return app
+
+
+async def seed(client, name, capacity):
+    venue = (await client.post("/api/venues/", json={"name": f"{name} Arena", "address": "1 Queue Street", "capacity": capacity})).json()
+    ticket_type = (await client.post("/api/ticket-types/", json={"name": f"{name} Standard", "price": 50.0})).json()
+    event = (await client.post("/api/events/", json={
+        "name": name, "date": "2030-01-01T19:00:00", "venue_id": venue["id"], "capacity": capacity
+    })).json()
+    return {
+        "event_id": event["id"],
+        "venue_id": venue["id"],
+        "ticket_type_id": ticket_type["id"],
+        "customer_name": "Virtual Client",
+        "customer_email": "client@example.com",
+        "quantity": 1
+    }
+
+
+async def book(client, booking, stats, headers=None):
+    await client.get(f"/api/events/{booking['event_id']}/available-tickets")
+    start = time.perf_counter()
+    response = await client.post("/api/bookings/", json=booking, headers=headers)
+    stats["latencies"].append(time.perf_counter() - start)
+    if response.status_code == 201:
+        stats["booked"] += 1
+    else:
+        stats["errors"] += 1
+    return response.status_code == 201
+
+
+async def stampede_client(client, booking, stats, arrived):
+    if await book(client, booking, stats):
+        stats["waits"].append(time.perf_counter() - arrived)
+
+
+async def queued_client(client, booking, stats, arrived):
+    event_id = booking["event_id"]
+    ticket = (await client.post(f"/api/events/{event_id}/waiting-room/tokens")).json()
+    while ticket["status"] == "waiting":
+        await asyncio.sleep(min(max(ticket["estimated_wait_seconds"], 0.2), 5.0))
+        ticket = (await client.get(f"/api/events/{event_id}/waiting-room/tokens/{ticket['token']}")).json()
+        stats["polls"] += 1
+    stats["admitted_at"].append(time.perf_counter())
+    if await book(client, booking, stats, headers={"X-Queue-Token": ticket["token"]}):
+        stats["waits"].append(time.perf_counter() - arrived)
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] if ordered else float("nan")
+
+
+def report(name, stats, elapsed):
+    latencies = stats["latencies"]
+    admitted = stats["admitted_at"]
+    admitted_rate = (len(admitted) / (max(admitted) - min(admitted))) if len(admitted) > 1 and max(admitted) > min(admitted) else float("nan")
+    print(f"{name:<14}{stats['booked'] / elapsed:>11.0f}{admitted_rate:>12.0f}"
+          f"{statistics.median(latencies) * 1000:>10.1f}{percentile(latencies, 0.99) * 1000:>10.1f}"
+          f"{percentile(stats['waits'], 0.5):>9.1f}s{percentile(stats['waits'], 0.99):>8.1f}s"
+          f"{stats['booked']:>8}{stats['errors']:>8}")
+
+
+async def run(clients, rate):
+    models.Base.metadata.create_all(bind=engine)
+    transport = httpx.ASGITransport(app=build_app(), raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://sim", timeout=None) as client:
+        print(f"🚀 {clients} virtual clients per scenario, waiting room admits {rate}/s\n")
+        print(f"{'Scenario':<14}{'booked/s':>11}{'admitted/s':>12}{'p50 (ms)':>10}{'p99 (ms)':>10}"
+              f"{'wait p50':>10}{'p99':>9}{'booked':>8}{'errors':>8}")
+
+        for name in ("stampede", "waiting room"):
+            booking = await seed(client, name.title(), capacity=clients)
+            stats = {"latencies": [], "waits": [], "admitted_at": [], "booked": 0, "errors": 0, "polls": 0}
+            if name == "waiting room":
+                await client.put(f"/api/events/{booking['event_id']}/waiting-room", json={"admit_per_second": rate})
+                simulate = queued_client
+            else:
+                simulate = stampede_client
+
+            start = time.perf_counter()
+            await asyncio.gather(*(simulate(client, booking, stats, start) for _ in range(clients)))
+            report(name, stats, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=3000)
+    parser.add_argument("--rate", type=float, default=100)
+    args = parser.parse_args()
+    asyncio.run(run(args.clients, args.rate))
@@ -0,0 +1,93 @@
+"""
+Shared pytest setup: a throwaway database, the API app built from its routers, a
+TestClient, and factories for the venues, ticket types and events tests book against.
+
+The database URLs are set here, before any test module imports app.database and its
+engines are created. Every test module shares the one database, so factories give
+each row a unique name and tests should only assert on rows they created.
+"""
+
+import itertools
+import os
+import tempfile
+
+_tmp = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp}/test.db"
+os.environ["ASYNC_DATABASE_URL"] = f"sqlite+aiosqlite:///{_tmp}/test.db"
+
+from typing import Any, Callable, Dict, Optional
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app import models
+from app.api import bookings, events, stats, ticket_types, venues, waiting_room
+from app.database import SessionLocal, engine
+
+_names = itertools.count(1)
+
+@pytest.fixture(scope="session")
+def app() -> FastAPI:
+    models.Base.metadata.create_all(bind=engine)
+    app = FastAPI()
+    for module in (events, venues, ticket_types, bookings, stats, waiting_room):
+        app.include_router(module.router)
+    return app
+
+@pytest.fixture(scope="session")
+def client(app: FastAPI) -> TestClient:
+    return TestClient(app)
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+@pytest.fixture
+def make_venue(client: TestClient) -> Callable[..., Dict[str, Any]]:
+    def make_venue(capacity: int = 100) -> Dict[str, Any]:
+        response = client.post("/api/venues/", json={
+            "name": f"Test Hall {next(_names)}", "address": "1 Test Street", "capacity": capacity
+        })
+        assert response.status_code == 201, response.text
+        return response.json()
+    return make_venue
+
+@pytest.fixture
+def make_ticket_type(client: TestClient) -> Callable[..., Dict[str, Any]]:
+    def make_ticket_type(price: float = 20.0) -> Dict[str, Any]:
+        response = client.post("/api/ticket-types/", json={"name": f"Test Ticket {next(_names)}", "price": price})
+        assert response.status_code == 201, response.text
+        return response.json()
+    return make_ticket_type
+
+@pytest.fixture
+def make_event(client: TestClient, make_venue) -> Callable[..., Dict[str, Any]]:
+    def make_event(capacity: int = 10, venue: Optional[Dict[str, Any]] = None,
+                   date: str = "2030-01-01T19:00:00", **fields) -> Dict[str, Any]:
+        venue = venue or make_venue(capacity=capacity)
+        response = client.post("/api/events/", json={
+            "name": f"Test Night {next(_names)}", "date": date, "venue_id": venue["id"], "capacity": capacity, **fields
+        })
+        assert response.status_code == 201, response.text
+        return response.json()
+    return make_event
+
+@pytest.fixture
+def make_booking(make_event, make_ticket_type) -> Callable[..., Dict[str, Any]]:
+    """Booking request bodies; without an event and ticket type, fresh ones are made"""
+    def make_booking(event: Optional[Dict[str, Any]] = None, ticket_type: Optional[Dict[str, Any]] = None,
+                     quantity: int = 1, **fields) -> Dict[str, Any]:
+        event = event or make_event()
+        ticket_type = ticket_type or make_ticket_type()
+        n = next(_names)
+        return {
+            "event_id": event["id"], "venue_id": event["venue_id"], "ticket_type_id": ticket_type["id"],
+            "customer_name": f"Test Customer {n}", "customer_email": f"customer{n}@example.com",
+            "quantity": quantity, **fields
+        }
+    return make_booking
@@ -1,29 +1,59 @@
 from fastapi import FastAPI, Request
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, Response
+import argparse
 import os
+from contextlib import asynccontextmanager
 
-from app.database import engine
-from app import models
-from app.api import events, venues, ticket_types, bookings, stats
+from app.database import engine, async_engine
+from app import availability, config, holds, metrics, migrations, response_cache
+from app.api import events, venues, ticket_types, bookings, stats, waiting_room, events_async, bookings_async
 
-# Create database tables
-models.Base.metadata.create_all(bind=engine)
+# Bring the schema up to date before serving (unless SKIP_SCHEMA_CHECK), then expire
+# unpaid holds and publish live availability in the background for as long as the app runs
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if not config.SKIP_SCHEMA_CHECK:
+        migrations.ensure_schema(engine)
+    holds.sweeper.start()
+    availability.hub.start()
+    yield
+    await availability.hub.stop()
+    await holds.sweeper.stop()
 
 # Create FastAPI app
 app = FastAPI(
+    lifespan=lifespan,
     title="Ticket Booking Management System",
     description="A comprehensive FastAPI application for managing ticket bookings, events, venues, and ticket types",
     version="1.0.0"
 )
 
-# Include API routers
+# Per-route latency, SQL statement count and DB time, served at /metrics
+metrics.instrument_engine(engine)
+metrics.instrument_engine(async_engine.sync_engine)
+# Cached catalog reads are answered before routing; metrics wraps it so hits are measured too
+app.add_middleware(response_cache.ResponseCacheMiddleware)
+app.add_middleware(metrics.MetricsMiddleware, debug_headers=config.METRICS_DEBUG_HEADERS)
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Request and database metrics in Prometheus text format"""
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+# Include API routers. Async routers go first so their routes win; whatever they do
+# not cover keeps being served by the sync routers.
+if config.DB_MODE == "async":
+    app.include_router(events_async.router)
+    app.include_router(bookings_async.router)
+
 app.include_router(events.router)
 app.include_router(venues.router)
 app.include_router(ticket_types.router)
 app.include_router(bookings.router)
 app.include_router(stats.router)
+app.include_router(waiting_room.router)
 
 # Mount static files
 app.mount("/static", StaticFiles(directory="static"), name="static")
@@ -69,4 +99,9 @@ async def calendar_page(request: Request):
 
 if __name__ == "__main__":
     import uvicorn
+    parser = argparse.ArgumentParser(description="Run the ticket booking API")
+    parser.add_argument("--skip-schema-check", action="store_true",
+                        help="Start without checking or migrating the schema (same as SKIP_SCHEMA_CHECK=1)")
+    if parser.parse_args().skip_schema_check:
+        config.SKIP_SCHEMA_CHECK = True
     uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Maintenance commands for the Ticket Booking Management System.
+
+Usage:
+    python manage.py inventory verify    # Compare inventory counters with the bookings table
+    python manage.py inventory rebuild   # Recompute inventory counters from the bookings table
+    python manage.py search rebuild      # Repopulate the booking full-text search index
+    python manage.py revenue verify      # Compare the daily revenue rollups with the bookings table
+    python manage.py revenue rebuild     # Backfill the daily revenue rollups from the bookings table
+    python manage.py changes prune --days 30  # Delete booking change log entries older than 30 days
+    python manage.py indexes advise      # Flag crud queries whose query plan scans a whole table
+    python manage.py db upgrade          # Apply pending schema migrations
+    python manage.py db current          # Show the database's schema revision and the latest one
+"""
+
+import argparse
+import sys
+from datetime import datetime, timedelta
+
+from app.database import SessionLocal, engine
+from app import crud, index_advisor, migrations
+
+
+def inventory(args):
+    migrations.ensure_schema(engine)
+    db = SessionLocal()
+    try:
+        if args.action == "rebuild":
+            crud.rebuild_inventory(db)
+            print("✅ Inventory rebuilt from bookings")
+
+        mismatches = crud.verify_inventory(db)
+        for mismatch in mismatches:
+            print(f"❌ Event {mismatch['event_id']} / ticket type {mismatch['ticket_type_id']}: "
+                  f"expected {mismatch['expected']}, stored {mismatch['stored']}")
+        if mismatches:
+            return 1
+        print("✅ Inventory matches bookings")
+        return 0
+    finally:
+        db.close()
+
+
+def search(args):
+    migrations.ensure_schema(engine)
+    db = SessionLocal()
+    try:
+        indexed = crud.rebuild_search_index(db)
+        print(f"✅ Indexed {indexed} bookings for search")
+        return 0
+    finally:
+        db.close()
+
+
+def revenue(args):
+    migrations.ensure_schema(engine)
+    db = SessionLocal()
+    try:
+        if args.action == "rebuild":
+            rows = crud.rebuild_revenue_rollups(db)
+            print(f"✅ Rebuilt {rows} daily revenue rollups from bookings")
+
+        mismatches = crud.verify_revenue_rollups(db)
+        for mismatch in mismatches:
+            print(f"❌ {mismatch['day']} event {mismatch['event_id']} / venue {mismatch['venue_id']} / "
+                  f"ticket type {mismatch['ticket_type_id']}: expected {mismatch['expected']}, stored {mismatch['stored']}")
+        if mismatches:
+            return 1
+        print("✅ Revenue rollups match bookings")
+        return 0
+    finally:
+        db.close()
+
+
+def changes(args):
+    migrations.ensure_schema(engine)
+    db = SessionLocal()
+    try:
+        # changed_at is stored in UTC (CURRENT_TIMESTAMP)
+        deleted = crud.prune_booking_changes(db, datetime.utcnow() - timedelta(days=args.days))
+        print(f"✅ Deleted {deleted} booking changes older than {args.days} days")
+        return 0
+    finally:
+        db.close()
+
+
+def indexes(args):
+    report = index_advisor.run()
+    for finding in report.findings:
+        marker = "ℹ️ " if finding.expected else "❌"
+        print(f"{marker} {finding.step}: full scan of {finding.table}" + (" (expected)" if finding.expected else ""))
+        if args.verbose or not finding.expected:
+            print(f"     {' '.join(finding.statement.split())}")
+            for step in finding.plan:
+                print(f"       {step}")
+    if report.unexpected:
+        print(f"❌ {len(report.unexpected)} unexpected full scans in {report.statements} statements")
+        return 1
+    print(f"✅ No unexpected full scans in {report.statements} statements")
+    return 0
+
+
+def db(args):
+    if args.action == "upgrade":
+        before = migrations.current_revision(engine)
+        migrations.upgrade(engine)
+        print(f"✅ Schema upgraded from {before or 'unversioned'} to {migrations.current_revision(engine)}")
+        return 0
+
+    current, head = migrations.current_revision(engine), migrations.head_revision()
+    print(f"Database revision: {current or 'unversioned'}")
+    print(f"Latest revision:   {head}")
+    if current != head:
+        print("❌ Schema is behind; run python manage.py db upgrade")
+        return 1
+    print("✅ Schema is up to date")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ticket booking maintenance commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    inventory_parser = commands.add_parser("inventory", help="Verify or rebuild the inventory tables")
+    inventory_parser.add_argument("action", choices=["verify", "rebuild"])
+    inventory_parser.set_defaults(func=inventory)
+
+    search_parser = commands.add_parser("search", help="Rebuild the booking search index")
+    search_parser.add_argument("action", choices=["rebuild"])
+    search_parser.set_defaults(func=search)
+
+    revenue_parser = commands.add_parser("revenue", help="Verify or rebuild the daily revenue rollups")
+    revenue_parser.add_argument("action", choices=["verify", "rebuild"])
+    revenue_parser.set_defaults(func=revenue)
+
+    changes_parser = commands.add_parser("changes", help="Prune the booking change log")
+    changes_parser.add_argument("action", choices=["prune"])
+    changes_parser.add_argument("--days", type=int, default=30, help="Keep this many days of changes (default 30)")
+    changes_parser.set_defaults(func=changes)
+
+    indexes_parser = commands.add_parser("indexes", help="Explain the crud queries and flag full table scans")
+    indexes_parser.add_argument("action", choices=["advise"])
+    indexes_parser.add_argument("--verbose", action="store_true", help="Also print the plans of expected scans")
+    indexes_parser.set_defaults(func=indexes)
+
+    db_parser = commands.add_parser("db", help="Apply or inspect schema migrations")
+    db_parser.add_argument("action", choices=["upgrade", "current"])
+    db_parser.set_defaults(func=db)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+"""
+Live availability test.
+Subscribes to an event's availability stream in-process and checks that writes which
+change availability reach subscribers, and that open streams hold no database connection.
+"""
+
+import asyncio
+import json
+
+from app import availability
+from app.database import engine
+
+def _tier(chunk: str, ticket_type_id: int):
+    assert chunk.startswith("data: "), chunk
+    tiers = json.loads(chunk[len("data: "):])["ticket_types_available"]
+    return next(tier for tier in tiers if tier["ticket_type_id"] == ticket_type_id)
+
+def test_allotment_change_reaches_subscribers(client, make_event, make_ticket_type, make_booking):
+    event = make_event(capacity=20)
+    ticket_type = make_ticket_type(price=15.0)
+    client.post("/api/bookings/", json=make_booking(event=event, ticket_type=ticket_type, quantity=2))
+
+    async def scenario():
+        stream = availability.hub.stream(event["id"])
+        try:
+            tier = _tier(await stream.__anext__(), ticket_type["id"])
+            assert tier["allotment"] is None
+
+            # Publish whatever the setup writes changed, so only the allotment change is left
+            await availability.hub.refresh()
+            response = client.put(f"/api/events/{event['id']}/allotments", json={
+                "allotments": [{"ticket_type_id": ticket_type["id"], "quantity": 5}]
+            })
+            assert response.status_code == 200, response.text
+            await availability.hub.refresh()
+
+            tier = _tier(await asyncio.wait_for(stream.__anext__(), 1), ticket_type["id"])
+            assert tier["allotment"] == 5
+            assert tier["available"] == 3
+        finally:
+            await stream.aclose()
+
+    asyncio.run(scenario())
+
+def test_open_streams_hold_no_connection(app, make_event):
+    event = make_event()
+    path = f"/api/events/{event['id']}/availability/stream"
+
+    async def scenario():
+        # Drive the ASGI app by hand: TestClient would wait for the endless body
+        disconnect = asyncio.Event()
+        received = asyncio.Queue()
+
+        async def receive():
+            # Nothing reads a GET's body; the response waits here for the client to leave
+            await disconnect.wait()
+            return {"type": "http.disconnect"}
+
+        async def open_stream():
+            scope = {
+                "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+                "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"",
+                "headers": [(b"host", b"testserver")], "client": ("test", 1), "server": ("testserver", 80)
+            }
+            await app(scope, receive, received.put)
+
+        tasks = [asyncio.create_task(open_stream()) for _ in range(5)]
+        try:
+            for _ in tasks:
+                while True:
+                    message = await asyncio.wait_for(received.get(), 5)
+                    if message["type"] == "http.response.start":
+                        assert message["status"] == 200
+                    elif message.get("body", b"").startswith(b"data: "):
+                        break
+            assert engine.pool.checkedout() == 0
+        finally:
+            disconnect.set()
+            await asyncio.wait_for(asyncio.gather(*tasks, return_exceptions=True), 5)
+
+    asyncio.run(scenario())
+    assert engine.pool.checkedout() == 0
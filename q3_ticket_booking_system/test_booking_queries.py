@@ -0,0 +1,76 @@
+"""
+Booking query tests.
+Runs POST /api/bookings/ in-process against the test database and counts the SQL
+statements it issues, so extra lookups or refreshes cannot creep back in unnoticed, and
+checks that the full-text booking search finds the same bookings as the ILIKE search.
+"""
+
+from sqlalchemy import event
+
+from app import crud, models
+from app.database import engine
+
+# SELECT event+venue+ticket type, UPDATE event_inventory, UPDATE ticket_inventory, INSERT ... RETURNING,
+# INSERT booking_changes
+BOOKING_QUERY_BUDGET = 5
+
+class QueryCounter:
+    def __init__(self):
+        self.statements = []
+
+    def __enter__(self):
+        event.listen(engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(engine, "before_cursor_execute", self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+def test_create_booking_query_budget(client, make_ticket_type, make_booking):
+    booking = make_booking(ticket_type=make_ticket_type(price=25.0), quantity=2)
+    # The first booking of a ticket type at an event creates its inventory row; measure the steady state
+    client.post("/api/bookings/", json=booking)
+
+    with QueryCounter() as counter:
+        response = client.post("/api/bookings/", json=booking)
+
+    assert response.status_code == 201, response.text
+    data = response.json()
+    assert data["total_amount"] == 50.0
+    assert data["created_at"] is not None
+    assert data["event"]["venue"]["id"] == booking["venue_id"]
+    assert data["ticket_type"]["id"] == booking["ticket_type_id"]
+    assert len(counter.statements) <= BOOKING_QUERY_BUDGET, "\n\n".join(counter.statements)
+
+def test_create_booking_errors_keep_status_codes(client, make_event, make_booking):
+    booking = make_booking(event=make_event(capacity=1), quantity=2)
+    assert client.post("/api/bookings/", json={**booking, "event_id": 10_000}).status_code == 404
+    assert client.post("/api/bookings/", json={**booking, "venue_id": 10_000}).status_code == 404
+    assert client.post("/api/bookings/", json={**booking, "ticket_type_id": 10_000}).status_code == 404
+    assert client.post("/api/bookings/", json={**booking, "quantity": 5}).status_code == 400
+
+def test_search_matches_ilike(client, db, make_venue, make_event, make_ticket_type, make_booking):
+    event = make_event(capacity=20, venue=make_venue())
+    vip, standard = make_ticket_type(), make_ticket_type()
+    for name, ticket_type in (("Zelda Quux", vip), ("zed quxley", standard), ("Al Qu", vip), ("Quinn O'Hara", standard)):
+        booking = client.post("/api/bookings/", json=make_booking(event=event, ticket_type=ticket_type,
+                                                                  customer_name=name)).json()
+    client.patch(f"/api/bookings/{booking['id']}/status", json={"status": "confirmed"})
+    # Renaming the event reindexes its bookings
+    assert client.put(f"/api/events/{event['id']}", json={"name": f"Quuxcon {event['id']}"}).status_code == 200
+
+    searches = [
+        {"q": "quux"}, {"q": "QUUX zelda"}, {"q": "zed qux"}, {"q": "o'hara"}, {"q": "Quuxcon"},
+        {"q": f"Quuxcon {event['id']}", "ticket_type": standard["name"]},
+        {"q": "quinn", "status": models.BookingStatus.CONFIRMED}, {"q": "zelda", "status": models.BookingStatus.PENDING},
+        {"event_name": "uuxcon", "venue_name": "Test Hall"}, {"ticket_type": vip["name"]},
+        # Shorter than a trigram: answered by the ILIKE search, so still found
+        {"q": "Al Qu"}, {"q": "qu"}, {"event_name": "Qu", "q": "Zelda"},
+    ]
+    for search in searches:
+        found = {booking.id for booking in crud.search_bookings(db, **search, limit=10_000)}
+        assert found == {booking.id for booking in crud.search_bookings_ilike(db, **search, limit=10_000)}, search
+        assert found, search
+    assert crud.search_bookings(db, q="no such customer") == []
@@ -0,0 +1,228 @@
+"""
+Booking write tests.
+Fires concurrent POST /api/bookings/ requests at one event in-process and checks that
+its capacity is never exceeded and the inventory counters agree with the bookings, that
+bulk imports commit the rows that fit while reporting the rest, that expired holds give
+their seats back, that the revenue rollups follow confirms, cancels, edits and deletes, that
+deletes invalidate the stats snapshot, and that the change feed hands out every write once,
+in order, with no gaps, and that pruning it cuts at the right seq.
+"""
+
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, insert, update
+from sqlalchemy.orm import Session
+
+from app import cache, crud, holds, models
+
+def test_concurrent_bookings_never_exceed_capacity(client, db, make_event, make_booking):
+    event = make_event(capacity=10)
+    booking = make_booking(event=event, quantity=3)
+
+    def book(n: int) -> int:
+        return client.post("/api/bookings/", json={**booking, "customer_email": f"rush{n}@example.com"}).status_code
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        statuses = list(pool.map(book, range(40)))
+
+    # 3 bookings of 3 fit in 10 seats; every other request is turned away as sold out
+    assert statuses.count(201) == 3, statuses
+    assert statuses.count(400) == 37, statuses
+    available = client.get(f"/api/events/{event['id']}/available-tickets").json()
+    assert available["booked_tickets"] == 9
+    assert available["available_tickets"] == 1
+    assert crud.verify_inventory(db) == []
+
+def _tiers(client, event_id: int):
+    available = client.get(f"/api/events/{event_id}/available-tickets").json()
+    return available, {tier["ticket_type_id"]: tier for tier in available["ticket_types_available"]}
+
+def test_bulk_commits_the_rows_that_fit(client, db, make_event, make_ticket_type, make_booking):
+    allotted, open_tier = make_ticket_type(), make_ticket_type()
+    event = make_event(capacity=10, allotments=[{"ticket_type_id": allotted["id"], "quantity": 3}])
+    rows = [
+        make_booking(event=event, ticket_type=allotted, quantity=2),
+        {**make_booking(event=event, ticket_type=open_tier), "event_id": 10_000_000},
+        make_booking(event=event, ticket_type=allotted, quantity=2),   # over the allotment: 1 left
+        make_booking(event=event, ticket_type=open_tier, quantity=5),
+        make_booking(event=event, ticket_type=open_tier, quantity=4),  # sold out: 3 left
+        make_booking(event=event, ticket_type=open_tier, quantity=0),  # fails validation
+        make_booking(event=event, ticket_type=open_tier, quantity=3),
+    ]
+
+    response = client.post("/api/bookings/bulk", json=rows)
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert [result["status"] for result in body["results"]] == [
+        "created", "failed", "failed", "created", "failed", "failed", "created"
+    ]
+    assert (body["created"], body["failed"]) == (3, 4)
+    assert body["results"][1]["error"] == "Event not found"
+    assert "Only 1 tickets left" in body["results"][2]["error"]
+    assert "Only 3 tickets left" in body["results"][4]["error"]
+
+    available, tiers = _tiers(client, event["id"])
+    assert available["booked_tickets"] == 10
+    assert tiers[allotted["id"]]["booked"] == 2
+    assert tiers[open_tier["id"]]["booked"] == 8
+    assert crud.verify_inventory(db) == []
+
+def test_bulk_accepts_ndjson(client, db, make_event, make_booking):
+    event = make_event(capacity=5)
+    rows = [make_booking(event=event, quantity=2) for _ in range(3)]
+    body = "\n".join(json.dumps(row) for row in rows) + "\n\n"
+
+    response = client.post("/api/bookings/bulk", content=body, headers={"Content-Type": "application/x-ndjson"})
+    assert response.status_code == 200, response.text
+    assert [result["status"] for result in response.json()["results"]] == ["created", "created", "failed"]
+    assert _tiers(client, event["id"])[0]["booked_tickets"] == 4
+    assert crud.verify_inventory(db) == []
+
+def _age(db, booking_id: int, seconds: float) -> None:
+    # created_at is stored in UTC; moving it back is the clock moving forward for this hold
+    db.execute(update(models.Booking).where(models.Booking.id == booking_id).values(
+        created_at=datetime.utcnow() - timedelta(seconds=seconds)
+    ))
+    db.commit()
+
+def test_expired_holds_release_their_seats(client, db, make_event, make_ticket_type, make_booking):
+    ticket_type = make_ticket_type()
+    event = make_event(capacity=10, allotments=[{"ticket_type_id": ticket_type["id"], "quantity": 6}])
+    hold = client.post("/api/bookings/", json=make_booking(event=event, ticket_type=ticket_type, quantity=4)).json()
+    paid = client.post("/api/bookings/", json=make_booking(event=event, ticket_type=ticket_type, quantity=2)).json()
+    client.patch(f"/api/bookings/{paid['id']}/status", json={"status": "confirmed"})
+    fresh = client.post("/api/bookings/", json=make_booking(event=event, quantity=1)).json()
+
+    sweeper = holds.HoldSweeper(ttl=900, interval=30, batch_size=500)
+    _age(db, hold["id"], 901)
+    _age(db, paid["id"], 901)
+    assert sweeper.sweep() == 1
+
+    assert client.get(f"/api/bookings/{hold['id']}").json()["status"] == "cancelled"
+    assert client.get(f"/api/bookings/{paid['id']}").json()["status"] == "confirmed"
+    assert client.get(f"/api/bookings/{fresh['id']}").json()["status"] == "pending"
+    available, tiers = _tiers(client, event["id"])
+    assert available["booked_tickets"] == 3
+    assert tiers[ticket_type["id"]]["booked"] == 2
+    assert tiers[ticket_type["id"]]["available"] == 4
+    assert crud.get_reserved_tickets(db, event["id"]) == 3
+    assert crud.verify_inventory(db) == []
+    assert sweeper.metrics()["seats_released"] == 4
+
+def test_holds_never_expire_by_default(client, db, make_booking):
+    hold = client.post("/api/bookings/", json=make_booking(quantity=2)).json()
+    _age(db, hold["id"], 365 * 24 * 3600)
+
+    assert holds.sweeper.ttl == 0
+
+    async def start_and_stop():
+        holds.sweeper.start()
+        running = holds.sweeper.metrics()["running"]
+        await holds.sweeper.stop()
+        return running
+
+    assert not asyncio.run(start_and_stop())
+    assert holds.sweeper.sweep() == 0
+    assert client.get(f"/api/bookings/{hold['id']}").json()["status"] == "pending"
+    # Leave no stale hold behind for sweeps in other tests
+    client.patch(f"/api/bookings/{hold['id']}/status", json={"status": "cancelled"})
+
+def test_revenue_rollups_follow_status_changes_and_deletes(client, db, make_event, make_ticket_type, make_booking):
+    event, ticket_type = make_event(capacity=20), make_ticket_type(price=10.0)
+    cancelled, deleted, kept = (
+        client.post("/api/bookings/", json=make_booking(event=event, ticket_type=ticket_type, quantity=quantity)).json()
+        for quantity in (1, 2, 3)
+    )
+    for booking in (cancelled, deleted, kept):
+        client.patch(f"/api/bookings/{booking['id']}/status", json={"status": "confirmed"})
+    assert client.get(f"/api/events/{event['id']}/revenue/daily").json()["total_revenue"] == 60.0
+
+    client.patch(f"/api/bookings/{cancelled['id']}/status", json={"status": "cancelled"})
+    assert client.delete(f"/api/bookings/{deleted['id']}").status_code == 204
+    assert client.put(f"/api/bookings/{kept['id']}", json={"quantity": 4}).status_code == 200
+
+    series = client.get(f"/api/events/{event['id']}/revenue/daily").json()
+    assert (series["total_revenue"], series["total_bookings"]) == (40.0, 1)
+    assert crud.verify_revenue_rollups(db) == []
+
+def test_deletes_invalidate_the_stats_snapshot(client, make_venue, make_event, make_ticket_type, make_booking):
+    venue = make_venue()
+    venue_event, other_event, ticket_type = make_event(venue=venue), make_event(), make_ticket_type()
+    booking = client.post("/api/bookings/", json=make_booking(event=other_event)).json()
+    for body in (make_booking(event=other_event, ticket_type=ticket_type), make_booking(event=venue_event)):
+        assert client.post("/api/bookings/", json=body).status_code == 201
+
+    def totals():
+        stats = client.get("/api/booking-system/stats").json()
+        return stats["total_bookings"], stats["total_events"], stats["total_venues"]
+
+    # Each delete is read back well within the snapshot's max age, so only invalidation shows it
+    assert cache.stats_snapshot.max_age >= 5
+    bookings, events, venues = totals()
+    assert client.delete(f"/api/bookings/{booking['id']}").status_code == 204
+    assert totals() == (bookings - 1, events, venues)
+    assert client.delete(f"/api/ticket-types/{ticket_type['id']}").status_code == 204
+    assert totals() == (bookings - 2, events, venues)
+    assert client.delete(f"/api/events/{other_event['id']}").status_code == 204
+    assert totals() == (bookings - 2, events - 1, venues)
+    assert client.delete(f"/api/venues/{venue['id']}").status_code == 204
+    assert totals() == (bookings - 3, events - 2, venues - 1)
+
+def test_change_feed_is_gapless_and_monotonic(client, db, make_event, make_booking):
+    booking = make_booking(event=make_event(capacity=50))
+    start = crud.get_last_booking_change_seq(db)
+
+    def book(n: int) -> int:
+        return client.post("/api/bookings/", json={**booking, "customer_email": f"feed{n}@example.com"}).json()["id"]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        booking_ids = list(pool.map(book, range(12)))
+    client.patch(f"/api/bookings/{booking_ids[0]}/status", json={"status": "confirmed"})
+    client.delete(f"/api/bookings/{booking_ids[1]}")
+
+    seqs, operations, since = [], [], start
+    while True:
+        page = client.get("/api/bookings/changes", params={"since": since, "limit": 5}).json()
+        if not page["changes"]:
+            assert page["next_since"] == since
+            break
+        assert page["next_since"] == page["changes"][-1]["seq"] > since
+        seqs.extend(change["seq"] for change in page["changes"])
+        operations.extend((change["operation"], change["booking_id"]) for change in page["changes"])
+        since = page["next_since"]
+
+    assert seqs == list(range(start + 1, start + 15))
+    assert sorted(operations[:12]) == sorted(("created", booking_id) for booking_id in booking_ids)
+    assert operations[12][1] == booking_ids[0]
+    assert operations[13][1] == booking_ids[1]
+
+def test_prune_cuts_the_change_log_at_the_cutoff(tmp_path):
+    # A database of its own, so every timestamp in the log is one this test wrote
+    engine = create_engine(f"sqlite:///{tmp_path / 'changes.db'}")
+    models.Base.metadata.create_all(bind=engine)
+    start = datetime(2030, 1, 1)
+    db = Session(engine)
+    try:
+        assert crud.prune_booking_changes(db, start) == 0
+        # Three changes a minute for an hour, so equal timestamps straddle some cut-offs
+        db.execute(insert(models.BookingChange), [
+            {"operation": "created", "booking_id": n, "event_id": 1, "ticket_type_id": 1, "quantity": 1,
+             "total_amount": 1.0, "changed_at": start + timedelta(minutes=n // 3)}
+            for n in range(180)
+        ])
+        db.commit()
+
+        remaining = 180
+        for minutes in (-5, 0, 7, 7, 31, 59, 90):
+            cutoff = start + timedelta(minutes=minutes)
+            expected = remaining - db.query(models.BookingChange).filter(models.BookingChange.changed_at >= cutoff).count()
+            assert crud.prune_booking_changes(db, cutoff) == expected, minutes
+            remaining -= expected
+            oldest = db.query(models.BookingChange).order_by(models.BookingChange.seq).first()
+            assert oldest is None or oldest.changed_at >= cutoff
+        assert remaining == 0
+    finally:
+        db.close()
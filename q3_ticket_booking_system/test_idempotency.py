@@ -0,0 +1,58 @@
+"""
+Idempotency-Key tests for POST /api/bookings/.
+Checks that a retry replays the first response without booking again, that a key whose
+first request is still running gets 409, that a key reused with another body gets 422,
+and that each outcome is counted in /metrics.
+"""
+
+import uuid
+
+from app import idempotency, metrics, schemas
+
+def _booked(client, event_id: int) -> int:
+    return client.get(f"/api/events/{event_id}/available-tickets").json()["booked_tickets"]
+
+def _outcome_count(outcome: str) -> int:
+    line = f'booking_idempotency_requests_total{{outcome="{outcome}"}} '
+    return next(int(row[len(line):]) for row in metrics.render().splitlines() if row.startswith(line))
+
+def test_retry_replays_first_response(client, make_booking):
+    payload = make_booking(quantity=2)
+    key = {"Idempotency-Key": str(uuid.uuid4())}
+    hits = _outcome_count("table_hit") + _outcome_count("memory_hit")
+
+    first = client.post("/api/bookings/", json=payload, headers=key)
+    assert first.status_code == 201, first.text
+    assert "Idempotent-Replayed" not in first.headers
+
+    retry = client.post("/api/bookings/", json=payload, headers=key)
+    assert retry.status_code == 201
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.json() == first.json()
+    assert _booked(client, payload["event_id"]) == 2
+    assert _outcome_count("table_hit") + _outcome_count("memory_hit") == hits + 1
+
+def test_key_still_in_progress_is_409(client, db, make_booking):
+    payload = make_booking(quantity=2)
+    key = str(uuid.uuid4())
+    in_progress = _outcome_count("in_progress")
+
+    # The first request has reserved the key but not stored its response yet
+    fingerprint = idempotency.fingerprint(schemas.BookingCreate(**payload))
+    assert idempotency.store.begin(db, key, fingerprint) is None
+
+    response = client.post("/api/bookings/", json=payload, headers={"Idempotency-Key": key})
+    assert response.status_code == 409, response.text
+    assert _booked(client, payload["event_id"]) == 0
+    assert _outcome_count("in_progress") == in_progress + 1
+
+def test_key_reused_with_another_body_is_422(client, make_booking):
+    payload = make_booking(quantity=2)
+    key = {"Idempotency-Key": str(uuid.uuid4())}
+    mismatches = _outcome_count("mismatch")
+
+    assert client.post("/api/bookings/", json=payload, headers=key).status_code == 201
+    response = client.post("/api/bookings/", json={**payload, "quantity": 3}, headers=key)
+    assert response.status_code == 422, response.text
+    assert _booked(client, payload["event_id"]) == 2
+    assert _outcome_count("mismatch") == mismatches + 1
@@ -0,0 +1,85 @@
+"""
+Schema migration test.
+Upgrades throwaway databases through alembic/versions and checks the result matches the
+models, so a model change without a migration (or a migration without the model change)
+fails here. Every test makes its own databases, apart from the one conftest.py sets up.
+"""
+
+import sqlite3
+from datetime import datetime
+
+from alembic.autogenerate import compare_metadata
+from alembic.runtime.migration import MigrationContext
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from app import crud, migrations, models
+
+def _engine(tmp_path, name):
+    return create_engine(f"sqlite:///{tmp_path / name}")
+
+def _schema_diff(engine):
+    with engine.connect() as conn:
+        context = MigrationContext.configure(conn, opts={"include_name": migrations.include_name})
+        return compare_metadata(context, models.Base.metadata)
+
+def _sqlite_objects(engine):
+    conn = sqlite3.connect(engine.url.database)
+    try:
+        return set(conn.execute(
+            "SELECT type, name FROM sqlite_master WHERE name NOT LIKE 'sqlite_%' AND name != 'alembic_version'"
+        ))
+    finally:
+        conn.close()
+
+def test_migrations_match_models(tmp_path):
+    migrated, created = _engine(tmp_path, "migrated.db"), _engine(tmp_path, "created.db")
+    assert migrations.ensure_schema(migrated)
+    assert migrations.current_revision(migrated) == migrations.head_revision()
+    assert not migrations.ensure_schema(migrated), "an up-to-date database must not be migrated again"
+
+    assert _schema_diff(migrated) == []
+    # Indexes, the search table and its triggers are outside what autogenerate compares
+    models.Base.metadata.create_all(bind=created)
+    assert _sqlite_objects(migrated) == _sqlite_objects(created)
+
+def test_unversioned_database_is_adopted(tmp_path):
+    # A database from before migrations: create_all'd tables with data, no alembic_version
+    engine = _engine(tmp_path, "legacy.db")
+    models.Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(models.Venue).values(id=1, name="Legacy Hall", address="1 Old Road", capacity=10))
+    assert migrations.current_revision(engine) is None
+
+    assert migrations.ensure_schema(engine)
+    assert migrations.current_revision(engine) == migrations.head_revision()
+    assert _schema_diff(engine) == []
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("SELECT name FROM venues").scalar() == "Legacy Hall"
+
+def test_adopted_database_counters_match_bookings(tmp_path):
+    # The oldest databases: only the catalog and bookings tables, with bookings in every state
+    engine = _engine(tmp_path, "original.db")
+    models.Base.metadata.create_all(bind=engine, tables=[
+        models.Venue.__table__, models.TicketType.__table__, models.Event.__table__, models.Booking.__table__
+    ])
+    with engine.begin() as conn:
+        conn.execute(insert(models.Venue).values(id=1, name="Old Hall", address="1 Old Road", capacity=100))
+        conn.execute(insert(models.TicketType).values(id=1, name="Old Standard", price=10.0))
+        conn.execute(insert(models.Event).values(id=1, name="Old Night", date=datetime(2030, 1, 1), venue_id=1, capacity=100))
+        conn.execute(insert(models.Event).values(id=2, name="Empty Night", date=datetime(2030, 1, 2), venue_id=1, capacity=100))
+        for code, status, quantity in (("BK-1", "PENDING", 3), ("BK-2", "CONFIRMED", 2), ("BK-3", "CANCELLED", 5)):
+            conn.execute(insert(models.Booking).values(
+                event_id=1, venue_id=1, ticket_type_id=1, customer_name="Old", customer_email="old@example.com",
+                quantity=quantity, total_amount=quantity * 10.0, status=status, booking_code=code
+            ))
+
+    assert migrations.ensure_schema(engine)
+    db = Session(engine)
+    try:
+        assert crud.verify_inventory(db) == []
+        assert crud.verify_revenue_rollups(db) == []
+        assert crud.get_reserved_tickets(db, 1) == 5
+        assert db.query(models.EventInventory).count() == 2, "every existing event gets its counters"
+    finally:
+        db.close()
@@ -0,0 +1,59 @@
+"""
+HTTP response cache tests.
+Serves catalog GETs through ResponseCacheMiddleware and checks that a write to a table a
+cached response was built from invalidates it, that a matching If-None-Match is a 304,
+and that entries expire after their max age even when no local write invalidated them.
+"""
+
+import time
+
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+
+from app import models, response_cache
+
+def _cached_client(app, max_age: float = 0):
+    responses = response_cache.ResponseCache(1 << 20, max_age)
+    return TestClient(response_cache.ResponseCacheMiddleware(app, cache=responses)), responses
+
+def test_write_invalidates_cached_response(app, client, make_venue):
+    venue = make_venue()
+    cached, responses = _cached_client(app)
+    path = f"/api/venues/{venue['id']}"
+
+    assert cached.get(path).json()["name"] == venue["name"]
+    assert cached.get(path).json()["name"] == venue["name"]
+    assert responses.stats()["hits"] == 1
+
+    assert client.put(path, json={"name": "Renamed Hall"}).status_code == 200
+    assert cached.get(path).json()["name"] == "Renamed Hall"
+    assert responses.stats()["hits"] == 1
+
+def test_matching_etag_is_304(app, make_venue):
+    cached, _ = _cached_client(app)
+    path = f"/api/venues/{make_venue()['id']}"
+
+    first = cached.get(path)
+    etag = first.headers["etag"]
+    assert first.headers["cache-control"] == "no-cache"
+
+    revalidated = cached.get(path, headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert revalidated.headers["etag"] == etag
+    assert cached.get(path, headers={"If-None-Match": '"stale"'}).status_code == 200
+
+def test_entries_expire_after_max_age(app, db, make_venue):
+    venue = make_venue()
+    cached, responses = _cached_client(app, max_age=0.2)
+    path = f"/api/venues/{venue['id']}"
+    assert cached.get(path).json()["name"] == venue["name"]
+
+    # A write made by another worker: the database changes, this process's versions do not
+    db.execute(update(models.Venue).where(models.Venue.id == venue["id"]).values(name="Elsewhere Hall"))
+    db.commit()
+    assert cached.get(path).json()["name"] == venue["name"]
+
+    time.sleep(0.25)
+    assert cached.get(path).json()["name"] == "Elsewhere Hall"
+    assert responses.stats()["expirations"] == 1
@@ -0,0 +1,48 @@
+"""
+Waiting room tests.
+Checks that bookings for an event behind a waiting room need an admitted X-Queue-Token,
+that a quiet room admits newcomers at once, and that a token whose booking failed can
+be used again.
+"""
+
+import pytest
+
+@pytest.fixture
+def room_event(client, make_event):
+    event = make_event(capacity=5)
+    # One admission a minute: the first joiner gets the opening burst, the rest wait
+    response = client.put(f"/api/events/{event['id']}/waiting-room", json={"admit_per_second": 1 / 60})
+    assert response.status_code == 200, response.text
+    yield event
+    client.delete(f"/api/events/{event['id']}/waiting-room")
+
+def _join(client, event_id: int):
+    response = client.post(f"/api/events/{event_id}/waiting-room/tokens")
+    assert response.status_code == 201, response.text
+    return response.json()
+
+def test_booking_needs_an_admitted_token(client, room_event, make_booking):
+    booking = make_booking(event=room_event)
+    admitted, waiting = _join(client, room_event["id"]), _join(client, room_event["id"])
+    assert admitted["status"] == "admitted"
+    assert waiting["status"] == "waiting"
+
+    for headers in ({}, {"X-Queue-Token": "not-a-token"}, {"X-Queue-Token": waiting["token"]}):
+        response = client.post("/api/bookings/", json=booking, headers=headers)
+        assert response.status_code == 403, (headers, response.text)
+
+    assert client.post("/api/bookings/", json=booking, headers={"X-Queue-Token": admitted["token"]}).status_code == 201
+    # Each token books once
+    assert client.post("/api/bookings/", json=booking, headers={"X-Queue-Token": admitted["token"]}).status_code == 403
+
+def test_failed_booking_gives_the_admission_back(client, room_event, make_booking):
+    token = {"X-Queue-Token": _join(client, room_event["id"])["token"]}
+
+    sold_out = client.post("/api/bookings/", json=make_booking(event=room_event, quantity=6), headers=token)
+    assert sold_out.status_code == 400, sold_out.text
+    unknown = client.post("/api/bookings/", json={**make_booking(event=room_event), "ticket_type_id": 10_000_000},
+                          headers=token)
+    assert unknown.status_code == 404, unknown.text
+
+    response = client.post("/api/bookings/", json=make_booking(event=room_event, quantity=2), headers=token)
+    assert response.status_code == 201, response.text